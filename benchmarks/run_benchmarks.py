@@ -0,0 +1,201 @@
+# benchmarks/run_benchmarks.py
+#
+# Benchmarks del pipeline compilar + ejecutar sobre los programas de
+# benchmarks/corpus/*.patito. Por programa se mide por separado:
+#
+#   - parse:    lexer + parser (parse_tree)
+#   - semantic: SemanticVisitor sobre el árbol
+#   - codegen:  CodeGenVisitor sobre el árbol (incluye su propia semántica)
+#   - run:      VirtualMachine.run, con throughput en cuádruplos/segundo
+#
+# Cada medición es el mínimo de --repeat corridas. Los resultados se guardan
+# como JSON y se pueden comparar contra una línea base guardada antes:
+#
+#   python -m benchmarks.run_benchmarks --save-baseline
+#   python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json
+#
+# Con --baseline el proceso sale con código 1 si alguna etapa de algún
+# programa es más lenta que la base por más de --threshold (default 20%).
+# Hay que guardar la base en la misma máquina: los tiempos no son portables.
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from entrega2.semantic_visitor import SemanticVisitor
+from entrega3.codegen_visitor import FRONTENDS, CodeGenVisitor, parse_tree, translate
+from entrega5.output import CaptureSink
+from entrega5.vm import ENGINES, VirtualMachine
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+STAGES = ("parse", "semantic", "codegen", "run")
+DEFAULT_THRESHOLD = 0.20
+# Diferencias menores a esto son ruido aunque pasen el umbral relativo
+MIN_DELTA_SECONDS = 0.001
+
+
+@dataclass
+class BenchResult:
+    program: str
+    quads: int
+    executed: int
+    seconds: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def quads_per_second(self) -> float:
+        run = self.seconds.get("run", 0.0)
+        return self.executed / run if run else 0.0
+
+
+@dataclass
+class Regression:
+    program: str
+    stage: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def corpus(directory: Path = CORPUS_DIR) -> Dict[str, str]:
+    return {p.stem: p.read_text(encoding="utf-8") for p in sorted(directory.glob("*.patito"))}
+
+
+def bench_program(
+    name: str,
+    source: str,
+    repeat: int = 3,
+    frontend: str = "antlr",
+    engine: str = "table",
+) -> BenchResult:
+    tree = parse_tree(source, frontend)
+    func_dir, quads = translate(source, frontend=frontend)
+
+    def new_vm(**kwargs: Any) -> VirtualMachine:
+        return VirtualMachine(
+            quads, constants=func_dir.constants, frames=func_dir.frame_layouts(),
+            engine=engine, output=CaptureSink(), **kwargs,
+        )
+
+    # Instrucciones ejecutadas: una corrida aparte con profile (no se mide)
+    counter = new_vm(profile=True)
+    counter.run()
+    assert counter.profile is not None
+
+    result = BenchResult(name, len(quads), counter.profile.total_instructions)
+    result.seconds["parse"] = best_of(repeat, lambda: parse_tree(source, frontend))
+    result.seconds["semantic"] = best_of(repeat, lambda: SemanticVisitor().visit(tree))
+    result.seconds["codegen"] = best_of(repeat, lambda: CodeGenVisitor().visit(tree))
+
+    timings: List[float] = []
+    for _ in range(repeat):
+        vm = new_vm()  # construir la VM (ligado) no cuenta
+        start = time.perf_counter()
+        vm.run()
+        timings.append(time.perf_counter() - start)
+    result.seconds["run"] = min(timings)
+    return result
+
+
+def run_suite(
+    programs: Dict[str, str],
+    repeat: int = 3,
+    frontend: str = "antlr",
+    engine: str = "table",
+) -> Dict[str, Any]:
+    results = [bench_program(name, src, repeat, frontend, engine) for name, src in programs.items()]
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "frontend": frontend,
+        "engine": engine,
+        "repeat": repeat,
+        "programs": {
+            r.program: {**asdict(r), "quads_per_second": r.quads_per_second}
+            for r in results
+        },
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[Regression]:
+    """
+    Etapas más lentas que la base por más de ``threshold`` (0.2 = 20%) y
+    por más de MIN_DELTA_SECONDS en términos absolutos.
+    """
+    regressions = []
+    for name, prog in current["programs"].items():
+        base = baseline.get("programs", {}).get(name)
+        if base is None:
+            continue
+        for stage in STAGES:
+            now, before = prog["seconds"].get(stage), base["seconds"].get(stage)
+            if now is None or before is None:
+                continue
+            if now > before * (1 + threshold) and now - before > MIN_DELTA_SECONDS:
+                regressions.append(Regression(name, stage, before, now))
+    return regressions
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    header = f"{'programa':<16}{'quads':>7}{'ejecutados':>12}" + "".join(f"{s:>11}" for s in STAGES) + f"{'quads/s':>13}"
+    lines = [header]
+    for name, prog in results["programs"].items():
+        secs = "".join(f"{prog['seconds'][s] * 1000:>9.2f}ms" for s in STAGES)
+        lines.append(f"{name:<16}{prog['quads']:>7}{prog['executed']:>12}{secs}{prog['quads_per_second']:>13,.0f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks del compilador y la VM de Patito")
+    parser.add_argument("--corpus", type=Path, default=CORPUS_DIR)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--frontend", choices=FRONTENDS, default="antlr")
+    parser.add_argument("--engine", choices=ENGINES, default="table")
+    parser.add_argument("--output", type=Path, help="archivo JSON para los resultados")
+    parser.add_argument("--baseline", type=Path, help="JSON de una corrida anterior para comparar")
+    parser.add_argument("--save-baseline", action="store_true", help=f"guardar como {DEFAULT_BASELINE.name}")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = run_suite(corpus(args.corpus), args.repeat, args.frontend, args.engine)
+    print(format_results(results))
+
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(payload, encoding="utf-8")
+    if args.save_baseline:
+        DEFAULT_BASELINE.write_text(payload, encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESIÓN {r.program}/{r.stage}: {r.baseline * 1000:.2f}ms -> {r.current * 1000:.2f}ms (x{r.ratio:.2f})")
+        if regressions:
+            return 1
+        print(f"Sin regresiones contra {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import json
+
+from benchmarks.run_benchmarks import STAGES, compare, corpus, main, run_suite
+
+
+def test_corpus_completo():
+    assert set(corpus()) == {"while_loop", "recursion", "print_heavy", "expressions", "many_functions"}
+
+
+def test_resultados_por_etapa():
+    results = run_suite({"r": corpus()["recursion"]}, repeat=1)
+    prog = results["programs"]["r"]
+    assert set(prog["seconds"]) == set(STAGES)
+    assert prog["executed"] > prog["quads"] > 0
+    assert prog["quads_per_second"] > 0
+    json.dumps(results)
+
+
+def test_compare_marca_solo_regresiones_reales():
+    base = {"programs": {"p": {"seconds": {"parse": 0.010, "semantic": 0.0001, "codegen": 0.010, "run": 0.100}}}}
+    now = {"programs": {"p": {"seconds": {"parse": 0.011, "semantic": 0.0005, "codegen": 0.030, "run": 0.050}}}}
+    regressions = compare(now, base, threshold=0.2)
+    # semantic creció x5 pero solo 0.4ms: es ruido
+    assert [(r.program, r.stage) for r in regressions] == [("p", "codegen")]
+    assert regressions[0].ratio == 3.0
+
+
+def test_main_guarda_json_y_compara(tmp_path, capsys):
+    programs = tmp_path / "corpus"
+    programs.mkdir()
+    (programs / "loop.patito").write_text(corpus()["while_loop"])
+    out = tmp_path / "r.json"
+
+    assert main(["--corpus", str(programs), "--repeat", "1", "--output", str(out)]) == 0
+    results = json.loads(out.read_text())
+    assert "loop" in results["programs"]
+
+    # Contra una base imposible de igualar, se reporta la regresión
+    for stage in STAGES:
+        results["programs"]["loop"]["seconds"][stage] = 0.0
+    slow = tmp_path / "base.json"
+    slow.write_text(json.dumps(results))
+    assert main(["--corpus", str(programs), "--repeat", "1", "--baseline", str(slow)]) == 1
+    assert "REGRESIÓN loop/run" in capsys.readouterr().out
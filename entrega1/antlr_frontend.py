@@ -0,0 +1,105 @@
+# entrega1/antlr_frontend.py
+#
+# Front end de ANTLR en dos etapas:
+#
+#   1) Predicción SLL + BailErrorStrategy: es la más rápida y basta para
+#      casi cualquier programa válido. Al primer error se cancela el parseo.
+#   2) Si la etapa 1 falla, se vuelve a parsear con predicción LL completa y
+#      la estrategia de errores normal (recuperación + mensajes), así que un
+#      programa inválido reporta exactamente los mismos errores que antes.
+#
+# Un AntlrFrontend conserva su lexer, token stream y parser entre llamadas a
+# parse(); los DFA de predicción de PatitoParser son atributos de clase, así
+# que al reusar el mismo proceso solo se "calientan" una vez.
+#
+# parse(source, errors=lista) junta los errores de sintaxis de esa llamada en
+# la lista ("línea L:C mensaje") en vez de imprimirlos en stderr con el
+# ConsoleErrorListener de ANTLR.
+
+from __future__ import annotations
+
+from typing import Any, List, Optional
+
+from antlr4 import CommonTokenStream, InputStream, PredictionMode
+from antlr4.error.ErrorListener import ConsoleErrorListener, ErrorListener
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
+
+from entrega1.generated.PatitoLexer import PatitoLexer
+from entrega1.generated.PatitoParser import PatitoParser
+
+
+class _CollectingErrorListener(ErrorListener):
+    """Guarda cada error de sintaxis como "línea L:C mensaje"."""
+
+    def __init__(self, errors: List[str]) -> None:
+        super().__init__()
+        self.errors = errors
+
+    def syntaxError(self, recognizer: Any, offendingSymbol: Any, line: int, column: int, msg: str, e: Any) -> None:
+        self.errors.append(f"línea {line}:{column} {msg}")
+
+
+class AntlrFrontend:
+    """
+    Lexer + parser de ANTLR reutilizables.
+
+    - ``parse(source)``: árbol de la regla `start`
+    - ``sll_parses`` / ``ll_fallbacks``: cuántas veces bastó SLL y cuántas
+      hubo que reintentar con LL
+    """
+
+    def __init__(self) -> None:
+        self.lexer = PatitoLexer(InputStream(""))
+        self.tokens = CommonTokenStream(self.lexer)
+        self.parser = PatitoParser(self.tokens)
+        self.sll_parses = 0
+        self.ll_fallbacks = 0
+
+    @property
+    def syntax_errors(self) -> int:
+        """Errores de sintaxis del último parse()."""
+        return self.parser.getNumberOfSyntaxErrors()
+
+    def parse(self, source: str, errors: Optional[List[str]] = None) -> PatitoParser.StartContext:
+        """
+        Árbol de la regla `start`. Con ``errors`` los errores de sintaxis se
+        agregan a esa lista en lugar de imprimirse.
+        """
+        listener = ConsoleErrorListener.INSTANCE if errors is None else _CollectingErrorListener(errors)
+        for recognizer in (self.lexer, self.parser):
+            recognizer.removeErrorListeners()
+            recognizer.addErrorListener(listener)
+
+        self.lexer.inputStream = InputStream(source)
+        self.tokens.setTokenSource(self.lexer)
+        self.parser.setTokenStream(self.tokens)
+
+        # Etapa 1: SLL, sin recuperación de errores
+        self.parser._interp.predictionMode = PredictionMode.SLL
+        self.parser._errHandler = BailErrorStrategy()
+        try:
+            tree = self.parser.start()
+            self.sll_parses += 1
+            return tree
+        except ParseCancellationException:
+            pass
+
+        # Etapa 2: LL completo con la estrategia de errores normal
+        self.ll_fallbacks += 1
+        self.tokens.seek(0)
+        self.parser._errHandler = DefaultErrorStrategy()
+        self.parser._interp.predictionMode = PredictionMode.LL
+        self.parser.reset()
+        return self.parser.start()
+
+
+# Instancia compartida para translate(..., reuse_parser=True)
+_shared: Optional[AntlrFrontend] = None
+
+
+def shared_frontend() -> AntlrFrontend:
+    global _shared
+    if _shared is None:
+        _shared = AntlrFrontend()
+    return _shared
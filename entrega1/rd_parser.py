@@ -0,0 +1,545 @@
+# entrega1/rd_parser.py
+#
+# Front end escrito a mano para Patito.g4: lexer con una sola expresión
+# regular + parser descendente recursivo LL(1) (LL(2) solo para distinguir
+# `id = ...` de `id(...)`).
+#
+# Produce un árbol con la MISMA forma que el de ANTLR (mismas reglas, mismos
+# hijos, reglas vacías incluidas), así que SemanticVisitor y CodeGenVisitor lo
+# recorren sin cambios: cada nodo responde a ctx.ID(), ctx.expresion(),
+# ctx.getChild(i), ctx.getChildCount(), ctx.parentCtx y accept(visitor).
+#
+# Las reglas recursivas a la derecha (body_pp, exp_p, print_p, ...) se
+# construyen con ciclos, no con recursión, para que programas muy largos no
+# agoten la pila.
+
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, List, Optional, Set, Union
+
+
+class PatitoSyntaxError(Exception):
+    """Error léxico o sintáctico del front end escrito a mano."""
+
+
+# ----------------- Tokens ----------------- #
+
+KEYWORDS = {
+    "program": "PROGRAM",
+    "main": "MAIN",
+    "end": "END",
+    "if": "IF",
+    "else": "ELSE",
+    "while": "WHILE",
+    "do": "DO",
+    "print": "PRINT",
+    "var": "VAR",
+    "void": "VOID",
+    "int": "INT_TYPE",
+    "float": "FLOAT_TYPE",
+    "return": "RETURN",
+}
+
+# El orden importa: operadores de dos caracteres antes que los de uno y
+# FLOAT_LIT antes que INT_LIT (mismo resultado que el "longest match" de ANTLR)
+_TOKEN_SPEC = [
+    ("WS", r"[ \t\r\n]+"),
+    ("STRING_LIT", r'"(?:\\.|[^"\\])*"'),
+    ("FLOAT_LIT", r"(?:[0-9]+\.[0-9]*|[0-9]*\.[0-9]+)(?:[eE][+-]?[0-9]+)?"),
+    ("INT_LIT", r"0|[1-9][0-9]*"),
+    ("ID", r"[A-Za-z_][A-Za-z0-9_]*"),
+    ("NEQ", r"!="),
+    ("LEQ", r"<="),
+    ("GEQ", r">="),
+    ("EQ", r"=="),
+    ("ASSIGN", r"="),
+    ("PLUS", r"\+"),
+    ("MINUS", r"-"),
+    ("MUL", r"\*"),
+    ("DIV", r"/"),
+    ("LT", r"<"),
+    ("GT", r">"),
+    ("COMMA", r","),
+    ("COLON", r":"),
+    ("SEMI", r";"),
+    ("LP", r"\("),
+    ("RP", r"\)"),
+    ("LB", r"\{"),
+    ("RB", r"\}"),
+    ("LBR", r"\["),
+    ("RBR", r"\]"),
+]
+_MASTER = re.compile("|".join(f"(?P<{name}>{regex})" for name, regex in _TOKEN_SPEC))
+
+EOF = "EOF"
+
+
+class Token:
+    """Hoja del árbol (equivale a TerminalNode de ANTLR)."""
+
+    __slots__ = ("type", "text", "line", "column", "parentCtx")
+
+    def __init__(self, type_: str, text: str, line: int, column: int) -> None:
+        self.type = type_
+        self.text = text
+        self.line = line
+        self.column = column
+        self.parentCtx: Optional[RuleNode] = None
+
+    def getText(self) -> str:
+        return self.text
+
+    def getChildCount(self) -> int:
+        return 0
+
+    def accept(self, visitor: Any) -> Any:
+        return visitor.visitTerminal(self)
+
+    def __repr__(self) -> str:
+        return f"Token({self.type}, {self.text!r})"
+
+
+def tokenize(source: str) -> List[Token]:
+    tokens: List[Token] = []
+    pos = 0
+    line = 1
+    line_start = 0
+    n = len(source)
+    match = _MASTER.match
+    while pos < n:
+        m = match(source, pos)
+        if m is None:
+            raise PatitoSyntaxError(
+                f"Carácter inválido {source[pos]!r} en línea {line}, columna {pos - line_start}"
+            )
+        kind = m.lastgroup
+        text = m.group()
+        if kind == "WS":
+            newlines = text.count("\n")
+            if newlines:
+                line += newlines
+                line_start = pos + text.rindex("\n") + 1
+        else:
+            if kind == "ID":
+                kind = KEYWORDS.get(text, "ID")
+            tokens.append(Token(kind, text, line, pos - line_start))
+        pos = m.end()
+    tokens.append(Token(EOF, "<EOF>", line, pos - line_start))
+    return tokens
+
+
+# ----------------- Nodos de regla ----------------- #
+
+# Nombre del método de acceso (como en PatitoParser) -> nombre de la regla
+_ACCESSOR_RULE = {"vars_": "vars", "type_": "type"}
+
+
+class RuleNode:
+    """
+    Nodo de regla (equivale a un XContext de ANTLR). Los accesos ctx.ID() y
+    ctx.expresion() regresan el primer hijo de ese tipo, o None.
+    """
+
+    __slots__ = ("rule", "children", "parentCtx")
+
+    def __init__(self, rule: str, parent: Optional[RuleNode] = None) -> None:
+        self.rule = rule
+        self.children: List[Union[RuleNode, Token]] = []
+        self.parentCtx = parent
+
+    def add(self, child: Union[RuleNode, Token]) -> Union[RuleNode, Token]:
+        child.parentCtx = self
+        self.children.append(child)
+        return child
+
+    def getChildCount(self) -> int:
+        return len(self.children)
+
+    def getChild(self, i: int) -> Union[RuleNode, Token]:
+        return self.children[i]
+
+    def getText(self) -> str:
+        return "".join(child.getText() for child in self.children)
+
+    def accept(self, visitor: Any) -> Any:
+        return getattr(visitor, "visit" + self.rule[0].upper() + self.rule[1:])(self)
+
+    def __getattr__(self, name: str) -> Callable[[], Any]:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name.isupper():
+            def token() -> Optional[Token]:
+                for child in self.children:
+                    if isinstance(child, Token) and child.type == name:
+                        return child
+                return None
+            return token
+
+        rule = _ACCESSOR_RULE.get(name, name)
+
+        def rule_child() -> Optional[RuleNode]:
+            for child in self.children:
+                if isinstance(child, RuleNode) and child.rule == rule:
+                    return child
+            return None
+        return rule_child
+
+    def __repr__(self) -> str:
+        return f"RuleNode({self.rule}, {len(self.children)} hijos)"
+
+
+# ----------------- Parser ----------------- #
+
+_STATEMENT_FIRST = {"ID", "IF", "WHILE", "PRINT", "RETURN", "LB"}
+_TYPE_FIRST = {"INT_TYPE", "FLOAT_TYPE"}
+_REL_OPS = {"GT", "LT", "NEQ", "EQ", "GEQ", "LEQ"}
+_FACTOR_FIRST = {"LP", "ID", "PLUS", "MINUS", "INT_LIT", "FLOAT_LIT"}
+
+
+class RDParser:
+    """Parser descendente recursivo LL(1) para la gramática de Patito.g4."""
+
+    def __init__(self, tokens: List[Token]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+
+    # ---- Helpers ---- #
+
+    @property
+    def la(self) -> str:
+        return self.tokens[self.pos].type
+
+    def _peek(self, k: int) -> str:
+        i = min(self.pos + k, len(self.tokens) - 1)
+        return self.tokens[i].type
+
+    def _match(self, node: RuleNode, type_: str) -> Token:
+        tok = self.tokens[self.pos]
+        if tok.type != type_:
+            raise PatitoSyntaxError(
+                f"Se esperaba {type_} y se encontró {tok.text!r} "
+                f"en línea {tok.line}, columna {tok.column}"
+            )
+        self.pos += 1
+        node.add(tok)
+        return tok
+
+    def _error(self, expected: str) -> PatitoSyntaxError:
+        tok = self.tokens[self.pos]
+        return PatitoSyntaxError(
+            f"Se esperaba {expected} y se encontró {tok.text!r} "
+            f"en línea {tok.line}, columna {tok.column}"
+        )
+
+    def _chain(self, parent: RuleNode, rule: str, first: Set[str], body: Callable[[RuleNode], None]) -> RuleNode:
+        """
+        Construye con un ciclo una regla `rule : <body> rule | /* empty */`:
+        mientras el siguiente token esté en `first`, llena el eslabón actual
+        con `body` y le cuelga un nuevo eslabón vacío.
+        """
+        head = node = RuleNode(rule, parent)
+        while self.la in first:
+            body(node)
+            node = node.add(RuleNode(rule))  # type: ignore[assignment]
+        return head
+
+    # ---- Reglas ---- #
+
+    # start : programa EOF ;
+    def start(self) -> RuleNode:
+        node = RuleNode("start")
+        node.add(self.programa(node))
+        self._match(node, EOF)
+        return node
+
+    # programa : PROGRAM ID SEMI programa_p programa_pp MAIN body END ;
+    def programa(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("programa", parent)
+        self._match(node, "PROGRAM")
+        self._match(node, "ID")
+        self._match(node, "SEMI")
+        node.add(self._chain(node, "programa_p", {"VAR"}, lambda n: n.add(self.vars_(n))))
+        # programa_pp : programa_ppp | /* empty */ ; ANTLR siempre elige la
+        # primera alternativa (programa_ppp puede ser vacío), igual aquí
+        pp = node.add(RuleNode("programa_pp"))
+        pp.add(self._chain(pp, "programa_ppp", {"VOID"} | _TYPE_FIRST, lambda n: n.add(self.funcs(n))))
+        self._match(node, "MAIN")
+        node.add(self.body(node))
+        self._match(node, "END")
+        return node
+
+    # vars : VAR vars_p ;
+    def vars_(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("vars", parent)
+        self._match(node, "VAR")
+        node.add(self.vars_p(node))
+        return node
+
+    # vars_p : ID vars_pp COLON type SEMI ;
+    def vars_p(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("vars_p", parent)
+        self._match(node, "ID")
+
+        def more_ids(n: RuleNode) -> None:
+            self._match(n, "COMMA")
+            self._match(n, "ID")
+
+        node.add(self._chain(node, "vars_pp", {"COMMA"}, more_ids))
+        self._match(node, "COLON")
+        node.add(self.type_(node))
+        self._match(node, "SEMI")
+        return node
+
+    # type : INT_TYPE | FLOAT_TYPE ;
+    def type_(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("type", parent)
+        if self.la not in _TYPE_FIRST:
+            raise self._error("un tipo (int / float)")
+        self._match(node, self.la)
+        return node
+
+    # funcs : funcs_p ID LP funcs_pp RP LB funcs_ppp body RB SEMI ;
+    def funcs(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("funcs", parent)
+        funcs_p = node.add(RuleNode("funcs_p"))
+        if self.la == "VOID":
+            self._match(funcs_p, "VOID")
+        else:
+            funcs_p.add(self.type_(funcs_p))
+        self._match(node, "ID")
+        self._match(node, "LP")
+        node.add(self.funcs_pp(node))
+        self._match(node, "RP")
+        self._match(node, "LB")
+        funcs_ppp = node.add(RuleNode("funcs_ppp"))
+        if self.la == "VAR":
+            funcs_ppp.add(self.vars_(funcs_ppp))
+        node.add(self.body(node))
+        self._match(node, "RB")
+        self._match(node, "SEMI")
+        return node
+
+    # funcs_pp   : ID COLON type funcs_pppp | /* empty */ ;
+    # funcs_pppp : COMMA funcs_pp | /* empty */ ;
+    def funcs_pp(self, parent: RuleNode) -> RuleNode:
+        head = node = RuleNode("funcs_pp", parent)
+        while self.la == "ID":
+            self._match(node, "ID")
+            self._match(node, "COLON")
+            node.add(self.type_(node))
+            rest = node.add(RuleNode("funcs_pppp"))
+            if self.la != "COMMA":
+                break
+            self._match(rest, "COMMA")
+            node = rest.add(RuleNode("funcs_pp"))
+            if self.la != "ID":
+                raise self._error("un parámetro")
+        return head
+
+    # body : LB body_p RB ;
+    # body_p : body_pp | /* empty */ ;
+    def body(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("body", parent)
+        self._match(node, "LB")
+        # Como en programa_pp, body_p siempre lleva un body_pp (aunque sea vacío)
+        body_p = node.add(RuleNode("body_p"))
+        body_p.add(self._chain(body_p, "body_pp", _STATEMENT_FIRST, lambda n: n.add(self.statement(n))))
+        self._match(node, "RB")
+        return node
+
+    # statement : assign | condition | cycle | fcall SEMI | print_cfg | return_cfg | LB statement_p RB ;
+    def statement(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("statement", parent)
+        la = self.la
+        if la == "ID":
+            if self._peek(1) == "LP":
+                node.add(self.fcall(node))
+                self._match(node, "SEMI")
+            else:
+                node.add(self.assign(node))
+        elif la == "IF":
+            node.add(self.condition(node))
+        elif la == "WHILE":
+            node.add(self.cycle(node))
+        elif la == "PRINT":
+            node.add(self.print_cfg(node))
+        elif la == "RETURN":
+            node.add(self.return_cfg(node))
+        elif la == "LB":
+            self._match(node, "LB")
+            node.add(self._chain(node, "statement_p", _STATEMENT_FIRST, lambda n: n.add(self.statement(n))))
+            self._match(node, "RB")
+        else:
+            raise self._error("un estatuto")
+        return node
+
+    # assign : ID ASSIGN expresion SEMI ;
+    def assign(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("assign", parent)
+        self._match(node, "ID")
+        self._match(node, "ASSIGN")
+        node.add(self.expresion(node))
+        self._match(node, "SEMI")
+        return node
+
+    # condition : IF LP expresion RP body condition_p SEMI ;
+    # condition_p : ELSE body | /* empty */ ;
+    def condition(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("condition", parent)
+        self._match(node, "IF")
+        self._match(node, "LP")
+        node.add(self.expresion(node))
+        self._match(node, "RP")
+        node.add(self.body(node))
+        condition_p = node.add(RuleNode("condition_p"))
+        if self.la == "ELSE":
+            self._match(condition_p, "ELSE")
+            condition_p.add(self.body(condition_p))
+        self._match(node, "SEMI")
+        return node
+
+    # cycle : WHILE LP expresion RP DO body SEMI ;
+    def cycle(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("cycle", parent)
+        self._match(node, "WHILE")
+        self._match(node, "LP")
+        node.add(self.expresion(node))
+        self._match(node, "RP")
+        self._match(node, "DO")
+        node.add(self.body(node))
+        self._match(node, "SEMI")
+        return node
+
+    # print_cfg : PRINT LP print_p print_pp RP SEMI ;
+    # print_p   : expresion print_pp | STRING_LIT print_pp ;
+    # print_pp  : COMMA print_p | /* empty */ ;
+    def print_cfg(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("print_cfg", parent)
+        self._match(node, "PRINT")
+        self._match(node, "LP")
+
+        head = item = RuleNode("print_p", node)
+        while True:
+            if self.la == "STRING_LIT":
+                self._match(item, "STRING_LIT")
+            elif self.la in _FACTOR_FIRST:
+                item.add(self.expresion(item))
+            else:
+                raise self._error("una expresión o un string")
+            rest = item.add(RuleNode("print_pp"))
+            if self.la != "COMMA":
+                break
+            self._match(rest, "COMMA")
+            item = rest.add(RuleNode("print_p"))  # type: ignore[assignment]
+        node.add(head)
+
+        # print_p ya consumió todas las comas: este print_pp siempre es vacío
+        node.add(RuleNode("print_pp"))
+        self._match(node, "RP")
+        self._match(node, "SEMI")
+        return node
+
+    # return_cfg : RETURN return_p SEMI ;
+    # return_p : expresion | /* empty */ ;
+    def return_cfg(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("return_cfg", parent)
+        self._match(node, "RETURN")
+        return_p = node.add(RuleNode("return_p"))
+        if self.la in _FACTOR_FIRST:
+            return_p.add(self.expresion(return_p))
+        self._match(node, "SEMI")
+        return node
+
+    # fcall : ID LP fcall_p RP ;
+    # fcall_p  : expresion fcall_pp | /* empty */ ;
+    # fcall_pp : COMMA fcall_p | /* empty */ ;
+    def fcall(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("fcall", parent)
+        self._match(node, "ID")
+        self._match(node, "LP")
+        head = arg = RuleNode("fcall_p", node)
+        while self.la in _FACTOR_FIRST:
+            arg.add(self.expresion(arg))
+            rest = arg.add(RuleNode("fcall_pp"))
+            if self.la != "COMMA":
+                break
+            self._match(rest, "COMMA")
+            arg = rest.add(RuleNode("fcall_p"))  # type: ignore[assignment]
+            if self.la not in _FACTOR_FIRST:
+                raise self._error("un argumento")
+        node.add(head)
+        self._match(node, "RP")
+        return node
+
+    # expresion : exp expresion_p ;
+    # expresion_p : GT exp | LT exp | NEQ exp | EQ exp | GEQ exp | LEQ exp | /* empty */ ;
+    def expresion(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("expresion", parent)
+        node.add(self.exp(node))
+        expresion_p = node.add(RuleNode("expresion_p"))
+        if self.la in _REL_OPS:
+            self._match(expresion_p, self.la)
+            expresion_p.add(self.exp(expresion_p))
+        return node
+
+    # exp : termino exp_p ;
+    # exp_p : PLUS termino exp_p | MINUS termino exp_p | /* empty */ ;
+    def exp(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("exp", parent)
+        node.add(self.termino(node))
+
+        def more_terms(n: RuleNode) -> None:
+            self._match(n, self.la)
+            n.add(self.termino(n))
+
+        node.add(self._chain(node, "exp_p", {"PLUS", "MINUS"}, more_terms))
+        return node
+
+    # termino : factor termino_p ;
+    # termino_p : MUL factor termino_p | DIV factor termino_p | /* empty */ ;
+    def termino(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("termino", parent)
+        node.add(self.factor(node))
+
+        def more_factors(n: RuleNode) -> None:
+            self._match(n, self.la)
+            n.add(self.factor(n))
+
+        node.add(self._chain(node, "termino_p", {"MUL", "DIV"}, more_factors))
+        return node
+
+    # factor : LP expresion RP | factor_p | fcall ;
+    # factor_p : factor_pp factor_ppp ;
+    # factor_pp : PLUS | MINUS | /* empty */ ;
+    # factor_ppp : ID | cte ;
+    def factor(self, parent: RuleNode) -> RuleNode:
+        node = RuleNode("factor", parent)
+        la = self.la
+        if la == "LP":
+            self._match(node, "LP")
+            node.add(self.expresion(node))
+            self._match(node, "RP")
+            return node
+        if la == "ID" and self._peek(1) == "LP":
+            node.add(self.fcall(node))
+            return node
+
+        factor_p = node.add(RuleNode("factor_p"))
+        factor_pp = factor_p.add(RuleNode("factor_pp"))
+        if self.la in ("PLUS", "MINUS"):
+            self._match(factor_pp, self.la)
+        factor_ppp = factor_p.add(RuleNode("factor_ppp"))
+        if self.la == "ID":
+            self._match(factor_ppp, "ID")
+        elif self.la in ("INT_LIT", "FLOAT_LIT"):
+            cte = factor_ppp.add(RuleNode("cte"))
+            self._match(cte, self.la)
+        else:
+            raise self._error("un identificador o una constante")
+        return node
+
+
+def parse(source: str) -> RuleNode:
+    """Lexer + parser escritos a mano: regresa el nodo de la regla `start`."""
+    return RDParser(tokenize(source)).start()
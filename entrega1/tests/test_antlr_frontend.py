@@ -0,0 +1,61 @@
+# tests/test_antlr_frontend.py
+# Parseo en dos etapas (SLL -> LL) y reuso del lexer/parser entre programas.
+
+from entrega1.antlr_frontend import AntlrFrontend
+
+
+VALIDO = """
+program p;
+var x: int;
+main {
+    x = 1 + 2 * 3;
+    if (x > 2) { print(x); } else { print("no"); };
+} end
+"""
+
+INVALIDO = """
+program foo
+main {
+}
+end
+"""
+
+
+def test_programa_valido_se_parsea_con_sll():
+    frontend = AntlrFrontend()
+    frontend.parse(VALIDO)
+    assert frontend.sll_parses == 1
+    assert frontend.ll_fallbacks == 0
+    assert frontend.syntax_errors == 0
+
+
+def test_error_de_sintaxis_reintenta_con_ll_y_lo_reporta():
+    frontend = AntlrFrontend()
+    frontend.parser.removeErrorListeners()
+    frontend.parse(INVALIDO)
+    assert frontend.ll_fallbacks == 1
+    assert frontend.syntax_errors > 0
+
+
+def test_reusar_el_frontend_entre_programas():
+    frontend = AntlrFrontend()
+    frontend.parser.removeErrorListeners()
+    first = frontend.parse(VALIDO).toStringTree(recog=frontend.parser)
+    frontend.parse(INVALIDO)
+    again = frontend.parse(VALIDO).toStringTree(recog=frontend.parser)
+
+    assert again == first
+    assert frontend.syntax_errors == 0
+    assert frontend.sll_parses == 2
+
+
+def test_parse_junta_errores_en_lista(capsys):
+    frontend = AntlrFrontend()
+    errors = []
+    frontend.parse("program x; var a: int; main { a = ; } end", errors=errors)
+    assert errors and errors[0].startswith("línea 1:34 ")
+    assert capsys.readouterr().err == ""
+
+    # Sin lista vuelve a reportar en consola
+    frontend.parse("program x; var a: int; main { a = ; } end")
+    assert "line 1:34" in capsys.readouterr().err
@@ -3,6 +3,10 @@
 
 from __future__ import annotations
 
+from typing import Callable, Iterator, Optional
+
+from antlr4 import ParserRuleContext
+
 from entrega2.symbols import FunctionDirectory
 from entrega2.semantic_cube import TypeName
 
@@ -33,6 +37,15 @@ class SemanticVisitor(PatitoVisitor):
             return self.func_dir.declare_local(self.current_function, name, type_, address=addr)
 
 
+    # Recorre una regla recursiva a la derecha (x : ... x | /* empty */) con un
+    # ciclo en vez de recursión: regresa cada nodo no vacío de la cadena.
+    # `next_` da el siguiente eslabón (o None si la cadena termina ahí).
+    @staticmethod
+    def _chain(ctx: Optional[ParserRuleContext], next_: Callable[[ParserRuleContext], Optional[ParserRuleContext]]) -> Iterator[ParserRuleContext]:
+        while ctx is not None and ctx.getChildCount() != 0:
+            yield ctx
+            ctx = next_(ctx)
+
     # ----------------- Reglas de programa/vars/funcs ----------------- #
 
     # start : programa EOF ;
@@ -53,10 +66,8 @@ class SemanticVisitor(PatitoVisitor):
 
     # programa_p : vars programa_p | /* empty */ ;
     def visitPrograma_p(self, ctx: PatitoParser.Programa_pContext):
-        if ctx.getChildCount() == 0:
-            return None
-        self.visit(ctx.vars_()) #mismo que vars (lo usa python)
-        self.visit(ctx.programa_p())
+        for node in self._chain(ctx, lambda c: c.programa_p()):
+            self.visit(node.vars_()) #mismo que vars (lo usa python)
         return None
 
     # programa_pp : programa_ppp | /* empty */ ;
@@ -68,10 +79,8 @@ class SemanticVisitor(PatitoVisitor):
 
     # programa_ppp : funcs programa_ppp | /* empty */ ;
     def visitPrograma_ppp(self, ctx: PatitoParser.Programa_pppContext):
-        if ctx.getChildCount() == 0:
-            return None
-        self.visit(ctx.funcs())
-        self.visit(ctx.programa_ppp())
+        for node in self._chain(ctx, lambda c: c.programa_ppp()):
+            self.visit(node.funcs())
         return None
 
     # ----------------- Tipos ----------------- #
@@ -105,11 +114,7 @@ class SemanticVisitor(PatitoVisitor):
 
     # vars_pp : COMMA ID vars_pp | /* empty */ ;
     def visitVars_pp(self, ctx: PatitoParser.Vars_ppContext):
-        if ctx.getChildCount() == 0:
-            return []
-        this_id = ctx.ID().getText()
-        rest = self.visit(ctx.vars_pp()) or []
-        return [this_id] + rest
+        return [node.ID().getText() for node in self._chain(ctx, lambda c: c.vars_pp())]
 
     # ----------------- Declaracion de funciones ----------------- #
 
@@ -120,9 +125,11 @@ class SemanticVisitor(PatitoVisitor):
         self.func_dir.declare_function(func_name, return_type=return_type) #declara la funcion en el directorio
         prev_func = self.current_function #se cambia el contexto a scope local de la funcion
         self.current_function = func_name
+        self.vm.reset_frame_counters() #cada funcion numera sus locales desde la base del segmento
         self.visit(ctx.funcs_pp()) #parametros
         self.visit(ctx.funcs_ppp()) #variables locales
         self.visit(ctx.body()) #body
+        self.vm.reset_frame_counters()
         self.current_function = prev_func #restaurar el contexto anterior
         return None
 
@@ -135,21 +142,24 @@ class SemanticVisitor(PatitoVisitor):
 
     # funcs_pp : ID COLON type funcs_pppp | /* empty */ ;
     def visitFuncs_pp(self, ctx: PatitoParser.Funcs_ppContext):
-        if ctx.getChildCount() == 0:
-            return None
-        if self.current_function is None:
-            raise RuntimeError("Parámetro declarado fuera de función")
-        param_name = ctx.ID().getText()
-        param_type: TypeName = self.visit(ctx.type_())
-        # direccion param (segmento "local", pero kind param)
-        addr = self.vm.alloc_var(kind="param", type_=param_type)
-        self.func_dir.declare_param(
-            self.current_function,
-            param_name,
-            param_type,
-            address=addr,
-        )
-        self.visit(ctx.funcs_pppp())
+        # funcs_pppp : COMMA funcs_pp | /* empty */ ;
+        def next_param(c: PatitoParser.Funcs_ppContext):
+            rest = c.funcs_pppp()
+            return rest.funcs_pp() if rest.getChildCount() else None
+
+        for node in self._chain(ctx, next_param):
+            if self.current_function is None:
+                raise RuntimeError("Parámetro declarado fuera de función")
+            param_name = node.ID().getText()
+            param_type: TypeName = self.visit(node.type_())
+            # direccion param (segmento "local", pero kind param)
+            addr = self.vm.alloc_var(kind="param", type_=param_type)
+            self.func_dir.declare_param(
+                self.current_function,
+                param_name,
+                param_type,
+                address=addr,
+            )
         return None
 
 
@@ -166,3 +176,17 @@ class SemanticVisitor(PatitoVisitor):
             return None
         self.visit(ctx.vars_()) #igual que vars
         return None
+
+    # ----------------- Listas de estatutos ----------------- #
+
+    # body_pp : statement body_pp | /* empty */ ;
+    def visitBody_pp(self, ctx: PatitoParser.Body_ppContext):
+        for node in self._chain(ctx, lambda c: c.body_pp()):
+            self.visit(node.statement())
+        return None
+
+    # statement_p : statement statement_p | /* empty */ ;
+    def visitStatement_p(self, ctx: PatitoParser.Statement_pContext):
+        for node in self._chain(ctx, lambda c: c.statement_p()):
+            self.visit(node.statement())
+        return None
@@ -68,6 +68,34 @@ class VarTable:
 
 # ---------------------- FunctionInfo y ParamInfo ------------------------ #
 
+#Nombre con el que se guarda el frame de main (temporales globales) en frame_layouts()
+MAIN_FRAME = "<main>"
+
+#Cuanta memoria usa el activation record de una funcion, por tipo.
+#params/locals/temps son conteos; local_slots/temp_slots son los slots que la VM
+#debe reservar por tipo en cada segmento (offset mas alto + 1)
+@dataclass
+class FrameLayout:
+    params: Dict[TypeName, int] = field(default_factory=dict)
+    locals: Dict[TypeName, int] = field(default_factory=dict)
+    temps: Dict[TypeName, int] = field(default_factory=dict)
+    local_slots: Dict[TypeName, int] = field(default_factory=dict)
+    temp_slots: Dict[TypeName, int] = field(default_factory=dict)
+
+    #Registra una direccion del frame (offset dentro del rango de su tipo)
+    #Los temporales se reciclan: note("temp") se llama en cada reserva, asi que se
+    #cuentan offsets distintos. El rango es denso desde 0 (un offset nuevo siempre es
+    #el siguiente), entonces los distintos son el offset mas alto + 1
+    def note(self, kind: Literal["param", "local", "temp"], type_: TypeName, offset: int) -> None:
+        if kind == "temp":
+            self.temps[type_] = max(self.temps.get(type_, 0), offset + 1)
+        else:
+            counts = self.params if kind == "param" else self.locals
+            counts[type_] = counts.get(type_, 0) + 1
+        slots = self.temp_slots if kind == "temp" else self.local_slots
+        slots[type_] = max(slots.get(type_, 0), offset + 1)
+
+
 #Info de un parametro formal de una funcion
 @dataclass
 class ParamInfo:
@@ -85,6 +113,8 @@ class FunctionInfo:
     # Dirección virtual donde se almacenará el valor de retorno de la función (si no es void).
     # Se llena en CodeGenVisitor al momento de declarar la función.
     return_address: Optional[int] = None #modificado en entrega5
+    # Tamaño del activation record (lo llena CodeGenVisitor al terminar la función)
+    frame: FrameLayout = field(default_factory=FrameLayout)
 
 
     #Declara un parametro de la funcion, lo agrega a lista de params, y lo mete a la VarTable de la funcion (kind = param)
@@ -115,6 +145,7 @@ class FunctionDirectory:
     def __init__(self) -> None:
         self._globals = VarTable()
         self._funcs: Dict[str, FunctionInfo] = {}
+        self.main_frame = FrameLayout()  # temporales usados por main
 
     #Declara una variable global
     def declare_global(self, name: str, type_: TypeName, address: Optional[int] = None,) -> VarInfo:
@@ -190,3 +221,9 @@ class FunctionDirectory:
     # Regresa una copia del diccionario de funciones
     def all_functions(self) -> Dict[str, FunctionInfo]:
         return dict(self._funcs)
+
+    # Regresa {funcion: FrameLayout} mas el de main (MAIN_FRAME), para que la VM reserve frames exactos
+    def frame_layouts(self) -> Dict[str, FrameLayout]:
+        layouts = {name: f.frame for name, f in self._funcs.items()}
+        layouts[MAIN_FRAME] = self.main_frame
+        return layouts
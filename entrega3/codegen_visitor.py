@@ -1,10 +1,9 @@
 from __future__ import annotations
 from typing import List, Tuple, Optional
 
-from antlr4 import InputStream, CommonTokenStream
-
-from entrega1.generated.PatitoLexer import PatitoLexer
+from entrega1.antlr_frontend import AntlrFrontend, shared_frontend
 from entrega1.generated.PatitoParser import PatitoParser
+from entrega1.rd_parser import parse as rd_parse
 
 from entrega2.semantic_visitor import SemanticVisitor
 from entrega2.semantic_cube import (
@@ -13,13 +12,19 @@ from entrega2.semantic_cube import (
     type_of_unary,
     can_assign,
 )
-from entrega2.symbols import TypeMismatchError
+from entrega2.symbols import FrameLayout, TypeMismatchError
+
+from entrega4.virtual_memory import ConstantTable, locate
 
-from entrega4.virtual_memory import ConstantTable
+from entrega3.optimizer import OptimizationReport, fold_constants, fold_quad, propagate_copies
 
 
 Quad = Tuple[str, object, object, object]
 
+# RESULT del PRINT del último argumento de un print(...): marca el fin del
+# registro de salida (los demás argumentos llevan None)
+PRINT_EOL = 1
+
 
 class CodeGenVisitor(SemanticVisitor):
     """
@@ -43,9 +48,14 @@ class CodeGenVisitor(SemanticVisitor):
       * funcs / fcall / return (entrega 5)
     """
 
-    def __init__(self) -> None:
+    def __init__(self, fold_constants: bool = False) -> None:
         super().__init__()  # construye func_dir, vm, etc.
 
+        # Si es True, las operaciones entre constantes se evalúan al compilar
+        # (no generan cuádruplo ni temporal); folded cuenta cuántas
+        self.fold_constants = fold_constants
+        self.folded: int = 0
+
         # Pilas para la traducción de expresiones y saltos
         self.PilaO: List[int] = []          # operandos (dir. virtuales)
         self.PTypes: List[TypeName] = []    # tipos de operandos
@@ -75,6 +85,48 @@ class CodeGenVisitor(SemanticVisitor):
     def _push_operator(self, op: str) -> None:
         self.POper.append(op)
 
+    def _current_frame(self) -> FrameLayout:
+        """Layout del frame donde viven los temporales que se generan ahora."""
+        if self.current_function is None:
+            return self.func_dir.main_frame
+        return self.func_dir.get_function(self.current_function).frame
+
+    def _new_temp(self, type_: TypeName) -> int:
+        """Reserva un temporal y lo cuenta en el layout del frame actual."""
+        addr = self.vm.alloc_temp(type_)
+        _, _, offset = locate(addr)
+        self._current_frame().note("temp", type_, offset)
+        return addr
+
+    def _release_temp(self, addr: object) -> None:
+        """
+        El temporal `addr` ya lo consumió un cuádruplo: se libera para que el
+        siguiente _new_temp lo reuse. Cada temporal se lee una sola vez (sale
+        de PilaO), así que al consumirlo ya no está vivo.
+        """
+        if isinstance(addr, int) and locate(addr)[0] == "temp":
+            self.vm.free_temp(addr)
+
+    def _emit_operation(self, op: str, left_addr: int, right_addr: Optional[int], result_type: TypeName) -> int:
+        """
+        Genera (op, left, right, temp) y regresa el temporal. Con
+        fold_constants, si ambos operandos son constantes regresa directo la
+        constante del resultado.
+        """
+        if self.fold_constants:
+            const_addr = fold_quad((op, left_addr, right_addr, None), self.const_table)
+            if const_addr is not None:
+                self.folded += 1
+                return const_addr
+
+        # Los operandos se leen antes de escribir el resultado, así que el
+        # temporal del resultado puede ser uno de ellos
+        self._release_temp(left_addr)
+        self._release_temp(right_addr)
+        temp_addr = self._new_temp(result_type)
+        self.quads.append((op, left_addr, right_addr, temp_addr))
+        return temp_addr
+
     def _emit(self, op: str, left: object, right: object, result: object) -> int:
         """
         Agrega un cuádruplo a la fila y regresa su índice.
@@ -159,6 +211,9 @@ class CodeGenVisitor(SemanticVisitor):
         # 5) Guardar el índice del primer cuádruplo de la función
         self.func_dir.set_start_quad(func_name, len(self.quads))
 
+        # 5.1) Locales y temporales se numeran desde la base en cada función
+        self.vm.reset_frame_counters()
+
         # 6) Procesar parámetros y variables locales (misma lógica que SemanticVisitor)
         self.visit(ctx.funcs_pp())   # parámetros
         self.visit(ctx.funcs_ppp())  # variables locales (vars)
@@ -169,6 +224,16 @@ class CodeGenVisitor(SemanticVisitor):
         # 8) Marcar el final de la función (útil para la Máquina Virtual)
         self.quads.append(("ENDFUNC", None, None, None))
 
+        # 8.1) Registrar parámetros y locales en el layout del frame (los
+        # temporales ya se contaron en _new_temp) para que ERA reserve exacto
+        for _, var_info in func_info.vars.items():
+            _, _, offset = locate(var_info.address)
+            func_info.frame.note(var_info.kind, var_info.type, offset)
+        # El tamaño del frame es el high-water mark de los contadores de la función
+        func_info.frame.local_slots = self.vm.high_water("local")
+        func_info.frame.temp_slots = self.vm.high_water("temp")
+        self.vm.reset_frame_counters()
+
         # 9) Restaurar contexto anterior
         self.current_function = prev_func
         return None
@@ -225,51 +290,55 @@ class CodeGenVisitor(SemanticVisitor):
 
         return None
 
-    # fcall_p : expresion fcall_pp | /* empty */ ;
+    # fcall_p  : expresion fcall_pp | /* empty */ ;
+    # fcall_pp : COMMA fcall_p | /* empty */ ;
     def visitFcall_p(self, ctx: PatitoParser.Fcall_pContext):
-        if ctx.getChildCount() == 0:
-            return None
-
-        # Evaluar el argumento (expresion)
-        self.visit(ctx.expresion())
-        arg_addr = self.PilaO.pop()
-        arg_type: TypeName = self.PTypes.pop()
-
         if not self._call_func_stack:
             raise RuntimeError("visitFcall_p llamado fuera de contexto de llamada a función")
 
+        # Un argumento por eslabón de la cadena fcall_p -> fcall_pp -> fcall_p
+        def next_arg(c: PatitoParser.Fcall_pContext):
+            rest = c.fcall_pp()
+            return rest.fcall_p() if rest.getChildCount() else None
+
         func_name = self._call_func_stack[-1]
         _, param_types = self.func_dir.signature(func_name)
-        index = self._call_param_index_stack[-1]
+        func_info = self.func_dir.get_function(func_name)
 
-        if index >= len(param_types):
-            raise TypeMismatchError(
-                f"Demasiados argumentos en llamada a función '{func_name}'"
-            )
+        for node in self._chain(ctx, next_arg):
+            # Evaluar el argumento (expresion)
+            self.visit(node.expresion())
+            arg_addr = self.PilaO.pop()
+            arg_type: TypeName = self.PTypes.pop()
 
-        expected_type = param_types[index]
-        if not can_assign(expected_type, arg_type):
-            raise TypeMismatchError(
-                f"Tipo incorrecto para argumento {index+1} de '{func_name}': "
-                f"se esperaba {expected_type}, se encontró {arg_type}"
-            )
+            index = self._call_param_index_stack[-1]
+            if index >= len(param_types):
+                raise TypeMismatchError(
+                    f"Demasiados argumentos en llamada a función '{func_name}'"
+                )
 
-        # Dirección del parámetro formal dentro de la función
-        func_info = self.func_dir.get_function(func_name)
-        param_info = func_info.params[index]
-        param_var = func_info.vars.get(param_info.name)
-        if param_var is None or param_var.address is None:
-            raise RuntimeError(
-                f"El parámetro '{param_info.name}' de la función '{func_name}' "
-                "no tiene dirección virtual asignada"
-            )
+            expected_type = param_types[index]
+            if not can_assign(expected_type, arg_type):
+                raise TypeMismatchError(
+                    f"Tipo incorrecto para argumento {index+1} de '{func_name}': "
+                    f"se esperaba {expected_type}, se encontró {arg_type}"
+                )
+
+            # Dirección del parámetro formal dentro de la función
+            param_info = func_info.params[index]
+            param_var = func_info.vars.get(param_info.name)
+            if param_var is None or param_var.address is None:
+                raise RuntimeError(
+                    f"El parámetro '{param_info.name}' de la función '{func_name}' "
+                    "no tiene dirección virtual asignada"
+                )
 
-        # PARAM arg -> dirParam
-        self._emit("PARAM", arg_addr, None, param_var.address)
+            # PARAM arg -> dirParam
+            self._emit("PARAM", arg_addr, None, param_var.address)
+            self._release_temp(arg_addr)
 
-        # Avanzar índice de parámetro y continuar con el resto (si los hay)
-        self._call_param_index_stack[-1] = index + 1
-        self.visit(ctx.fcall_pp())
+            # Avanzar índice de parámetro
+            self._call_param_index_stack[-1] = index + 1
         return None
 
     # fcall_pp : COMMA fcall_p | /* empty */ ;
@@ -320,6 +389,7 @@ class CodeGenVisitor(SemanticVisitor):
 
             # Asignar el valor de la expresión a la celda de retorno
             self.quads.append(("=", value_addr, None, func_info.return_address))
+            self._release_temp(value_addr)
             # Y generar el RETURN para que la VM regrese al llamador
             self.quads.append(("RETURN", func_info.return_address, None, None))
 
@@ -377,10 +447,10 @@ class CodeGenVisitor(SemanticVisitor):
 
     # body_pp : statement body_pp | /* empty */ ;
     def visitBody_pp(self, ctx: PatitoParser.Body_ppContext):
-        if ctx.getChildCount() == 0:
-            return None
-        self.visit(ctx.statement())
-        self.visit(ctx.body_pp())
+        # Ciclo en vez de recursión: un programa con miles de estatutos no
+        # agota la pila de Python
+        for node in self._chain(ctx, lambda c: c.body_pp()):
+            self.visit(node.statement())
         return None
 
     # ----------------- PRINT ----------------- #
@@ -388,26 +458,33 @@ class CodeGenVisitor(SemanticVisitor):
     # print_cfg : PRINT LP print_p RP SEMI ;
     def visitPrint_cfg(self, ctx: PatitoParser.Print_cfgContext):
         self.visit(ctx.print_p())
+        # El último cuádruplo generado es el PRINT del último argumento
+        op, value_addr, _, _ = self.quads[-1]
+        self.quads[-1] = (op, value_addr, None, PRINT_EOL)
         return None
 
-    # print_p : expresion print_pp | STRING_LIT print_pp ;
+    # print_p  : expresion print_pp | STRING_LIT print_pp ;
+    # print_pp : COMMA print_p | /* empty */ ;
     def visitPrint_p(self, ctx: PatitoParser.Print_pContext):
-        if ctx.expresion():
-            # Caso: print(expresion, ...)
-            self.visit(ctx.expresion())
-            value_addr = self.PilaO.pop()
-            _value_type = self.PTypes.pop()
-            # Cuádruplo: PRINT value
-            self.quads.append(("PRINT", value_addr, None, None))
-        else:
-            # Caso: print("string", ...)
-            text = ctx.STRING_LIT().getText()   # incluye comillas
-            # Registramos la constante (tipo string)
-            const_addr = self.const_table.get_or_add("string", text)
-            self.quads.append(("PRINT", const_addr, None, None))
-
-        # Continuar con más argumentos, si hay
-        self.visit(ctx.print_pp())
+        def next_item(c: PatitoParser.Print_pContext):
+            rest = c.print_pp()
+            return rest.print_p() if rest.getChildCount() else None
+
+        for node in self._chain(ctx, next_item):
+            if node.expresion():
+                # Caso: print(expresion, ...)
+                self.visit(node.expresion())
+                value_addr = self.PilaO.pop()
+                _value_type = self.PTypes.pop()
+                # Cuádruplo: PRINT value
+                self.quads.append(("PRINT", value_addr, None, None))
+                self._release_temp(value_addr)
+            else:
+                # Caso: print("string", ...)
+                text = node.STRING_LIT().getText()   # incluye comillas
+                # Registramos la constante (tipo string)
+                const_addr = self.const_table.get_or_add("string", text)
+                self.quads.append(("PRINT", const_addr, None, None))
         return None
 
     # print_pp : COMMA print_p | /* empty */ ;
@@ -434,6 +511,7 @@ class CodeGenVisitor(SemanticVisitor):
 
         # 2. Crear GOTOF y recordar su índice para rellenar luego
         gotof_idx = self._emit("GOTOF", cond_addr, None, None)
+        self._release_temp(cond_addr)
         self.PSaltos.append(gotof_idx)
 
         # 3. Traducir el cuerpo del if (body)
@@ -483,6 +561,7 @@ class CodeGenVisitor(SemanticVisitor):
 
         # 3. GOTOF para salir del ciclo
         gotof_idx = self._emit("GOTOF", cond_addr, None, None)
+        self._release_temp(cond_addr)
         self.PSaltos.append(gotof_idx)
 
         # 4. Traducir el cuerpo del while
@@ -529,8 +608,7 @@ class CodeGenVisitor(SemanticVisitor):
             )
 
         # Temporal bool
-        temp_addr = self.vm.alloc_temp(result_type)
-        self.quads.append((right_label, left_addr, right_addr, temp_addr))
+        temp_addr = self._emit_operation(right_label, left_addr, right_addr, result_type)
 
         self.PilaO.append(temp_addr)
         self.PTypes.append(result_type)
@@ -546,36 +624,31 @@ class CodeGenVisitor(SemanticVisitor):
 
     # exp_p : PLUS termino exp_p | MINUS termino exp_p | /* empty */ ;
     def visitExp_p(self, ctx: PatitoParser.Exp_pContext):
-        if ctx.getChildCount() == 0:
-            return None
-
-        op = ctx.getChild(0).getText()  # '+' o '-'
-        self._push_operator(op)
-        self.visit(ctx.termino())
-
-        # Reducir mientras en la cima haya + o -
-        while self.POper and self.POper[-1] in {"+", "-"}:
-            op = self.POper.pop()
-            right_addr = self.PilaO.pop()
-            right_type: TypeName = self.PTypes.pop()
-            left_addr = self.PilaO.pop()
-            left_type: TypeName = self.PTypes.pop()
-
-            # Cubo semántico espera (op, left, right)
-            result_type = type_of_binary(op, left_type, right_type)
-            if result_type is None:
-                raise TypeMismatchError(
-                    f"No se puede aplicar {op} entre {left_type} y {right_type}"
-                )
-
-            temp_addr = self.vm.alloc_temp(result_type)
-            self.quads.append((op, left_addr, right_addr, temp_addr))
-
-            self.PilaO.append(temp_addr)
-            self.PTypes.append(result_type)
-
-        # Continuar con recursión a la derecha
-        self.visit(ctx.exp_p())
+        # Un eslabón por operador: ciclo en vez de recursión a la derecha
+        for node in self._chain(ctx, lambda c: c.exp_p()):
+            op = node.getChild(0).getText()  # '+' o '-'
+            self._push_operator(op)
+            self.visit(node.termino())
+
+            # Reducir mientras en la cima haya + o -
+            while self.POper and self.POper[-1] in {"+", "-"}:
+                op = self.POper.pop()
+                right_addr = self.PilaO.pop()
+                right_type: TypeName = self.PTypes.pop()
+                left_addr = self.PilaO.pop()
+                left_type: TypeName = self.PTypes.pop()
+
+                # Cubo semántico espera (op, left, right)
+                result_type = type_of_binary(op, left_type, right_type)
+                if result_type is None:
+                    raise TypeMismatchError(
+                        f"No se puede aplicar {op} entre {left_type} y {right_type}"
+                    )
+
+                temp_addr = self._emit_operation(op, left_addr, right_addr, result_type)
+
+                self.PilaO.append(temp_addr)
+                self.PTypes.append(result_type)
         return None
 
     # ----------------- TERMINO (multiplicación/división) ----------------- #
@@ -588,35 +661,31 @@ class CodeGenVisitor(SemanticVisitor):
 
     # termino_p : MUL factor termino_p | DIV factor termino_p | /* empty */ ;
     def visitTermino_p(self, ctx: PatitoParser.Termino_pContext):
-        if ctx.getChildCount() == 0:
-            return None
-
-        op = ctx.getChild(0).getText()  # '*' o '/'
-        self._push_operator(op)
-        self.visit(ctx.factor())
-
-        # Reducir mientras en la cima haya * o /
-        while self.POper and self.POper[-1] in {"*", "/"}:
-            op = self.POper.pop()
-            right_addr = self.PilaO.pop()
-            right_type: TypeName = self.PTypes.pop()
-            left_addr = self.PilaO.pop()
-            left_type: TypeName = self.PTypes.pop()
-
-            # Cubo semántico espera (op, left, right)
-            result_type = type_of_binary(op, left_type, right_type)
-            if result_type is None:
-                raise TypeMismatchError(
-                    f"No se puede aplicar {op} entre {left_type} y {right_type}"
-                )
-
-            temp_addr = self.vm.alloc_temp(result_type)
-            self.quads.append((op, left_addr, right_addr, temp_addr))
-
-            self.PilaO.append(temp_addr)
-            self.PTypes.append(result_type)
-
-        self.visit(ctx.termino_p())
+        # Un eslabón por operador: ciclo en vez de recursión a la derecha
+        for node in self._chain(ctx, lambda c: c.termino_p()):
+            op = node.getChild(0).getText()  # '*' o '/'
+            self._push_operator(op)
+            self.visit(node.factor())
+
+            # Reducir mientras en la cima haya * o /
+            while self.POper and self.POper[-1] in {"*", "/"}:
+                op = self.POper.pop()
+                right_addr = self.PilaO.pop()
+                right_type: TypeName = self.PTypes.pop()
+                left_addr = self.PilaO.pop()
+                left_type: TypeName = self.PTypes.pop()
+
+                # Cubo semántico espera (op, left, right)
+                result_type = type_of_binary(op, left_type, right_type)
+                if result_type is None:
+                    raise TypeMismatchError(
+                        f"No se puede aplicar {op} entre {left_type} y {right_type}"
+                    )
+
+                temp_addr = self._emit_operation(op, left_addr, right_addr, result_type)
+
+                self.PilaO.append(temp_addr)
+                self.PTypes.append(result_type)
         return None
 
     # ----------------- FACTOR ----------------- #
@@ -693,9 +762,8 @@ class CodeGenVisitor(SemanticVisitor):
                     f"No se puede aplicar - a tipo {operand_type}"
                 )
 
-            temp_addr = self.vm.alloc_temp(result_type)
             # Usamos '-' con right=None para indicar unario
-            self.quads.append(("-", operand_addr, None, temp_addr))
+            temp_addr = self._emit_operation("-", operand_addr, None, result_type)
 
             self.PilaO.append(temp_addr)
             self.PTypes.append(result_type)
@@ -725,24 +793,69 @@ class CodeGenVisitor(SemanticVisitor):
 
         # Cuádruplo (=, expr, -, dest)
         self.quads.append(("=", expr_addr, None, dest_addr))
+        self._release_temp(expr_addr)
         return None
 
 
 # ----------------- Función de conveniencia translate() ----------------- #
 
-def translate(source: str) -> Tuple[object, List[Quad]]:
+# Front ends disponibles: el parser generado por ANTLR y el escrito a mano
+# (entrega1/rd_parser.py), que produce un árbol con la misma forma
+FRONTENDS = ("antlr", "rd")
+
+
+def parse_tree(source: str, frontend: str = "antlr", reuse_parser: bool = False):
+    """Árbol de la regla `start` para `source` con el front end elegido.
+
+    Con ANTLR se parsea primero en modo SLL y solo si falla con LL completo
+    (ver entrega1/antlr_frontend.py). reuse_parser=True usa un lexer/parser
+    compartido por todo el proceso en vez de construir uno nuevo."""
+    if frontend == "rd":
+        return rd_parse(source)
+    if frontend != "antlr":
+        raise ValueError(f"Front end desconocido: {frontend!r} (opciones: {', '.join(FRONTENDS)})")
+    antlr = shared_frontend() if reuse_parser else AntlrFrontend()
+    return antlr.parse(source)
+
+
+def translate(
+    source: str,
+    optimize: bool = False,
+    frontend: str = "antlr",
+    reuse_parser: bool = False,
+) -> Tuple[object, List[Quad]]:
     """Recibe código fuente Patito como string, ejecuta scanner + parser +
-    CodeGenVisitor (Syntax-Directed Translation) y regresa (func_dir, quads)."""
-    input_stream = InputStream(source)
-    lexer = PatitoLexer(input_stream)
-    tokens = CommonTokenStream(lexer)
-    parser = PatitoParser(tokens)
+    CodeGenVisitor (Syntax-Directed Translation) y regresa (func_dir, quads).
+
+    `frontend` elige el parser: "antlr" (default) o "rd" (escrito a mano).
+    Con reuse_parser=True, el front end de ANTLR se reusa entre llamadas
+    (útil para compilar muchos programas en el mismo proceso).
 
-    tree = parser.start()
+    Con optimize=True se pliegan las constantes al generar y después se corren
+    las pasadas de entrega3/optimizer.py (constant folding y propagación de
+    copias); los reportes quedan en func_dir.optimization_reports."""
+    tree = parse_tree(source, frontend, reuse_parser)
+    return translate_tree(tree, optimize)
 
-    visitor = CodeGenVisitor()
+
+def translate_tree(tree, optimize: bool = False) -> Tuple[object, List[Quad]]:
+    """Como translate(), pero a partir de un árbol ya parseado (por ejemplo,
+    para revisar los errores de sintaxis antes de generar código)."""
+    visitor = CodeGenVisitor(fold_constants=optimize)
     func_dir, quads = visitor.visit(tree)
 
+    reports: List[OptimizationReport] = []
+    if optimize:
+        quads, report = fold_constants(quads, visitor.const_table, func_dir)
+        # Lo plegado al generar también cuenta: cada operación plegada es un
+        # cuádruplo que no se emitió
+        report.quads_before += visitor.folded
+        report.rewritten += visitor.folded
+        reports.append(report)
+        quads, report = propagate_copies(quads, func_dir)
+        reports.append(report)
+    setattr(func_dir, "optimization_reports", reports)
+
     # Construir un mapa addr -> valor de constantes para la VM y pruebas
     const_addr_to_value = {
         addr: value
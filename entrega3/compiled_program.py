@@ -0,0 +1,116 @@
+# entrega3/compiled_program.py
+#
+# Resultado de compilar un programa Patito, separado del árbol y del
+# visitor: todo lo que la VirtualMachine necesita para ejecutarlo.
+#
+#   VirtualMachine(prog.quads, constants=prog.constants, frames=prog.frames)
+#
+# Se puede convertir a/desde un dict de tipos JSON (to_dict / from_dict) para
+# guardarlo en disco (ver program_cache.py).
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from entrega2.symbols import FrameLayout
+from entrega3.codegen_visitor import Quad, translate
+
+# Se incrementa cuando cambia la forma de CompiledProgram.to_dict()
+FORMAT_VERSION = 1
+
+# Módulos cuyo código afecta los cuádruplos generados
+_COMPILER_MODULES = (
+    "entrega1/Patito.g4",
+    "entrega1/antlr_frontend.py",
+    "entrega1/generated/PatitoLexer.py",
+    "entrega1/generated/PatitoParser.py",
+    "entrega1/rd_parser.py",
+    "entrega2/semantic_cube.py",
+    "entrega2/semantic_visitor.py",
+    "entrega2/symbols.py",
+    "entrega3/codegen_visitor.py",
+    "entrega3/optimizer.py",
+    "entrega4/virtual_memory.py",
+)
+
+_ROOT = Path(__file__).resolve().parents[1]
+_compiler_version: Optional[str] = None
+
+
+def compiler_version() -> str:
+    """Huella del compilador: cambia si cambia cualquiera de sus módulos."""
+    global _compiler_version
+    if _compiler_version is None:
+        h = hashlib.sha256(f"format={FORMAT_VERSION}".encode())
+        for rel in _COMPILER_MODULES:
+            h.update(rel.encode())
+            h.update((_ROOT / rel).read_bytes())
+        _compiler_version = h.hexdigest()[:16]
+    return _compiler_version
+
+
+@dataclass
+class FunctionMeta:
+    """Lo que la VM y los backends necesitan de una función del directorio."""
+    start_quad: int
+    return_type: str = "void"
+    return_address: Optional[int] = None
+    params: List[int] = field(default_factory=list)  # direcciones, en orden
+
+
+@dataclass
+class CompiledProgram:
+    quads: List[Quad]
+    constants: Dict[int, Any]
+    frames: Dict[str, FrameLayout] = field(default_factory=dict)
+    functions: Dict[str, FunctionMeta] = field(default_factory=dict)
+
+    @classmethod
+    def from_translation(cls, func_dir: Any, quads: List[Quad]) -> CompiledProgram:
+        functions = {
+            name: FunctionMeta(
+                start_quad=info.start_quad,
+                return_type=info.return_type,
+                return_address=info.return_address,
+                params=[info.vars.get(p.name).address for p in info.params],
+            )
+            for name, info in func_dir.all_functions().items()
+        }
+        return cls(
+            quads=list(quads),
+            constants=dict(func_dir.constants),
+            frames=func_dir.frame_layouts(),
+            functions=functions,
+        )
+
+    @classmethod
+    def from_source(cls, source: str, **options: Any) -> CompiledProgram:
+        """translate(source, **options) empaquetado como CompiledProgram."""
+        func_dir, quads = translate(source, **options)
+        return cls.from_translation(func_dir, quads)
+
+    # ----------------- Serialización ----------------- #
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": FORMAT_VERSION,
+            "quads": [list(q) for q in self.quads],
+            # Las llaves de JSON son strings; se guarda como lista de pares
+            "constants": [[addr, value] for addr, value in self.constants.items()],
+            "frames": {name: asdict(layout) for name, layout in self.frames.items()},
+            "functions": {name: asdict(meta) for name, meta in self.functions.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> CompiledProgram:
+        if data.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Formato de programa compilado no soportado: {data.get('format')!r}")
+        return cls(
+            quads=[tuple(q) for q in data["quads"]],  # type: ignore[misc]
+            constants={int(addr): value for addr, value in data["constants"]},
+            frames={name: FrameLayout(**layout) for name, layout in data["frames"].items()},
+            functions={name: FunctionMeta(**meta) for name, meta in data["functions"].items()},
+        )
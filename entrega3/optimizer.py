@@ -0,0 +1,322 @@
+# entrega3/optimizer.py
+#
+# Optimizaciones sobre la fila de cuádruplos ya generada por CodeGenVisitor.
+#
+#   * fold_constants: evalúa en compilación las operaciones aritméticas y
+#     relacionales cuyos operandos son constantes, registra el resultado en la
+#     ConstantTable y elimina el cuádruplo cuando su temporal ya no se usa.
+#   * propagate_copies: escribe el resultado de una operación directo en la
+#     variable cuando el temporal solo se usaba para el "=" siguiente, y
+#     sustituye copias (x = y) en las lecturas que siguen dentro del bloque.
+#   * compact: elimina cuádruplos y reajusta los saltos (GOTO / GOTOF / GOSUB)
+#     y el start_quad de cada función. Lo usan todas las pasadas.
+
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from entrega2.semantic_cube import TypeName, type_of_binary, type_of_unary
+from entrega4.virtual_memory import ConstantTable, locate
+
+Quad = Tuple[str, object, object, object]
+
+# Mismas operaciones que ejecuta la VM, para que el valor plegado sea idéntico
+BINARY_FOLDS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# Saltos cuyo RESULT es un índice de cuádruplo
+JUMP_OPS = {"GOTO", "GOTOF", "GOSUB"}
+
+# Cuádruplos que terminan un bloque básico
+BLOCK_ENDS = JUMP_OPS | {"RETURN", "ENDFUNC", "END"}
+
+# Cuádruplos que escriben su RESULT como dirección de memoria
+WRITES_RESULT = set(BINARY_FOLDS) | {"="}
+
+# Regresado por fold_binary / fold_unary cuando no se puede plegar
+NO_FOLD = object()
+
+
+@dataclass
+class OptimizationReport:
+    """Resumen de una pasada de optimización."""
+    pass_name: str
+    quads_before: int
+    quads_after: int
+    rewritten: int = 0  # cuádruplos evaluados / reescritos por la pasada
+
+    @property
+    def removed(self) -> int:
+        return self.quads_before - self.quads_after
+
+
+# ----------------- Evaluación de constantes ----------------- #
+
+def fold_binary(op: str, left: Any, right: Any) -> Any:
+    """Valor de `left op right`, o NO_FOLD si debe quedarse para ejecución."""
+    fn = BINARY_FOLDS.get(op)
+    if fn is None:
+        return NO_FOLD
+    if op == "/" and right == 0:
+        # La división entre cero se reporta al ejecutar, igual que sin optimizar
+        return NO_FOLD
+    return fn(left, right)
+
+
+def fold_unary(op: str, operand: Any) -> Any:
+    if op == "-":
+        return -operand
+    return NO_FOLD
+
+
+def is_constant(addr: object) -> bool:
+    return isinstance(addr, int) and locate(addr)[0] == "const"
+
+
+def is_temp(addr: object) -> bool:
+    return isinstance(addr, int) and locate(addr)[0] == "temp"
+
+
+def _type_of(addr: int) -> TypeName:
+    return locate(addr)[1]
+
+
+def fold_quad(quad: Quad, const_table: ConstantTable) -> Optional[int]:
+    """
+    Si el cuádruplo es aritmético/relacional (o menos unario) con operandos
+    constantes, regresa la dirección de la constante resultante.
+    """
+    op, left, right, _ = quad
+    if op not in BINARY_FOLDS or not is_constant(left):
+        return None
+
+    if right is None:
+        result_type = type_of_unary(op, _type_of(left))
+        value = fold_unary(op, const_table.value_of(left))
+    elif is_constant(right):
+        result_type = type_of_binary(op, _type_of(left), _type_of(right))
+        value = fold_binary(op, const_table.value_of(left), const_table.value_of(right))
+    else:
+        return None
+
+    if result_type is None or value is NO_FOLD:
+        return None
+    return const_table.get_or_add(result_type, value)
+
+
+# ----------------- Bloques básicos ----------------- #
+
+def block_leaders(quads: Sequence[Quad], func_dir: Any = None) -> Set[int]:
+    """Índices donde empieza un bloque básico."""
+    leaders = {0}
+    for i, (op, _, _, res) in enumerate(quads):
+        if op in JUMP_OPS and isinstance(res, int):
+            leaders.add(res)
+        if op in BLOCK_ENDS:
+            leaders.add(i + 1)
+    if func_dir is not None:
+        for info in func_dir.all_functions().values():
+            if info.start_quad is not None:
+                leaders.add(info.start_quad)
+    return {i for i in leaders if i <= len(quads)}
+
+
+def upward_exposed_temps(quads: Sequence[Quad], leaders: Set[int]) -> Set[int]:
+    """Temporales que algún bloque lee antes de escribirlos (vienen de otro bloque)."""
+    exposed: Set[int] = set()
+    written: Set[int] = set()
+    for i, (op, left, right, res) in enumerate(quads):
+        if i in leaders:
+            written = set()
+        if op not in ("ERA", "GOSUB"):
+            for addr in (left, right):
+                if is_temp(addr) and addr not in written:
+                    exposed.add(addr)
+        if op in WRITES_RESULT and is_temp(res):
+            written.add(res)
+    return exposed
+
+
+# ----------------- Compactación ----------------- #
+
+def compact(quads: Sequence[Quad], keep: Sequence[bool], func_dir: Any = None) -> List[Quad]:
+    """
+    Regresa los cuádruplos con keep[i] == True, reajustando los destinos de
+    GOTO / GOTOF / GOSUB y el start_quad de las funciones. Un salto hacia un
+    cuádruplo eliminado pasa al siguiente que se conserva.
+    """
+    new_index: List[int] = []
+    kept = 0
+    for flag in keep:
+        new_index.append(kept)
+        if flag:
+            kept += 1
+    new_index.append(kept)
+
+    out: List[Quad] = []
+    for quad, flag in zip(quads, keep):
+        if not flag:
+            continue
+        op, left, right, res = quad
+        if op in JUMP_OPS and isinstance(res, int):
+            quad = (op, left, right, new_index[res])
+        out.append(quad)
+
+    if func_dir is not None:
+        for info in func_dir.all_functions().values():
+            if info.start_quad is not None:
+                info.start_quad = new_index[info.start_quad]
+    return out
+
+
+# ----------------- Constant folding ----------------- #
+
+def fold_constants(
+    quads: Sequence[Quad],
+    const_table: ConstantTable,
+    func_dir: Any = None,
+) -> Tuple[List[Quad], OptimizationReport]:
+    """
+    Pliega operaciones con operandos constantes dentro de cada bloque básico.
+
+    El temporal de un cuádruplo plegado se sustituye por la constante en los
+    cuádruplos siguientes del mismo bloque (hasta que se reescribe). El
+    cuádruplo se elimina si ningún otro bloque lee ese temporal sin
+    escribirlo antes.
+    """
+    leaders = block_leaders(quads, func_dir)
+    out: List[Quad] = list(quads)
+    subst: Dict[int, int] = {}
+    folded: List[Tuple[int, int]] = []
+
+    for i, quad in enumerate(out):
+        if i in leaders:
+            subst = {}
+        op, left, right, res = quad
+        if op not in ("ERA", "GOSUB"):
+            left = subst.get(left, left) if isinstance(left, int) else left
+            right = subst.get(right, right) if isinstance(right, int) else right
+            quad = (op, left, right, res)
+            out[i] = quad
+
+        if op in WRITES_RESULT:
+            subst.pop(res, None)
+            if is_temp(res):
+                const_addr = fold_quad(quad, const_table)
+                if const_addr is not None:
+                    subst[res] = const_addr
+                    folded.append((i, res))
+
+    exposed = upward_exposed_temps(out, leaders)
+    keep = [True] * len(out)
+    for i, temp in folded:
+        if temp not in exposed:
+            keep[i] = False
+
+    result = compact(out, keep, func_dir)
+    report = OptimizationReport(
+        "constant_folding", len(quads), len(result), rewritten=len(folded)
+    )
+    return result, report
+
+
+# ----------------- Propagación de copias ----------------- #
+
+def _kill_copies(copies: Dict[object, object], addr: object) -> None:
+    """Olvida las copias hacia ``addr`` y las que leían de ``addr``."""
+    copies.pop(addr, None)
+    for dst in [d for d, src in copies.items() if src == addr]:
+        del copies[dst]
+
+
+def _retarget_dest(
+    quads: Sequence[Quad],
+    i: int,
+    leaders: Set[int],
+    exposed: Set[int],
+) -> Optional[object]:
+    """
+    Variable a la que puede escribir directo el cuádruplo ``i``: la del "="
+    que le sigue en el mismo bloque, si el temporal no tiene otros usos.
+    """
+    temp = quads[i][3]
+    if not is_temp(temp) or temp in exposed or i + 1 in leaders or i + 1 >= len(quads):
+        return None
+    op, left, _, dest = quads[i + 1]
+    if op != "=" or left != temp:
+        return None
+
+    # Nadie más en el bloque lee el temporal antes de reescribirlo
+    for j in range(i + 2, len(quads)):
+        if j in leaders:
+            break
+        op, left, right, res = quads[j]
+        if op not in ("ERA", "GOSUB") and temp in (left, right):
+            return None
+        if op in WRITES_RESULT and res == temp:
+            break
+    return dest
+
+
+def propagate_copies(
+    quads: Sequence[Quad],
+    func_dir: Any = None,
+) -> Tuple[List[Quad], OptimizationReport]:
+    """
+    Dos reescrituras dentro de cada bloque básico:
+
+    - ``(op, a, b, t), (=, t, -, x)`` queda como ``(op, a, b, x)`` si ningún
+      otro cuádruplo lee ``t`` (ni en el bloque ni desde otro bloque).
+    - Después de ``(=, y, -, x)`` las lecturas de ``x`` se hacen de ``y``
+      mientras ninguno de los dos se reescriba.
+
+    PARAM escribe en el frame de la función llamada y GOSUB termina el
+    bloque, así que ninguno invalida las copias del bloque actual.
+    """
+    leaders = block_leaders(quads, func_dir)
+    exposed = upward_exposed_temps(quads, leaders)
+    out: List[Quad] = list(quads)
+    keep = [True] * len(out)
+    copies: Dict[object, object] = {}
+    rewritten = 0
+
+    for i, quad in enumerate(out):
+        if i in leaders:
+            copies = {}
+        if not keep[i]:
+            continue
+        op, left, right, res = quad
+        if op not in ("ERA", "GOSUB"):
+            new_left = copies.get(left, left)
+            new_right = copies.get(right, right)
+            rewritten += (new_left != left) + (new_right != right)
+            left, right = new_left, new_right
+
+        if op in WRITES_RESULT:
+            dest = _retarget_dest(out, i, leaders, exposed)
+            if dest is not None:
+                res = dest
+                keep[i + 1] = False
+                rewritten += 1
+            _kill_copies(copies, res)
+            if op == "=" and left != res:
+                copies[res] = left
+        out[i] = (op, left, right, res)
+
+    result = compact(out, keep, func_dir)
+    report = OptimizationReport(
+        "copy_propagation", len(quads), len(result), rewritten=rewritten
+    )
+    return result, report
@@ -0,0 +1,143 @@
+# entrega3/program_cache.py
+#
+# Caché en disco de programas compilados, direccionada por contenido:
+#
+#   llave = sha256(versión del compilador + opciones de translate + fuente)
+#
+# Cada entrada es un archivo <llave>.json con CompiledProgram.to_dict(). En un
+# hit no se parsea ni se generan cuádruplos. El tamaño total se acota con
+# desalojo LRU: cada hit actualiza el mtime del archivo y, al guardar, se
+# borran los archivos con mtime más viejo hasta caber en max_bytes.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from entrega3.compiled_program import CompiledProgram, compiler_version
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Opciones de translate que no cambian el programa generado (no van en la llave)
+_KEY_IGNORED_OPTIONS = frozenset({"reuse_parser"})
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ProgramCache:
+    """
+    Caché de CompiledProgram en el directorio ``directory``.
+
+    - ``translate(source, **options)``: regresa el programa compilado,
+      desde la caché si ya existe
+    - ``stats``: hits / misses / stores / evictions
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+
+    # ----------------- Llaves ----------------- #
+
+    @staticmethod
+    def key(source: str, **options: Any) -> str:
+        h = hashlib.sha256()
+        h.update(compiler_version().encode())
+        relevant = {k: v for k, v in options.items() if k not in _KEY_IGNORED_OPTIONS}
+        h.update(json.dumps(relevant, sort_keys=True).encode())
+        h.update(b"\0")
+        h.update(source.encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    # ----------------- API ----------------- #
+
+    def get(self, source: str, **options: Any) -> Optional[CompiledProgram]:
+        path = self._path(self.key(source, **options))
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            program = CompiledProgram.from_dict(data)
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+        except (ValueError, KeyError, TypeError, AttributeError):
+            # Entrada corrupta o con otro formato (incluido JSON válido que
+            # no es un objeto): se descarta
+            path.unlink(missing_ok=True)
+            self.stats.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # marca de uso para el LRU
+        except FileNotFoundError:
+            pass  # otro proceso la desalojó después de leerla; el programa sirve
+        self.stats.hits += 1
+        return program
+
+    def put(self, source: str, program: CompiledProgram, **options: Any) -> None:
+        path = self._path(self.key(source, **options))
+        payload = json.dumps(program.to_dict(), separators=(",", ":"))
+
+        # Escritura atómica: otro proceso nunca ve un archivo a medias
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+        self.stats.stores += 1
+        self._evict()
+
+    def translate(self, source: str, **options: Any) -> CompiledProgram:
+        """Como translate(), pero pasando por la caché."""
+        program = self.get(source, **options)
+        if program is None:
+            program = CompiledProgram.from_source(source, **options)
+            self.put(source, program, **options)
+        return program
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    # ----------------- Desalojo LRU ----------------- #
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.directory.glob("*.json"))
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+            total += st.st_size
+
+        entries.sort()  # los usados hace más tiempo primero
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.stats.evictions += 1
@@ -0,0 +1,88 @@
+from entrega3.codegen_visitor import translate
+from entrega3.optimizer import fold_constants
+from entrega4.virtual_memory import ConstantTable, VirtualMemory
+from entrega5.vm import VirtualMachine
+
+
+SOURCE = """
+program p;
+var x, i: int;
+var f: float;
+
+main {
+    x = (3 + 5) * 2;
+    f = -2 * 1.5 + x;
+    i = 0;
+    while (i < 2 * 2) do {
+        i = i + 1;
+    };
+    print(x, f, i, 1 < 2);
+} end
+"""
+
+
+def _run(func_dir, quads, capsys) -> str:
+    VirtualMachine(quads, constants=func_dir.constants).run()
+    return capsys.readouterr().out
+
+
+def test_folding_elimina_cuadruplos_y_conserva_resultado(capsys):
+    plain_dir, plain = translate(SOURCE)
+    opt_dir, opt = translate(SOURCE, optimize=True)
+
+    assert len(opt) < len(plain)
+    assert _run(opt_dir, opt, capsys) == _run(plain_dir, plain, capsys)
+
+    # (3 + 5) * 2 quedó como una sola asignación de la constante 16
+    assert ("*" not in [q[0] for q in opt[:3]])
+    assert any(q[0] == "=" and opt_dir.constants.get(q[1]) == 16 for q in opt)
+
+
+def test_pasada_de_folding_sobre_cuadruplos():
+    table = ConstantTable(VirtualMemory())
+    c3 = table.get_or_add("int", 3)
+    c4 = table.get_or_add("int", 4)
+    quads = [
+        ("GOTO", None, None, 1),
+        ("+", c3, c4, 8000),
+        ("<", 8000, c4, 9000),      # depende del plegado anterior
+        ("=", 8000, None, 1000),
+        ("GOTOF", 9000, None, 5),
+        ("PRINT", 8000, None, None),  # otro bloque: 8000 debe conservarse
+        ("END", None, None, None),
+    ]
+    out, report = fold_constants(quads, table)
+
+    assert report.rewritten == 2
+    assert report.removed == 1
+    c7 = table.get_or_add("int", 7)
+    assert out == [
+        ("GOTO", None, None, 1),
+        ("+", c3, c4, 8000),
+        ("=", c7, None, 1000),
+        ("GOTOF", table.get_or_add("bool", False), None, 4),
+        ("PRINT", 8000, None, None),
+        ("END", None, None, None),
+    ]
+
+
+def test_folding_no_pliega_division_entre_cero():
+    table = ConstantTable(VirtualMemory())
+    c1 = table.get_or_add("int", 1)
+    c0 = table.get_or_add("int", 0)
+    quads = [("/", c1, c0, 8500), ("PRINT", 8500, None, None), ("END", None, None, None)]
+    out, report = fold_constants(quads, table)
+    assert out == quads
+    assert report.removed == 0
+
+
+def test_reporte_cuenta_lo_plegado_al_generar():
+    plain_dir, plain = translate(SOURCE)
+    opt_dir, _ = translate(SOURCE, optimize=True)
+    report = opt_dir.optimization_reports[0]
+
+    assert report.pass_name == "constant_folding"
+    # 3 + 5, (...) * 2, el - unario de 2, -2 * 1.5, 2 * 2 y 1 < 2
+    assert report.rewritten == 6
+    assert report.quads_before == len(plain)
+    assert report.removed == report.rewritten
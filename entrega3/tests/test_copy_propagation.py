@@ -0,0 +1,126 @@
+from entrega3.codegen_visitor import translate
+from entrega3.optimizer import propagate_copies
+from entrega5.output import CaptureSink
+from entrega5.vm import VirtualMachine
+
+
+SOURCE = """
+program p;
+var i, s, x: int;
+int doble(k: int) {
+  {
+    return k * 2;
+  }
+};
+main {
+  i = 0;
+  s = 0;
+  while (i < 5) do {
+    x = s;
+    s = x + i;
+    s = s + doble(i);
+    i = i + 1;
+  };
+  print(s, x);
+} end
+"""
+
+
+def _run(func_dir, quads) -> str:
+    sink = CaptureSink()
+    VirtualMachine(quads, constants=func_dir.constants, output=sink).run()
+    return sink.text
+
+
+def test_optimize_conserva_resultado_y_quita_copias():
+    plain_dir, plain = translate(SOURCE)
+    opt_dir, opt = translate(SOURCE, optimize=True)
+
+    assert _run(opt_dir, opt) == _run(plain_dir, plain)
+    report = opt_dir.optimization_reports[-1]
+    assert report.pass_name == "copy_propagation"
+    # x + i, k * 2, i + 1 y la suma con doble() escriben directo a la variable
+    assert report.removed == 4
+    assert len(opt) == len(plain) - 4
+
+
+def test_resultado_se_escribe_directo_en_la_variable():
+    quads = [
+        ("+", 1000, 1001, 8000),
+        ("=", 8000, None, 1002),
+        ("PRINT", 1002, None, 1),
+        ("END", None, None, None),
+    ]
+    out, report = propagate_copies(quads)
+    assert out == [
+        ("+", 1000, 1001, 1002),
+        ("PRINT", 1002, None, 1),
+        ("END", None, None, None),
+    ]
+    assert report.removed == 1
+
+
+def test_temporal_con_otros_usos_no_se_reescribe():
+    quads = [
+        ("+", 1000, 1001, 8000),
+        ("=", 8000, None, 1002),
+        ("PRINT", 8000, None, 1),
+        ("END", None, None, None),
+    ]
+    out, report = propagate_copies(quads)
+    assert out[0] == ("+", 1000, 1001, 8000)
+    assert report.removed == 0
+
+
+def test_temporal_leido_desde_otro_bloque_no_se_reescribe():
+    quads = [
+        ("+", 1000, 1001, 8000),
+        ("=", 8000, None, 1002),
+        ("GOTO", None, None, 3),
+        ("PRINT", 8000, None, 1),
+        ("END", None, None, None),
+    ]
+    out, _ = propagate_copies(quads)
+    assert out == quads
+
+
+def test_copias_se_propagan_hasta_que_se_reescriben():
+    quads = [
+        ("=", 1000, None, 1001),      # y = x
+        ("*", 1001, 1001, 8000),      # lee x en vez de y
+        ("PRINT", 8000, None, 1),
+        ("=", 13000, None, 1000),     # x cambia: la copia ya no vale
+        ("PRINT", 1001, None, 1),
+        ("END", None, None, None),
+    ]
+    out, report = propagate_copies(quads)
+    assert out[1] == ("*", 1000, 1000, 8000)
+    assert out[4] == ("PRINT", 1001, None, 1)
+    assert report.rewritten == 2
+
+
+def test_copias_no_cruzan_bloques():
+    quads = [
+        ("=", 1000, None, 1001),
+        ("PRINT", 1001, None, 1),
+        ("GOTOF", 1001, None, 4),     # termina el bloque
+        ("PRINT", 1001, None, 1),
+        ("END", None, None, None),
+    ]
+    out, _ = propagate_copies(quads)
+    assert out[1] == ("PRINT", 1000, None, 1)
+    assert out[2] == ("GOTOF", 1000, None, 4)
+    assert out[3] == ("PRINT", 1001, None, 1)
+
+
+def test_asignacion_destino_de_salto_no_se_quita():
+    # Un salto cae en el "=": quitarlo cambiaría lo que ejecuta ese camino
+    quads = [
+        ("GOTOF", 1003, None, 2),
+        ("+", 1000, 1001, 8000),
+        ("=", 8000, None, 1002),
+        ("END", None, None, None),
+    ]
+    out, report = propagate_copies(quads)
+    assert out == quads
+    assert report.removed == 0
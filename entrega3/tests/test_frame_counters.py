@@ -0,0 +1,37 @@
+from entrega3.codegen_visitor import translate
+from entrega5.vm import VirtualMachine
+
+
+def _func(i: int) -> str:
+    return f"""
+    int f{i}(a: int) {{
+      var b, c, d, e: int;
+      {{
+        b = a + {i};
+        return b;
+      }}
+    }};"""
+
+
+def test_cada_funcion_numera_sus_locales_desde_la_base(capsys):
+    # 120 funciones x 5 locales int: con un contador global se pasarían de 500
+    funcs = "".join(_func(i) for i in range(120))
+    source = f"""
+    program p;
+    var x: int;
+    {funcs}
+    main {{
+      x = f119(1);
+      print(x);
+    }} end
+    """
+    func_dir, quads = translate(source)
+
+    for name in ("f0", "f119"):
+        info = func_dir.get_function(name)
+        assert info.vars.get("a").address == 3000
+        assert info.frame.local_slots == {"int": 5}
+        assert info.frame.temp_slots == {"int": 1}
+
+    VirtualMachine(quads, constants=func_dir.constants, frames=func_dir.frame_layouts()).run()
+    assert capsys.readouterr().out.strip() == "120"
@@ -0,0 +1,35 @@
+from entrega3.codegen_visitor import translate
+from entrega5.vm import VirtualMachine
+
+
+def test_main_con_muchos_estatutos(capsys):
+    # Con recursión por estatuto (body_pp) el visitor agotaba la pila de Python
+    stmts = "\n".join("      x = x + 1;" for _ in range(600))
+    source = f"""
+    program p;
+    var x: int;
+    main {{
+      x = 0;
+{stmts}
+      print(x);
+    }} end
+    """
+    func_dir, quads = translate(source)
+    VirtualMachine(quads, constants=func_dir.constants).run()
+    assert capsys.readouterr().out.strip() == "600"
+
+
+def test_expresion_y_argumentos_largos(capsys):
+    terms = " + ".join("1" for _ in range(300))
+    args = ", ".join("x" for _ in range(40))
+    source = f"""
+    program p;
+    var x: int;
+    main {{
+      x = {terms};
+      print({args});
+    }} end
+    """
+    func_dir, quads = translate(source)
+    VirtualMachine(quads, constants=func_dir.constants).run()
+    assert capsys.readouterr().out.split() == ["300"] * 40
@@ -0,0 +1,110 @@
+import os
+
+from entrega3.compiled_program import CompiledProgram
+from entrega3.program_cache import ProgramCache
+from entrega5.vm import VirtualMachine
+
+
+SOURCE = """
+program p;
+var x: int;
+var f: float;
+int doble(a: int) {
+  {
+    return a * 2;
+  }
+};
+main {
+  x = doble(21);
+  f = 0.5;
+  print(x, f, "ok", x > 1);
+} end
+"""
+
+
+def _run(program: CompiledProgram, capsys) -> str:
+    VirtualMachine(program.quads, constants=program.constants, frames=program.frames).run()
+    return capsys.readouterr().out
+
+
+def test_hit_regresa_el_mismo_programa(tmp_path, capsys):
+    cache = ProgramCache(tmp_path)
+    first = cache.translate(SOURCE)
+    second = cache.translate(SOURCE)
+
+    assert (cache.stats.misses, cache.stats.hits, cache.stats.stores) == (1, 1, 1)
+    assert second.quads == first.quads
+    assert second.constants == first.constants
+    assert second.frames == first.frames
+    assert second.functions["doble"].start_quad == first.functions["doble"].start_quad
+    assert _run(second, capsys) == _run(first, capsys) == "42\n0.5\n\"ok\"\nTrue\n"
+
+
+def test_opciones_distintas_son_entradas_distintas(tmp_path):
+    cache = ProgramCache(tmp_path)
+    cache.translate(SOURCE)
+    cache.translate(SOURCE, optimize=True)
+    assert cache.stats.misses == 2
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_desalojo_lru(tmp_path):
+    cache = ProgramCache(tmp_path)
+    sources = [SOURCE.replace("21", str(n)) for n in range(3)]
+    for s in sources:
+        cache.translate(s)
+    entry_size = cache.size_bytes() // 3
+
+    # La primera entrada es la más reciente; al achicar la caché sobrevive
+    os.utime(cache._path(cache.key(sources[0])), ns=(10**19, 10**19))
+    cache.max_bytes = entry_size + entry_size // 2
+    cache.translate(SOURCE.replace("21", "99"))
+
+    assert cache.stats.evictions == 3
+    assert cache.get(sources[0]) is not None
+    assert cache.get(sources[1]) is None
+
+
+def test_entrada_corrupta_cuenta_como_miss(tmp_path):
+    cache = ProgramCache(tmp_path)
+    cache.translate(SOURCE)
+    cache._path(cache.key(SOURCE)).write_text("{no es json")
+    assert cache.get(SOURCE) is None
+    assert cache.translate(SOURCE).quads
+    assert cache.stats.stores == 2
+
+
+def test_json_que_no_es_objeto_cuenta_como_miss(tmp_path):
+    cache = ProgramCache(tmp_path)
+    cache.translate(SOURCE)
+    path = cache._path(cache.key(SOURCE))
+    path.write_text("[]")
+    assert cache.get(SOURCE) is None
+    assert not path.exists()
+
+
+def test_desalojo_entre_lectura_y_utime_sigue_siendo_hit(tmp_path, monkeypatch):
+    cache = ProgramCache(tmp_path)
+    cache.translate(SOURCE)
+
+    def evicted(path, *args, **kwargs):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "utime", evicted)
+    assert cache.get(SOURCE) is not None
+    assert cache.stats.hits == 1
+
+
+def test_reuse_parser_no_cambia_la_llave(tmp_path):
+    cache = ProgramCache(tmp_path)
+    assert cache.key(SOURCE, reuse_parser=True) == cache.key(SOURCE)
+    cache.translate(SOURCE)
+    cache.translate(SOURCE, reuse_parser=True)
+    assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+
+
+def test_huella_incluye_el_front_end_de_antlr():
+    from entrega3.compiled_program import _COMPILER_MODULES
+
+    for rel in ("entrega1/antlr_frontend.py", "entrega1/generated/PatitoParser.py", "entrega1/generated/PatitoLexer.py"):
+        assert rel in _COMPILER_MODULES
@@ -0,0 +1,65 @@
+import ast
+from pathlib import Path
+
+import pytest
+from antlr4 import CommonTokenStream, InputStream
+
+from entrega1.generated.PatitoLexer import PatitoLexer
+from entrega1.generated.PatitoParser import PatitoParser
+from entrega1.rd_parser import PatitoSyntaxError, parse
+from entrega3.codegen_visitor import translate
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _test_programs():
+    """Todos los programas Patito escritos como string en las pruebas del repo."""
+    programs = []
+    for path in sorted(ROOT.glob("entrega*/tests/test_*.py")):
+        for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+            if (
+                isinstance(node, ast.Constant)
+                and isinstance(node.value, str)
+                and node.value.strip().startswith("program")
+            ):
+                programs.append(pytest.param(node.value, id=f"{path.parent.parent.name}/{path.stem}:{node.lineno}"))
+    return programs
+
+
+def _antlr_syntax_errors(source: str) -> int:
+    parser = PatitoParser(CommonTokenStream(PatitoLexer(InputStream(source))))
+    parser.removeErrorListeners()
+    parser.start()
+    return parser.getNumberOfSyntaxErrors()
+
+
+@pytest.mark.parametrize("source", _test_programs())
+def test_rd_genera_los_mismos_cuadruplos_que_antlr(source):
+    if _antlr_syntax_errors(source):
+        with pytest.raises(PatitoSyntaxError):
+            parse(source)
+        return
+
+    try:
+        expected_dir, expected = translate(source)
+    except Exception as exc:  # errores semánticos: ambos front ends deben fallar igual
+        with pytest.raises(type(exc)):
+            translate(source, frontend="rd")
+        return
+
+    got_dir, got = translate(source, frontend="rd")
+    assert got == expected
+    assert got_dir.constants == expected_dir.constants
+
+
+def test_rd_lista_larga_de_estatutos(capsys):
+    # El parser de ANTLR recursa una vez por estatuto; el escrito a mano no
+    stmts = "\n".join("  x = x + 1;" for _ in range(5000))
+    source = f"program p; var x: int; main {{ x = 0;\n{stmts}\n print(x); }} end"
+    _, quads = translate(source, frontend="rd")
+    assert len(quads) == 2 * 5000 + 4
+
+
+def test_frontend_desconocido():
+    with pytest.raises(ValueError):
+        translate("program p; main { } end", frontend="yacc")
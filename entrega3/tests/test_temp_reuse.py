@@ -0,0 +1,35 @@
+from entrega3.codegen_visitor import translate
+from entrega4.virtual_memory import VirtualMemory
+from entrega5.vm import VirtualMachine
+
+
+def test_temporales_se_reusan_entre_estatutos(capsys):
+    # 150 estatutos x 4 temporales int: sin reuso se pasarían de los 500 del segmento
+    stmts = "\n".join("      x = x * 2 + x * 3 + 1;" for _ in range(150))
+    source = f"""
+    program p;
+    var x: int;
+    main {{
+      x = 0;
+{stmts}
+      print(x > 0);
+    }} end
+    """
+    func_dir, quads = translate(source)
+
+    temps = {q[3] for q in quads if isinstance(q[3], int) and 8000 <= q[3] <= 9999}
+    assert len(temps) <= 3
+
+    VirtualMachine(quads, constants=func_dir.constants).run()
+    assert capsys.readouterr().out.strip() == "True"
+
+
+def test_free_temp_reusa_la_direccion_mas_baja():
+    vm = VirtualMemory()
+    a = vm.alloc_temp("int")
+    b = vm.alloc_temp("int")
+    vm.free_temp(b)
+    vm.free_temp(a)
+    assert vm.alloc_temp("int") == a
+    assert vm.alloc_temp("int") == b
+    assert vm.alloc_temp("int") == b + 1
@@ -1,8 +1,9 @@
 # entrega3/virtual_memory.py
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, Tuple, Any, Literal
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Any, Literal
 
 TypeName = Literal["int", "float", "bool", "string", "void"]
 SegmentName = Literal["global", "local", "temp", "const"]
@@ -13,8 +14,12 @@ class MemorySegment:
     base: int
     limit: int
     next: int
+    # Direcciones liberadas (min-heap): se reusan primero las más bajas
+    free: List[int] = field(default_factory=list)
 
     def alloc(self, size: int = 1) -> int:
+        if size == 1 and self.free:
+            return heapq.heappop(self.free)
         if self.next + size - 1 > self.limit:
             raise MemoryError(
                 f"Overflow de segmento [{self.base}, {self.limit}] al pedir {size} direcciones"
@@ -23,39 +28,65 @@ class MemorySegment:
         self.next += size
         return addr
 
+    def release(self, addr: int) -> None:
+        if not (self.base <= addr < self.next):
+            raise ValueError(f"La dirección {addr} no fue asignada por este segmento")
+        if addr in self.free:
+            raise ValueError(f"La dirección {addr} ya estaba liberada")
+        heapq.heappush(self.free, addr)
+
+    @property
+    def capacity(self) -> int:
+        return self.limit - self.base + 1
+
+
+# Límites de cada segmento: segmento -> tipo -> (base, límite)
+SEGMENT_BOUNDS: Dict[SegmentName, Dict[TypeName, Tuple[int, int]]] = {
+    "global": {
+        "int":    (1000, 1499),
+        "float":  (1500, 1999),
+        "bool":   (2000, 2499),
+        "string": (2500, 2999),
+    },
+    "local": {
+        "int":    (3000, 3499),
+        "float":  (3500, 3999),
+        "bool":   (4000, 4499),
+        "string": (4500, 4999),
+    },
+    "temp": {
+        "int":    (8000, 8499),
+        "float":  (8500, 8999),
+        "bool":   (9000, 9499),
+        "string": (9500, 9999),
+    },
+    "const": {
+        "int":    (13000, 13499),
+        "float":  (13500, 13999),
+        "bool":   (14000, 14499),
+        "string": (14500, 14999),
+    },
+}
+
+
+def locate(addr: int) -> Tuple[SegmentName, TypeName, int]:
+    """Regresa (segmento, tipo, offset desde la base del tipo) de una dirección virtual."""
+    for seg, types in SEGMENT_BOUNDS.items():
+        for type_, (base, limit) in types.items():
+            if base <= addr <= limit:
+                return seg, type_, addr - base
+    raise ValueError(f"Dirección fuera de todos los segmentos: {addr}")
+
 
 class VirtualMemory:
     def __init__(self) -> None:
-        self._segments: Dict[SegmentName, Dict[TypeName, MemorySegment]] = {
-            "global": {
-                "int":    MemorySegment(1000, 1499, 1000),
-                "float":  MemorySegment(1500, 1999, 1500),
-                "bool":   MemorySegment(2000, 2499, 2000),
-                "string": MemorySegment(2500, 2999, 2500),
-                "void":   MemorySegment(0, 0, 0),
-            },
-            "local": {
-                "int":    MemorySegment(3000, 3499, 3000),
-                "float":  MemorySegment(3500, 3999, 3500),
-                "bool":   MemorySegment(4000, 4499, 4000),
-                "string": MemorySegment(4500, 4999, 4500),
-                "void":   MemorySegment(0, 0, 0),
-            },
-            "temp": {
-                "int":    MemorySegment(8000, 8499, 8000),
-                "float":  MemorySegment(8500, 8999, 8500),
-                "bool":   MemorySegment(9000, 9499, 9000),
-                "string": MemorySegment(9500, 9999, 9500),
-                "void":   MemorySegment(0, 0, 0),
-            },
-            "const": {
-                "int":    MemorySegment(13000, 13499, 13000),
-                "float":  MemorySegment(13500, 13999, 13500),
-                "bool":   MemorySegment(14000, 14499, 14000),
-                "string": MemorySegment(14500, 14999, 14500),
-                "void":   MemorySegment(0, 0, 0),
-            },
-        }
+        self._segments: Dict[SegmentName, Dict[TypeName, MemorySegment]] = {}
+        for seg, types in SEGMENT_BOUNDS.items():
+            self._segments[seg] = {
+                type_: MemorySegment(base, limit, base)
+                for type_, (base, limit) in types.items()
+            }
+            self._segments[seg]["void"] = MemorySegment(0, 0, 0)
 
     # ------------ helper functions ------------ #
 
@@ -70,6 +101,29 @@ class VirtualMemory:
             raise ValueError("No se pueden crear temporales de tipo void")
         return self._segments["temp"][type_].alloc()
 
+    # Al entrar/salir de una función: locales y temporales vuelven a contar
+    # desde la base, así cada función tiene su propio rango denso
+    def reset_frame_counters(self) -> None:
+        for seg in ("local", "temp"):
+            for segment in self._segments[seg].values():
+                segment.next = segment.base
+                segment.free.clear()
+
+    # Direcciones usadas por tipo en un segmento (high-water mark desde el último reset)
+    def high_water(self, seg: SegmentName) -> Dict[TypeName, int]:
+        return {
+            type_: segment.next - segment.base
+            for type_, segment in self._segments[seg].items()
+            if type_ != "void" and segment.next > segment.base
+        }
+
+    # Regresa un temporal que ya se consumió para que alloc_temp lo reuse
+    def free_temp(self, addr: int) -> None:
+        seg, type_, _ = locate(addr)
+        if seg != "temp":
+            raise ValueError(f"La dirección {addr} no es un temporal")
+        self._segments["temp"][type_].release(addr)
+
     def alloc_const(self, type_: TypeName) -> int:
         if type_ == "void":
             raise ValueError("No se pueden crear constantes de tipo void")
@@ -80,14 +134,23 @@ class ConstantTable:
     def __init__(self, vm: VirtualMemory) -> None:
         self._vm = vm
         self._table: Dict[Tuple[TypeName, Any], int] = {}
+        self._values: Dict[int, Any] = {}
 
     def get_or_add(self, type_: TypeName, value: Any) -> int:
         key = (type_, value)
         if key not in self._table:
             addr = self._vm.alloc_const(type_)
             self._table[key] = addr
+            self._values[addr] = value
         return self._table[key]
 
+    # Valor de una constante ya registrada (KeyError si la dirección no es constante)
+    def value_of(self, addr: int) -> Any:
+        return self._values[addr]
+
+    def __contains__(self, addr: object) -> bool:
+        return addr in self._values
+
     @property
     def items(self):
         return self._table.items()
\ No newline at end of file
@@ -0,0 +1,139 @@
+# entrega5/batch_runner.py
+#
+# Compila y ejecuta muchos programas Patito en paralelo.
+#
+#   results = run_batch([Job(src1), Job(src2, inputs={"x": 3}), ...])
+#
+# Cada trabajo pasa por translate() + VirtualMachine en un proceso de un
+# ProcessPoolExecutor. Al arrancar, cada proceso "calienta" su front end de
+# ANTLR compartido (los DFA de predicción se llenan una vez por proceso) y
+# después lo reusa para todos sus trabajos (reuse_parser=True).
+#
+# La salida de PRINT de cada trabajo se captura por separado (CaptureSink) y
+# un error en un trabajo no afecta a los demás: queda en su JobResult. Con
+# ANTLR los errores de sintaxis se juntan por trabajo (no van al stderr del
+# proceso) y el trabajo termina con SyntaxError antes de generar código. Los
+# resultados regresan en el mismo orden que los trabajos.
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from entrega1.antlr_frontend import shared_frontend
+from entrega3.codegen_visitor import translate, translate_tree
+from entrega5.output import CaptureSink
+from entrega5.vm import VirtualMachine
+
+# Programa mínimo para calentar el parser de cada proceso
+_WARMUP_SOURCE = """
+program warmup;
+var x: int;
+void f(a: int) { { print(a); } };
+main { x = 1; while (x < 2) do { x = x + 1; }; if (x > 1) { f(x); } else { print("no"); }; } end
+"""
+
+
+@dataclass
+class Job:
+    """Un programa y los valores iniciales de sus globales ({nombre: valor})."""
+    source: str
+    inputs: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class JobResult:
+    index: int
+    output: str = ""
+    error: Optional[str] = None  # "TipoDeError: mensaje"
+    compile_seconds: float = 0.0
+    run_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _warm_up(frontend: str) -> None:
+    if frontend == "antlr":
+        shared_frontend().parse(_WARMUP_SOURCE)
+
+
+def _compile(job: Job, frontend: str, engine: str, optimize: bool, sink: CaptureSink) -> VirtualMachine:
+    if frontend == "antlr":
+        errors: List[str] = []
+        tree = shared_frontend().parse(job.source, errors=errors)
+        if errors:
+            # Con recuperación de errores el árbol está incompleto: no se genera código
+            raise SyntaxError("; ".join(errors))
+        func_dir, quads = translate_tree(tree, optimize)
+    else:
+        func_dir, quads = translate(job.source, optimize=optimize, frontend=frontend)
+
+    vm = VirtualMachine(
+        quads, constants=func_dir.constants, frames=func_dir.frame_layouts(),
+        engine=engine, output=sink,
+    )
+    globals_ = func_dir.all_globals()
+    for name, value in job.inputs.items():
+        if name not in globals_:
+            raise KeyError(f"Input para una global que no existe: {name}")
+        vm.global_mem.set(globals_[name].address, value)
+    return vm
+
+
+def _describe(error: Exception) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+def run_job(index: int, job: Job, frontend: str = "antlr", engine: str = "table", optimize: bool = False) -> JobResult:
+    """Compila y ejecuta un trabajo en el proceso actual."""
+    result = JobResult(index)
+    sink = CaptureSink()
+
+    start = time.perf_counter()
+    try:
+        vm = _compile(job, frontend, engine, optimize, sink)
+    except Exception as e:
+        result.error = _describe(e)
+        return result
+    finally:
+        result.compile_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        vm.run()
+    except Exception as e:
+        # Lo que alcanzó a imprimir antes del error se conserva
+        result.error = _describe(e)
+    finally:
+        result.run_seconds = time.perf_counter() - start
+    result.output = sink.text
+    return result
+
+
+def _run_indexed(args: tuple) -> JobResult:
+    return run_job(*args)
+
+
+def run_batch(
+    jobs: Sequence[Job],
+    max_workers: Optional[int] = None,
+    frontend: str = "antlr",
+    engine: str = "table",
+    optimize: bool = False,
+    chunksize: int = 1,
+) -> List[JobResult]:
+    """
+    Ejecuta ``jobs`` en un pool de procesos y regresa sus resultados en
+    orden. ``max_workers=0`` los corre en serie en el proceso actual.
+    """
+    tasks = [(i, job, frontend, engine, optimize) for i, job in enumerate(jobs)]
+    if max_workers == 0:
+        _warm_up(frontend)
+        return [_run_indexed(task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_warm_up, initargs=(frontend,)) as pool:
+        return list(pool.map(_run_indexed, tasks, chunksize=chunksize))
@@ -0,0 +1,150 @@
+# entrega5/closure_backend.py
+#
+# Backend de "closures" para la VirtualMachine (engine="closure").
+#
+# Cada cuádruplo ya ligado (ver VirtualMachine._link) se convierte en una
+# función de Python sin argumentos que ejecuta la instrucción y regresa el
+# índice del siguiente cuádruplo. Los operandos quedan capturados en la
+# closure: las constantes como valor, el resto como (banco, offset), y la
+# operación aritmética/relacional ya elegida (operator.add, operator.lt, ...).
+#
+# El ciclo de ejecución queda reducido a:
+#
+#     while ip >= 0:
+#         ip = code[ip]()
+
+from __future__ import annotations
+
+import operator
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, List
+
+from entrega5.vm import SEG_CONST, TYPES, _HALT, _UNSET
+
+if TYPE_CHECKING:
+    from entrega5.vm import LinkedInstr, VirtualMachine
+
+# Paso compilado: ejecuta un cuádruplo y regresa el siguiente ip
+Step = Callable[[], int]
+
+BINARY_OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# Bancos de constantes: sus valores se pueden capturar al compilar
+_CONST_BANKS = range(SEG_CONST * len(TYPES), (SEG_CONST + 1) * len(TYPES))
+
+
+def compile_closures(vm: VirtualMachine) -> List[Step]:
+    """
+    Compila ``vm.program`` (ya ligado) a una lista de closures, una por
+    cuádruplo, más un paso final que detiene la ejecución si el programa
+    se sale del final sin END.
+    """
+    code: List[Step] = []
+    for ip, (quad, ins) in enumerate(zip(vm.quads, vm.program)):
+        code.append(_compile_one(vm, ip, quad[0], ins))
+    code.append(lambda: _HALT)
+    return code
+
+
+def _const_value(vm: VirtualMachine, bank: Any, offset: Any) -> Any:
+    """Valor de una constante ya cargada, o _UNSET si el operando no es constante."""
+    if bank in _CONST_BANKS:
+        slots = vm._banks[bank]
+        if offset < len(slots):
+            return slots[offset]
+    return _UNSET
+
+
+def _compile_one(vm: VirtualMachine, ip: int, op: str, ins: LinkedInstr) -> Step:
+    banks = vm._banks
+    nxt = ip + 1
+    fail = partial(vm._uninitialized, ip)
+    _, lb, lo, rb, ro, db, do = ins
+
+    if op in BINARY_OPS and rb is not None:
+        fn = BINARY_OPS[op]
+        ka = _const_value(vm, lb, lo)
+        kb = _const_value(vm, rb, ro)
+
+        if ka is _UNSET and kb is _UNSET:
+            def step() -> int:
+                a = banks[lb][lo]
+                b = banks[rb][ro]
+                if a is _UNSET or b is _UNSET:
+                    fail()
+                banks[db][do] = fn(a, b)
+                return nxt
+        elif kb is not _UNSET and ka is _UNSET:
+            def step() -> int:
+                a = banks[lb][lo]
+                if a is _UNSET:
+                    fail()
+                banks[db][do] = fn(a, kb)
+                return nxt
+        elif ka is not _UNSET and kb is _UNSET:
+            def step() -> int:
+                b = banks[rb][ro]
+                if b is _UNSET:
+                    fail()
+                banks[db][do] = fn(ka, b)
+                return nxt
+        else:
+            def step() -> int:
+                banks[db][do] = fn(ka, kb)
+                return nxt
+        return step
+
+    if op == "-":
+        # Menos unario
+        def step() -> int:
+            a = banks[lb][lo]
+            if a is _UNSET:
+                fail()
+            banks[db][do] = -a
+            return nxt
+        return step
+
+    if op == "=":
+        ka = _const_value(vm, lb, lo)
+        if ka is not _UNSET:
+            def step() -> int:
+                banks[db][do] = ka
+                return nxt
+        else:
+            def step() -> int:
+                a = banks[lb][lo]
+                if a is _UNSET:
+                    fail()
+                banks[db][do] = a
+                return nxt
+        return step
+
+    if op == "GOTO" and ins[0] == vm._op_goto:
+        target = do
+        return lambda: target
+
+    if op == "GOTOF":
+        target = do
+
+        def step() -> int:
+            a = banks[lb][lo]
+            if a is _UNSET:
+                fail()
+            return nxt if a else target
+        return step
+
+    # PRINT, ERA, PARAM, GOSUB, RETURN, ENDFUNC, END, GOTO con límites y
+    # opcodes desconocidos: se reusa el handler del motor "table" con la
+    # instrucción ya ligada.
+    return partial(ins[0], ip, ins)
@@ -0,0 +1,107 @@
+# entrega5/hooks.py
+#
+# Hooks de ejecución de la VirtualMachine (VirtualMachine(hooks=[...])).
+#
+# Un hook es una subclase de VMHook que sobreescribe solo los eventos que le
+# interesan. Al arrancar run(), la VM revisa qué métodos sobreescribió cada
+# hook y:
+#   - sin hooks: usa el ciclo normal, que no revisa nada por instrucción
+#   - con hooks: usa un ciclo aparte que solo arma los eventos que alguien
+#     escucha
+#
+# Los eventos son dataclasses inmutables; no se formatea nada como texto.
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+
+from entrega3.codegen_visitor import Quad
+
+
+@dataclass(frozen=True)
+class InstructionEvent:
+    """Antes de ejecutar el cuádruplo ``ip``."""
+    ip: int
+    quad: Quad
+
+
+@dataclass(frozen=True)
+class CallEvent:
+    """GOSUB: ``function`` empieza en ``target``; ``depth`` ya la incluye."""
+    ip: int
+    function: Optional[str]
+    target: int
+    depth: int
+
+
+@dataclass(frozen=True)
+class ReturnEvent:
+    """RETURN / ENDFUNC de ``function``; ``return_ip`` es None si termina el programa."""
+    ip: int
+    function: Optional[str]
+    return_ip: Optional[int]
+    depth: int
+
+
+@dataclass(frozen=True)
+class WriteEvent:
+    """
+    Escritura a memoria: aritmética, relacionales, ``=`` y PARAM (en PARAM
+    la dirección es del frame de la función que se va a llamar).
+    """
+    ip: int
+    address: int
+    value: Any
+
+
+class VMHook:
+    """Base de los hooks: cada evento es un no-op hasta que se sobreescribe."""
+
+    def before_instruction(self, event: InstructionEvent) -> None:
+        pass
+
+    def on_call(self, event: CallEvent) -> None:
+        pass
+
+    def on_return(self, event: ReturnEvent) -> None:
+        pass
+
+    def on_write(self, event: WriteEvent) -> None:
+        pass
+
+
+EVENTS = ("before_instruction", "on_call", "on_return", "on_write")
+
+
+def listeners(hooks: Sequence[VMHook], event: str) -> List[Any]:
+    """Métodos ``event`` de los hooks que sí lo sobreescriben."""
+    base = getattr(VMHook, event)
+    return [getattr(h, event) for h in hooks if getattr(type(h), event) is not base]
+
+
+class TraceHook(VMHook):
+    """La traza de ``debug=True``: una línea por cuádruplo ejecutado."""
+
+    def before_instruction(self, event: InstructionEvent) -> None:
+        op, left, right, res = event.quad
+        print(f"[IP={event.ip:03}] {op}, {left}, {right}, {res}")
+
+
+class RecordingHook(VMHook):
+    """Guarda todos los eventos en ``events`` (útil en tests)."""
+
+    def __init__(self) -> None:
+        self.events: List[Any] = []
+
+    def before_instruction(self, event: InstructionEvent) -> None:
+        self.events.append(event)
+
+    def on_call(self, event: CallEvent) -> None:
+        self.events.append(event)
+
+    def on_return(self, event: ReturnEvent) -> None:
+        self.events.append(event)
+
+    def on_write(self, event: WriteEvent) -> None:
+        self.events.append(event)
@@ -0,0 +1,45 @@
+# entrega5/limits.py
+#
+# Límites de ejecución de la VirtualMachine (VirtualMachine(limits=...)).
+#
+# Para no pagar nada por instrucción, los límites solo se revisan en los
+# puntos por donde tiene que pasar cualquier ejecución larga: GOTO hacia
+# atrás (cada vuelta de un while), GOSUB (cada llamada, incluida la
+# recursión), RETURN / ENDFUNC y END. Entre dos revisiones el código solo
+# avanza, así que en cada una se cargan los cuádruplos del tramo recorrido
+# (ip actual - inicio del tramo + 1). Es una cota superior: los saltos
+# hacia adelante (if sin tomar) se cuentan como ejecutados.
+#
+# En cada revisión solo se suma el tramo y se compara contra un umbral; el
+# reloj se consulta cuando la cuenta avanza CLOCK_EVERY instrucciones.
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+CLOCK_EVERY = 10_000
+
+
+@dataclass(frozen=True)
+class ExecutionLimits:
+    max_instructions: Optional[int] = None
+    max_call_depth: Optional[int] = None
+    max_seconds: Optional[float] = None
+
+
+class ExecutionLimitExceeded(RuntimeError):
+    """
+    - ``limit``: "instructions", "call_depth" o "seconds"
+    - ``maximum``: el valor configurado que se rebasó
+    - ``ip``: cuádruplo donde se detectó
+    - ``call_stack``: funciones activas, de afuera hacia adentro
+    """
+
+    def __init__(self, limit: str, maximum: float, ip: int, call_stack: List[Optional[str]]) -> None:
+        self.limit = limit
+        self.maximum = maximum
+        self.ip = ip
+        self.call_stack = call_stack
+        stack = " > ".join(["main"] + [str(name) for name in call_stack])
+        super().__init__(f"Límite de ejecución excedido: {limit} > {maximum} en IP={ip} (pila: {stack})")
@@ -0,0 +1,73 @@
+# entrega5/output.py
+#
+# Canales de salida para el PRINT de la VirtualMachine.
+#
+# La VM junta los argumentos de un print(a, b, c) (un valor por línea, igual
+# que antes) y manda el texto completo como un solo registro con
+# ``sink.write(text)``. Al terminar run() llama ``sink.flush()``.
+#
+#   - BufferedSink: acumula registros y escribe al stream cuando pasan de
+#     ``flush_size`` caracteres (0 = escribir cada registro de inmediato)
+#   - CaptureSink:  guarda los registros en memoria (para tests)
+
+from __future__ import annotations
+
+import sys
+from typing import List, Optional, Protocol, TextIO
+
+# Caracteres acumulados antes de escribir al stream
+DEFAULT_FLUSH_SIZE = 64 * 1024
+
+
+class OutputSink(Protocol):
+    def write(self, text: str) -> None: ...
+
+    def flush(self) -> None: ...
+
+
+class BufferedSink:
+    """
+    Escribe a ``stream`` en bloques. Si no se da ``stream`` se usa el
+    ``sys.stdout`` vigente al momento de escribir (así funciona con
+    redirecciones como capsys).
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, flush_size: int = DEFAULT_FLUSH_SIZE) -> None:
+        self.stream = stream
+        self.flush_size = flush_size
+        self._parts: List[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        stream = self.stream if self.stream is not None else sys.stdout
+        if self._parts:
+            stream.write("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+        stream.flush()
+
+
+class CaptureSink:
+    """Guarda cada registro (el texto de un print(...)) en ``records``."""
+
+    def __init__(self) -> None:
+        self.records: List[str] = []
+
+    def write(self, text: str) -> None:
+        self.records.append(text)
+
+    def flush(self) -> None:
+        pass
+
+    @property
+    def text(self) -> str:
+        return "".join(self.records)
+
+    def lines(self) -> List[str]:
+        return self.text.splitlines()
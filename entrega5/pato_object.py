@@ -0,0 +1,396 @@
+# entrega5/pato_object.py
+#
+# Formato binario ".pato" para programas compilados (CompiledProgram).
+#
+# Todo en little-endian. Las secciones van en este orden:
+#
+#   HEADER   magic "PATO", versión, n_quads y el offset de cada sección
+#   QUADS    n_quads registros de 4 x int32: (opcode, left, right, result)
+#            - opcode: índice en OPCODES
+#            - operandos: dirección virtual o índice de cuádruplo; NONE = -1
+#            - en ERA / GOSUB, `left` es el índice de la función en FUNCS
+#   CONSTS   u32 n, luego por constante: i32 dirección, u8 tipo, valor
+#            (int: i64, float: f64, bool: u8, string: u32 largo + utf-8)
+#   FUNCS    u32 n, luego por función: nombre, i32 start_quad, u8 tipo de
+#            retorno, i32 return_address, u16 n_params + i32 por parámetro
+#   FRAMES   u32 n, luego por frame: nombre + 5 x 4 x i32 (params, locals,
+#            temps, local_slots, temp_slots; por tipo en el orden de TYPES)
+#
+# La sección QUADS empieza alineada a 4 bytes justo después del header, así
+# que un lector puede verla como un arreglo plano de int32 sin copiarla.
+
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+from entrega2.symbols import FrameLayout
+from entrega3.compiled_program import CompiledProgram, FunctionMeta
+from entrega3.codegen_visitor import Quad
+from entrega5.vm import TYPES
+
+MAGIC = b"PATO"
+VERSION = 1
+
+# Opcodes en el orden de su código entero (no reordenar: es parte del formato)
+OPCODES = (
+    "+", "-", "*", "/",
+    ">", "<", ">=", "<=", "==", "!=",
+    "=", "PRINT",
+    "GOTO", "GOTOF",
+    "ERA", "PARAM", "GOSUB", "RETURN", "ENDFUNC",
+    "END",
+)
+OPCODE_OF = {op: code for code, op in enumerate(OPCODES)}
+
+# Operandos cuyo valor es el nombre de una función (se guarda su índice)
+_FUNC_OPERAND_OPS = {"ERA", "GOSUB"}
+
+NONE = -1
+
+HEADER = struct.Struct("<4sHHIIIIII")
+QUAD = struct.Struct("<iiii")
+
+# Tipos de constante / retorno
+_VALUE_TYPES = ("int", "float", "bool", "string", "void")
+_VALUE_TYPE_OF = {t: i for i, t in enumerate(_VALUE_TYPES)}
+
+_FRAME_FIELDS = ("params", "locals", "temps", "local_slots", "temp_slots")
+
+
+class PatoFormatError(ValueError):
+    """Archivo .pato inválido o programa que no se puede codificar."""
+
+
+# ----------------- Escritura ----------------- #
+
+def _field(value: object) -> int:
+    if value is None:
+        return NONE
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise PatoFormatError(f"Operando no codificable: {value!r}")
+    return value
+
+
+def _name(text: str) -> bytes:
+    data = text.encode("utf-8")
+    return struct.pack("<H", len(data)) + data
+
+
+def _const_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "string"
+    raise PatoFormatError(f"Constante no codificable: {value!r}")
+
+
+def dumps(program: CompiledProgram) -> bytes:
+    """Codifica `program` en el formato .pato."""
+    func_names = list(program.functions)
+    func_index = {name: i for i, name in enumerate(func_names)}
+
+    quads = bytearray()
+    for quad in program.quads:
+        op, left, right, res = quad
+        code = OPCODE_OF.get(op)  # type: ignore[arg-type]
+        if code is None:
+            raise PatoFormatError(f"Opcode sin código binario: {op!r}")
+        if op in _FUNC_OPERAND_OPS:
+            if left not in func_index:
+                raise PatoFormatError(f"Función no declarada en {quad!r}")
+            left = func_index[left]
+        quads += QUAD.pack(code, _field(left), _field(right), _field(res))
+
+    consts = bytearray(struct.pack("<I", len(program.constants)))
+    for addr, value in program.constants.items():
+        type_ = _const_type(value)
+        consts += struct.pack("<iB", addr, _VALUE_TYPE_OF[type_])
+        if type_ == "int":
+            try:
+                consts += struct.pack("<q", value)
+            except struct.error as e:
+                raise PatoFormatError(f"Entero fuera de 64 bits: {value}") from e
+        elif type_ == "float":
+            consts += struct.pack("<d", value)
+        elif type_ == "bool":
+            consts += struct.pack("<B", value)
+        else:
+            data = value.encode("utf-8")
+            consts += struct.pack("<I", len(data)) + data
+
+    funcs = bytearray(struct.pack("<I", len(func_names)))
+    for name in func_names:
+        meta = program.functions[name]
+        funcs += _name(name)
+        funcs += struct.pack(
+            "<iBiH",
+            meta.start_quad,
+            _VALUE_TYPE_OF[meta.return_type],
+            _field(meta.return_address),
+            len(meta.params),
+        )
+        funcs += struct.pack(f"<{len(meta.params)}i", *meta.params)
+
+    frames = bytearray(struct.pack("<I", len(program.frames)))
+    for name, layout in program.frames.items():
+        frames += _name(name)
+        for field_name in _FRAME_FIELDS:
+            per_type = getattr(layout, field_name)
+            frames += struct.pack("<4i", *(per_type.get(t, 0) for t in TYPES))
+
+    quads_offset = HEADER.size
+    consts_offset = quads_offset + len(quads)
+    funcs_offset = consts_offset + len(consts)
+    frames_offset = funcs_offset + len(funcs)
+    end = frames_offset + len(frames)
+    header = HEADER.pack(
+        MAGIC, VERSION, 0, len(program.quads),
+        quads_offset, consts_offset, funcs_offset, frames_offset, end,
+    )
+    return b"".join((header, quads, consts, funcs, frames))
+
+
+def write_object(program: CompiledProgram, path: Union[str, Path]) -> None:
+    Path(path).write_bytes(dumps(program))
+
+
+# ----------------- Lectura ----------------- #
+
+def _entry(table: Sequence[Any], index: int, what: str) -> Any:
+    """``table[index]`` o PatoFormatError si el índice del archivo no es válido."""
+    if not 0 <= index < len(table):
+        raise PatoFormatError(f"Archivo .pato corrupto: {what} fuera de rango ({index})")
+    return table[index]
+
+
+class _Reader:
+    def __init__(self, data: Union[bytes, memoryview], offset: int) -> None:
+        self.data = data
+        self.pos = offset
+
+    def take(self, fmt: str) -> Tuple[Any, ...]:
+        size = struct.calcsize(fmt)
+        if self.pos + size > len(self.data):
+            raise PatoFormatError("Archivo .pato truncado")
+        values = struct.unpack_from(fmt, self.data, self.pos)
+        self.pos += size
+        return values
+
+    def text(self, length: int) -> str:
+        if self.pos + length > len(self.data):
+            raise PatoFormatError("Archivo .pato truncado")
+        try:
+            value = bytes(self.data[self.pos:self.pos + length]).decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise PatoFormatError("Archivo .pato corrupto: texto que no es UTF-8") from e
+        self.pos += length
+        return value
+
+    def name(self) -> str:
+        (length,) = self.take("<H")
+        return self.text(length)
+
+
+def read_header(data: Union[bytes, memoryview]) -> Tuple[int, int, int, int, int, int]:
+    """Valida el header y regresa (n_quads, quads, consts, funcs, frames, fin)."""
+    if len(data) < HEADER.size:
+        raise PatoFormatError("Archivo .pato truncado")
+    magic, version, _, n_quads, q_off, c_off, f_off, fr_off, end = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise PatoFormatError("No es un archivo .pato")
+    if version != VERSION:
+        raise PatoFormatError(f"Versión de .pato no soportada: {version} (se espera {VERSION})")
+    if end > len(data) or q_off + n_quads * QUAD.size != c_off:
+        raise PatoFormatError("Archivo .pato truncado o con secciones inválidas")
+    return n_quads, q_off, c_off, f_off, fr_off, end
+
+
+def read_tables(
+    data: Union[bytes, memoryview],
+) -> Tuple[Dict[int, Any], Dict[str, FunctionMeta], Dict[str, FrameLayout]]:
+    """Constantes, funciones y frames (todo menos los cuádruplos)."""
+    _, _, c_off, f_off, fr_off, _ = read_header(data)
+
+    r = _Reader(data, c_off)
+    constants: Dict[int, Any] = {}
+    (n,) = r.take("<I")
+    for _ in range(n):
+        addr, type_code = r.take("<iB")
+        type_ = _entry(_VALUE_TYPES, type_code, "tipo de constante")
+        if type_ == "int":
+            (value,) = r.take("<q")
+        elif type_ == "float":
+            (value,) = r.take("<d")
+        elif type_ == "bool":
+            value = bool(r.take("<B")[0])
+        else:
+            (length,) = r.take("<I")
+            value = r.text(length)
+        constants[addr] = value
+
+    r = _Reader(data, f_off)
+    functions: Dict[str, FunctionMeta] = {}
+    (n,) = r.take("<I")
+    for _ in range(n):
+        name = r.name()
+        start_quad, ret_code, ret_addr, n_params = r.take("<iBiH")
+        params = list(r.take(f"<{n_params}i"))
+        functions[name] = FunctionMeta(
+            start_quad=start_quad,
+            return_type=_entry(_VALUE_TYPES, ret_code, "tipo de retorno"),
+            return_address=None if ret_addr == NONE else ret_addr,
+            params=params,
+        )
+
+    r = _Reader(data, fr_off)
+    frames: Dict[str, FrameLayout] = {}
+    (n,) = r.take("<I")
+    for _ in range(n):
+        name = r.name()
+        fields = {}
+        for field_name in _FRAME_FIELDS:
+            counts = r.take("<4i")
+            fields[field_name] = {t: c for t, c in zip(TYPES, counts) if c}
+        frames[name] = FrameLayout(**fields)
+
+    return constants, functions, frames
+
+
+def decode_quad(raw: Tuple[int, int, int, int], func_names: List[str]) -> Quad:
+    """(opcode, left, right, result) enteros -> cuádruplo como lo genera translate()."""
+    code, left, right, res = raw
+    op = _entry(OPCODES, code, "opcode")
+    if op in _FUNC_OPERAND_OPS:
+        return (op, _entry(func_names, left, "índice de función"), None, None if res == NONE else res)
+    return (
+        op,
+        None if left == NONE else left,
+        None if right == NONE else right,
+        None if res == NONE else res,
+    )
+
+
+def loads(data: Union[bytes, memoryview]) -> CompiledProgram:
+    """Decodifica un .pato completo a CompiledProgram."""
+    n_quads, q_off, _, _, _, _ = read_header(data)
+    constants, functions, frames = read_tables(data)
+    func_names = list(functions)
+    quads = [decode_quad(raw, func_names) for raw in QUAD.iter_unpack(data[q_off:q_off + n_quads * QUAD.size])]
+    return CompiledProgram(quads=quads, constants=constants, frames=frames, functions=functions)
+
+
+def read_object(path: Union[str, Path]) -> CompiledProgram:
+    return loads(Path(path).read_bytes())
+
+
+# ----------------- Carga con mmap ----------------- #
+
+class QuadView(Sequence[Quad]):
+    """
+    Los cuádruplos de un .pato vistos sin copiarlos: cada acceso decodifica
+    un registro directamente del buffer. En máquinas little-endian se usa
+    una vista int32 del memoryview; en otras, struct.unpack_from.
+    """
+
+    def __init__(self, buffer: memoryview, offset: int, n_quads: int, func_names: List[str]) -> None:
+        self._buffer = buffer
+        self._offset = offset
+        self._n = n_quads
+        self._func_names = func_names
+        self._ints: Optional[memoryview] = None
+        if sys.byteorder == "little" and offset % 4 == 0:
+            self._ints = buffer[offset:offset + n_quads * QUAD.size].cast("i")
+
+    def __len__(self) -> int:
+        return self._n
+
+    def raw(self, index: int) -> Tuple[int, int, int, int]:
+        """Registro entero (opcode, left, right, result) sin decodificar."""
+        if not 0 <= index < self._n:
+            raise IndexError(index)
+        if self._ints is not None:
+            base = 4 * index
+            ints = self._ints
+            return ints[base], ints[base + 1], ints[base + 2], ints[base + 3]
+        return QUAD.unpack_from(self._buffer, self._offset + index * QUAD.size)
+
+    @overload
+    def __getitem__(self, index: int) -> Quad: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Quad]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Quad, List[Quad]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._n))]
+        if index < 0:
+            index += self._n
+        return decode_quad(self.raw(index), self._func_names)
+
+    def __iter__(self) -> Iterator[Quad]:
+        for i in range(self._n):
+            yield self[i]
+
+    def release(self) -> None:
+        if self._ints is not None:
+            self._ints.release()
+            self._ints = None
+
+
+class MappedProgram:
+    """
+    Un .pato mapeado en memoria (solo lectura, páginas compartidas entre
+    procesos). Constantes, funciones y frames se decodifican al abrir;
+    los cuádruplos se quedan en el mmap (``quads`` es un QuadView).
+
+    Se usa como context manager o se cierra con ``close()``; después de
+    cerrarlo ninguna VM creada con él puede seguir ejecutando.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        with open(path, "rb") as f:
+            size = f.seek(0, 2)
+            if size < HEADER.size:
+                raise PatoFormatError("Archivo .pato truncado")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        try:
+            n_quads, q_off, _, _, _, _ = read_header(self._buffer)
+            self.constants, self.functions, self.frames = read_tables(self._buffer)
+        except Exception:
+            self.close()
+            raise
+        self.quads = QuadView(self._buffer, q_off, n_quads, list(self.functions))
+
+    def to_program(self) -> CompiledProgram:
+        """Copia completa en memoria (lista de tuplas)."""
+        return CompiledProgram(
+            quads=list(self.quads),
+            constants=dict(self.constants),
+            frames=dict(self.frames),
+            functions=dict(self.functions),
+        )
+
+    def close(self) -> None:
+        if getattr(self, "quads", None) is not None:
+            self.quads.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self) -> MappedProgram:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def map_object(path: Union[str, Path]) -> MappedProgram:
+    return MappedProgram(path)
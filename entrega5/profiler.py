@@ -0,0 +1,93 @@
+# entrega5/profiler.py
+#
+# Perfil de ejecución de la VirtualMachine (VirtualMachine(profile=True)).
+#
+# Durante run() la VM cuenta cuántas veces se ejecutó cada cuádruplo y, cada
+# vez que cambia la profundidad de la pila de llamadas (GOSUB / RETURN /
+# ENDFUNC), carga el tiempo transcurrido a la función que estaba activa.
+# Así el tiempo de cada función es "propio": no incluye el de las funciones
+# que llama.
+#
+# Para el reporte, cada cuádruplo se asigna a la función que lo contiene:
+# el código de cada función termina en su ENDFUNC y su nombre sale de los
+# GOSUB que saltan a su inicio; lo que queda fuera es main.
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+from entrega2.symbols import MAIN_FRAME
+from entrega3.codegen_visitor import Quad
+
+
+def function_of_quads(quads: Sequence[Quad]) -> List[str]:
+    """Nombre de la función dueña de cada cuádruplo (MAIN_FRAME para main)."""
+    starts = {int(res): str(left) for op, left, _, res in quads if op == "GOSUB"}
+    owners = [MAIN_FRAME] * len(quads)
+    begin = 1  # el cuádruplo 0 es el GOTO a main
+    for ip, quad in enumerate(quads):
+        if quad[0] == "ENDFUNC":
+            name = starts.get(begin, f"<función en {begin}>")
+            owners[begin:ip + 1] = [name] * (ip + 1 - begin)
+            begin = ip + 1
+    return owners
+
+
+@dataclass
+class HotQuad:
+    ip: int
+    count: int
+    quad: Quad
+    function: str
+
+
+@dataclass
+class Profile:
+    """
+    - ``quad_counts[ip]``: ejecuciones del cuádruplo ip
+    - ``func_time_ns``: tiempo propio por función (ns)
+    - ``func_calls``: llamadas por función (main cuenta 1)
+    """
+    quads: Sequence[Quad]
+    quad_counts: List[int]
+    func_time_ns: Dict[str, int] = field(default_factory=dict)
+    func_calls: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_instructions(self) -> int:
+        return sum(self.quad_counts)
+
+    def opcode_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for quad, n in zip(self.quads, self.quad_counts):
+            if n:
+                counts[quad[0]] = counts.get(quad[0], 0) + n
+        return dict(sorted(counts.items(), key=lambda kv: -kv[1]))
+
+    def hot_quads(self, top: int = 10) -> List[HotQuad]:
+        owners = function_of_quads(self.quads)
+        ranked = sorted(
+            (ip for ip, n in enumerate(self.quad_counts) if n),
+            key=lambda ip: -self.quad_counts[ip],
+        )
+        return [
+            HotQuad(ip, self.quad_counts[ip], tuple(self.quads[ip]), owners[ip])  # type: ignore[arg-type]
+            for ip in ranked[:top]
+        ]
+
+    def report(self, top: int = 10) -> str:
+        lines = [f"Instrucciones ejecutadas: {self.total_instructions}", "", "Funciones (tiempo propio):"]
+        for name, ns in sorted(self.func_time_ns.items(), key=lambda kv: -kv[1]):
+            calls = self.func_calls.get(name, 0)
+            lines.append(f"  {name:<20} {ns / 1e6:10.3f} ms  {calls:>8} llamadas")
+
+        lines += ["", "Opcodes:"]
+        for op, n in self.opcode_counts().items():
+            lines.append(f"  {op:<8} {n:>10}")
+
+        lines += ["", f"Cuádruplos más ejecutados (top {top}):"]
+        for hot in self.hot_quads(top):
+            op, left, right, res = hot.quad
+            lines.append(f"  [{hot.ip:04}] {hot.count:>10}  {hot.function:<20} {op}, {left}, {right}, {res}")
+        return "\n".join(lines)
@@ -0,0 +1,409 @@
+# entrega5/py_backend.py
+#
+# Backend fuente-a-fuente: traduce los cuádruplos de translate() a código
+# Python (una función de Python por cada función de Patito, más una para
+# main), lo compila con compile() y lo ejecuta. Así el ciclo de ejecución es
+# el propio eval loop de CPython y no un intérprete de cuádruplos.
+#
+# Mapeo de memoria:
+#   - locales y temporales  -> variables locales de Python (l3000, t8000, ...)
+#   - globales              -> variables globales del módulo generado (g1000)
+#   - constantes            -> literales en el código
+#
+# El control de flujo se reconstruye a partir de los patrones que genera
+# CodeGenVisitor (visitCondition / visitCycle):
+#
+#   if:       GOTOF c L ; <then> ; L:
+#   if-else:  GOTOF c L1 ; <then> ; GOTO L2 ; L1: <else> ; L2:
+#   while:    L1: <cond> ; GOTOF c L2 ; <body> ; GOTO L1 ; L2:
+#
+# Si una función tiene saltos que no siguen estos patrones se genera, solo
+# para esa función, un ciclo de despacho por bloques básicos.
+#
+# Límite de recursión: cada llamada de Patito es una llamada de Python, así
+# que la profundidad máxima es la de CPython (sys.getrecursionlimit(), ~1000
+# por default), mucho menor que la de la VM. Un programa que la rebasa
+# termina con RuntimeError, como los errores de ejecución de la VM.
+
+from __future__ import annotations
+
+import math
+import sys
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from entrega2.symbols import FunctionDirectory
+from entrega3.codegen_visitor import Quad
+from entrega5.vm import (
+    CONST_MAX,
+    CONST_MIN,
+    GLOBAL_MAX,
+    GLOBAL_MIN,
+    LOCAL_MAX,
+    LOCAL_MIN,
+    TEMP_MAX,
+    TEMP_MIN,
+)
+
+_ARITH = {"+", "-", "*", "/"}
+_RELATIONAL = {">", "<", ">=", "<=", "==", "!="}
+_JUMPS = {"GOTO", "GOTOF"}
+
+_INDENT = "    "
+
+
+class _Unstructured(Exception):
+    """Los saltos de la función no encajan en if / if-else / while."""
+
+
+class PythonProgram:
+    """
+    Programa Patito ya traducido a Python.
+
+    - ``source``: código Python generado (útil para depurar)
+    - ``run()``:  ejecuta main; ``print_fn`` recibe cada valor de PRINT
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self._code = compile(source, "<patito>", "exec")
+        self.namespace: Dict[str, Any] = {}
+
+    def run(self, print_fn: Callable[[Any], None] = print) -> None:
+        self.namespace = {"_print": print_fn}
+        exec(self._code, self.namespace)
+        try:
+            self.namespace["_main"]()
+        except NameError as e:
+            # Variable de Python sin asignar == dirección no inicializada
+            raise RuntimeError(f"Acceso a dirección no inicializada: {e}") from e
+        except RecursionError:
+            # Sin encadenar: la traza de miles de frames no dice nada útil
+            raise RuntimeError(
+                "Recursión demasiado profunda para el backend de Python "
+                f"(límite de CPython: {sys.getrecursionlimit()} llamadas); "
+                "usa la VirtualMachine para este programa"
+            ) from None
+
+    def global_value(self, addr: int) -> Any:
+        """Valor final de una variable global (después de run())."""
+        name = f"g{addr}"
+        if name not in self.namespace:
+            raise RuntimeError(f"Acceso a dirección no inicializada: {addr}")
+        return self.namespace[name]
+
+
+def compile_program(func_dir: FunctionDirectory, quads: List[Quad]) -> PythonProgram:
+    """
+    Genera y compila el código Python equivalente a ``quads``.
+    Las constantes se toman de ``func_dir.constants`` (ver translate()).
+    """
+    constants: Dict[int, Any] = getattr(func_dir, "constants", {})
+    gen = _SourceGenerator(func_dir, quads, constants)
+    return PythonProgram(gen.generate())
+
+
+# ----------------- Generación de código ----------------- #
+
+
+class _SourceGenerator:
+    def __init__(
+        self,
+        func_dir: FunctionDirectory,
+        quads: List[Quad],
+        constants: Dict[int, Any],
+    ) -> None:
+        self.func_dir = func_dir
+        self.quads = quads
+        self.constants = constants
+        self.lines: List[str] = []
+
+        # Orden de parámetros de cada función: dirección del parámetro -> posición
+        self.param_index: Dict[str, Dict[int, int]] = {}
+        for name, info in func_dir.all_functions().items():
+            order: Dict[int, int] = {}
+            for i, param in enumerate(info.params):
+                order[info.vars.get(param.name).address] = i
+            self.param_index[name] = order
+
+        # Constantes que no tienen literal válido en Python (inf, nan)
+        self.const_names: Dict[int, str] = {}
+
+    def generate(self) -> str:
+        for name, info in self.func_dir.all_functions().items():
+            end = self._find(info.start_quad, "ENDFUNC")
+            params = sorted(self.param_index[name], key=self.param_index[name].get)
+            self._emit_function(f"fn_{name}", [self._operand(a) for a in params], info.start_quad, end)
+
+        main_start = int(self.quads[0][3]) if self.quads and self.quads[0][0] == "GOTO" else 0
+        self._emit_function("_main", [], main_start, self._find(main_start, "END"))
+
+        header = [f"{name} = {value!r}" for value, name in (
+            (self.constants[addr], name) for addr, name in self.const_names.items()
+        )]
+        return "\n".join(header + self.lines) + "\n"
+
+    def _find(self, start: int, op: str) -> int:
+        for i in range(start, len(self.quads)):
+            if self.quads[i][0] == op:
+                return i
+        return len(self.quads) - 1
+
+    # ----------------- Operandos ----------------- #
+
+    def _operand(self, addr: Any) -> str:
+        if CONST_MIN <= addr <= CONST_MAX:
+            value = self.constants.get(addr)
+            if value is None:
+                raise RuntimeError(f"Constante sin valor: {addr}")
+            if isinstance(value, float) and not math.isfinite(value):
+                return self.const_names.setdefault(addr, f"k{addr}")
+            return repr(value)
+        if GLOBAL_MIN <= addr <= GLOBAL_MAX:
+            return f"g{addr}"
+        if LOCAL_MIN <= addr <= LOCAL_MAX:
+            return f"l{addr}"
+        if TEMP_MIN <= addr <= TEMP_MAX:
+            return f"t{addr}"
+        raise RuntimeError(f"Dirección fuera de rango: {addr}")
+
+    def _expr(self, quad: Quad) -> str:
+        op, left, right, _ = quad
+        if op == "-" and right is None:
+            return f"-{self._operand(left)}"
+        return f"{self._operand(left)} {op} {self._operand(right)}"
+
+    # ----------------- Funciones ----------------- #
+
+    def _emit_function(self, py_name: str, params: List[str], start: int, end: int) -> None:
+        """Emite una función de Python para los cuádruplos [start, end]."""
+        globals_used = sorted({
+            addr
+            for q in self.quads[start:end + 1]
+            if q[0] not in _JUMPS and q[0] not in ("ERA", "GOSUB")
+            for addr in (q[1], q[2], q[3])
+            if isinstance(addr, int) and GLOBAL_MIN <= addr <= GLOBAL_MAX
+        })
+
+        self.lines.append(f"def {py_name}({', '.join(params)}):")
+        if globals_used:
+            self.lines.append(f"{_INDENT}global {', '.join(f'g{a}' for a in globals_used)}")
+
+        fn = _FunctionEmitter(self, start, end)
+        try:
+            body = fn.structured()
+        except _Unstructured:
+            body = _FunctionEmitter(self, start, end).dispatch_loop()
+        self.lines.extend(_INDENT + line for line in body or ["pass"])
+        self.lines.append("")
+
+
+class _FunctionEmitter:
+    """Traduce el rango de cuádruplos de una función a líneas de Python."""
+
+    def __init__(self, gen: _SourceGenerator, start: int, end: int) -> None:
+        self.gen = gen
+        self.quads = gen.quads
+        self.start = start
+        self.end = end  # índice del ENDFUNC / END
+        self.out: List[str] = []
+        self.call_args: List[List[Tuple[int, str]]] = []
+        self.arg_counter = 0
+
+        # Ciclos: inicio -> índice del GOTO que regresa (-1 si no es un while válido)
+        self.loops: Dict[int, int] = {}
+        self.targets: Set[int] = set()
+        for i in range(start, end + 1):
+            op, _, _, res = self.quads[i]
+            if op in _JUMPS:
+                target = int(res)
+                self.targets.add(target)
+                if op == "GOTO" and target <= i:
+                    valid = target >= start and target not in self.loops
+                    self.loops[target] = i if valid else -1
+
+    # ----------------- Código lineal ----------------- #
+
+    def _temp_dies_at(self, addr: Any, i: int) -> bool:
+        """True si el temporal `addr` no se vuelve a leer después de i antes de reescribirse."""
+        if not (isinstance(addr, int) and TEMP_MIN <= addr <= TEMP_MAX):
+            return False
+        for j in range(i + 1, self.end + 1):
+            op, left, right, res = self.quads[j]
+            if left == addr or right == addr:
+                return False
+            if res == addr and op not in _JUMPS and op not in ("GOSUB", "PARAM"):
+                return True
+        return True
+
+    def _fused_condition(self, i: int) -> Optional[str]:
+        """
+        Si el cuádruplo i es un relacional cuyo resultado solo lo usa el
+        GOTOF siguiente, regresa la expresión para usarla directo en if/while.
+        """
+        if i + 1 > self.end or i + 1 in self.targets:
+            return None
+        op, _, _, res = self.quads[i]
+        nxt = self.quads[i + 1]
+        if op in _RELATIONAL and nxt[0] == "GOTOF" and nxt[1] == res and self._temp_dies_at(res, i + 1):
+            return self.gen._expr(self.quads[i])
+        return None
+
+    def _simple(self, i: int, indent: str, out: List[str]) -> None:
+        op, left, right, res = self.quads[i]
+        operand = self.gen._operand
+
+        if op in _ARITH or op in _RELATIONAL:
+            out.append(f"{indent}{operand(res)} = {self.gen._expr(self.quads[i])}")
+        elif op == "=":
+            out.append(f"{indent}{operand(res)} = {operand(left)}")
+        elif op == "PRINT":
+            out.append(f"{indent}_print({operand(left)})")
+        elif op == "ERA":
+            self.call_args.append([])
+        elif op == "PARAM":
+            # Se copia el argumento en el momento del PARAM, como en la VM
+            name = f"_a{self.arg_counter}"
+            self.arg_counter += 1
+            out.append(f"{indent}{name} = {operand(left)}")
+            self.call_args[-1].append((int(res), name))
+        elif op == "GOSUB":
+            func = str(left)
+            order = self.gen.param_index.get(func, {})
+            args = sorted(self.call_args.pop(), key=lambda a: order.get(a[0], 0))
+            out.append(f"{indent}fn_{func}({', '.join(name for _, name in args)})")
+        elif op in ("RETURN", "END"):
+            out.append(f"{indent}return")
+        elif op == "ENDFUNC":
+            pass
+        else:
+            raise RuntimeError(f"Opcode desconocido: {op}")
+
+    # ----------------- Versión estructurada ----------------- #
+
+    def structured(self) -> List[str]:
+        if any(k < 0 for k in self.loops.values()):
+            raise _Unstructured()
+        self._range(self.start, self.end + 1, 0, None)
+        return self.out
+
+    def _range(self, i: int, j: int, depth: int, loop_exit: Optional[int]) -> None:
+        indent = _INDENT * depth
+        out = self.out
+        mark = len(out)
+
+        while i < j:
+            op, left, _, res = self.quads[i]
+
+            if i in self.loops and self.loops[i] < j:
+                i = self._loop(i, depth)
+                continue
+
+            cond = self._fused_condition(i)
+            if cond is not None:
+                gotof = i + 1
+                i = self._branch(gotof, cond, j, depth, loop_exit)
+                continue
+
+            if op == "GOTOF":
+                i = self._branch(i, self.gen._operand(left), j, depth, loop_exit)
+                continue
+
+            if op == "GOTO":
+                # Los GOTO válidos los consumen _loop y _branch
+                raise _Unstructured()
+
+            self._simple(i, indent, out)
+            i += 1
+
+        if len(out) == mark:
+            out.append(f"{indent}pass")
+
+    def _branch(self, i: int, cond: str, j: int, depth: int, loop_exit: Optional[int]) -> int:
+        """GOTOF en i: if / if-else, o salida de ciclo. Regresa el siguiente índice."""
+        indent = _INDENT * depth
+        target = int(self.quads[i][3])
+
+        if loop_exit is not None and target == loop_exit:
+            self.out.append(f"{indent}if not ({cond}):")
+            self.out.append(f"{indent}{_INDENT}break")
+            return i + 1
+
+        if not (i < target <= j):
+            raise _Unstructured()
+
+        before_else = self.quads[target - 1]
+        if (
+            target - 1 > i
+            and before_else[0] == "GOTO"
+            and target - 1 not in self.loops.values()
+            and target <= int(before_else[3]) <= j
+        ):
+            end = int(before_else[3])
+            self.out.append(f"{indent}if {cond}:")
+            self._range(i + 1, target - 1, depth + 1, loop_exit)
+            self.out.append(f"{indent}else:")
+            self._range(target, end, depth + 1, loop_exit)
+            return end
+
+        self.out.append(f"{indent}if {cond}:")
+        self._range(i + 1, target, depth + 1, loop_exit)
+        return target
+
+    def _loop(self, head: int, depth: int) -> int:
+        """Ciclo while [head, back]; regresa el índice siguiente al GOTO de regreso."""
+        indent = _INDENT * depth
+        back = self.loops[head]
+        exit_ = back + 1
+
+        cond = self._fused_condition(head)
+        gotof = self.quads[head + 1] if head + 1 < back else None
+        if cond is not None and gotof is not None and int(gotof[3]) == exit_:
+            self.out.append(f"{indent}while {cond}:")
+            self._range(head + 2, back, depth + 1, exit_)
+        else:
+            self.out.append(f"{indent}while True:")
+            # Evita volver a detectar el mismo ciclo al entrar a su cuerpo
+            del self.loops[head]
+            self._range(head, back, depth + 1, exit_)
+            self.loops[head] = back
+        return exit_
+
+    # ----------------- Versión con despacho por bloques ----------------- #
+
+    def dispatch_loop(self) -> List[str]:
+        leaders = {self.start} | {t for t in self.targets if self.start <= t <= self.end}
+        for i in range(self.start, self.end + 1):
+            if self.quads[i][0] in _JUMPS and i + 1 <= self.end:
+                leaders.add(i + 1)
+        ordered = sorted(leaders)
+
+        out = [f"_pc = {self.start}", "while True:"]
+        for n, lead in enumerate(ordered):
+            stop = ordered[n + 1] if n + 1 < len(ordered) else self.end + 1
+            keyword = "if" if n == 0 else "elif"
+            out.append(f"{_INDENT}{keyword} _pc == {lead}:")
+            body: List[str] = []
+            ind = _INDENT * 2
+            ends_with_jump = False
+            for i in range(lead, stop):
+                op, left, _, res = self.quads[i]
+                if op == "GOTO":
+                    body.append(f"{ind}_pc = {int(res)}")
+                    body.append(f"{ind}continue")
+                    ends_with_jump = True
+                elif op == "GOTOF":
+                    body.append(f"{ind}if not {self.gen._operand(left)}:")
+                    body.append(f"{ind}{_INDENT}_pc = {int(res)}")
+                    body.append(f"{ind}{_INDENT}continue")
+                else:
+                    self._simple(i, ind, body)
+                    ends_with_jump = op in ("RETURN", "END", "ENDFUNC")
+            if not ends_with_jump:
+                if stop <= self.end:
+                    body.append(f"{ind}_pc = {stop}")
+                    body.append(f"{ind}continue")
+                else:
+                    body.append(f"{ind}return")
+            out.extend(body)
+        out.append(f"{_INDENT}return")
+        return out
@@ -0,0 +1,194 @@
+# entrega5/superinstructions.py
+#
+# Superinstrucciones para el motor "table" (VirtualMachine(fuse=True)).
+#
+# El generador de código emite patrones muy regulares. Después de ligar el
+# programa se buscan tres y cada uno se reemplaza por una sola instrucción
+# que hace todo el trabajo en un despacho:
+#
+#   - compare-and-branch: relacional a un temporal + GOTOF sobre ese temporal
+#       ("<", a, b, t), ("GOTOF", t, None, L)
+#   - op-and-store: operación binaria a un temporal + "=" del temporal
+#       ("+", a, b, t), ("=", t, None, x)
+#   - llamada: ERA, los PARAM seguidos y el GOSUB de la misma función
+#       ("ERA", f), ("PARAM", a, None, p0), ..., ("GOSUB", f, None, start)
+#
+# La superinstrucción ocupa el lugar del primer cuádruplo del patrón y
+# regresa el ip que sigue al patrón completo (o el destino del salto). Los
+# demás cuádruplos se quedan ligados en su lugar, así los índices y destinos
+# de salto no cambian y un salto que cae a medio patrón sigue funcionando.
+# El temporal intermedio se sigue escribiendo, igual que sin fusionar.
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from entrega5.closure_backend import BINARY_OPS
+from entrega5.vm import FIRST_LOCAL_BANK, FIRST_TEMP_BANK, _UNSET
+
+if TYPE_CHECKING:
+    from entrega5.vm import Handler, LinkedInstr, VirtualMachine
+
+RELATIONAL_OPS = frozenset({">", "<", ">=", "<=", "==", "!="})
+
+KINDS = ("compare_branch", "op_store", "call")
+
+
+@dataclass
+class FusionStats:
+    """
+    Cuántos patrones se fusionaron por tipo y cuántos cuádruplos quedaron
+    cubiertos por superinstrucciones (conteo estático, sobre el programa).
+    """
+    total_quads: int = 0
+    fused: Dict[str, int] = field(default_factory=lambda: {kind: 0 for kind in KINDS})
+    quads_fused: int = 0
+
+    @property
+    def superinstructions(self) -> int:
+        return sum(self.fused.values())
+
+    @property
+    def dispatches_saved(self) -> int:
+        """Despachos que se ahorra una pasada por todos los patrones."""
+        return self.quads_fused - self.superinstructions
+
+    def report(self) -> str:
+        pct = 100 * self.quads_fused / self.total_quads if self.total_quads else 0.0
+        lines = [f"Cuádruplos fusionados: {self.quads_fused} de {self.total_quads} ({pct:.1f}%)"]
+        lines += [f"  {kind:<16}{self.fused[kind]:>6}" for kind in KINDS]
+        return "\n".join(lines)
+
+
+def fuse_program(vm: VirtualMachine) -> FusionStats:
+    """
+    Reemplaza en ``vm.program`` (ya ligado) el inicio de cada patrón por su
+    superinstrucción y regresa las estadísticas. Con ``vm.limits`` no se
+    fusionan llamadas, para que cada GOSUB pase por su revisión.
+    """
+    quads = vm.quads
+    program = vm.program
+    stats = FusionStats(total_quads=len(quads))
+    compare_branch = _compare_branch_handler(vm)
+    op_store = _op_store_handler(vm)
+    call = _call_handler(vm)
+
+    ip = 0
+    while ip < len(quads):
+        fused: Optional[Tuple[str, LinkedInstr, int]] = None
+        op = quads[ip][0]
+        if op in BINARY_OPS and ip + 1 < len(quads):
+            fused = _match_binary(quads, program, ip, compare_branch, op_store)
+        elif op == "ERA" and vm.limits is None:
+            fused = _match_call(quads, program, ip, call)
+
+        if fused is None:
+            ip += 1
+            continue
+        kind, ins, length = fused
+        program[ip] = ins
+        stats.fused[kind] += 1
+        stats.quads_fused += length
+        ip += length
+    return stats
+
+
+# ----------------- Patrones ----------------- #
+
+def _match_binary(
+    quads: List, program: List[LinkedInstr], ip: int, compare_branch: Handler, op_store: Handler,
+) -> Optional[Tuple[str, LinkedInstr, int]]:
+    op, _, right, temp = quads[ip]
+    nxt_op, nxt_left, _, _ = quads[ip + 1]
+    if right is None or nxt_left != temp:
+        return None  # menos unario o el siguiente no consume el resultado
+
+    _, lb, lo, rb, ro, db, do = program[ip]
+    fn = BINARY_OPS[op]
+    if nxt_op == "GOTOF" and op in RELATIONAL_OPS:
+        target = program[ip + 1][6]
+        return "compare_branch", (compare_branch, fn, lb, lo, rb, ro, db, do, target), 2
+    if nxt_op == "=":
+        _, _, _, _, _, vb, vo = program[ip + 1]
+        return "op_store", (op_store, fn, lb, lo, rb, ro, db, do, vb, vo), 2
+    return None
+
+
+def _match_call(quads: List, program: List[LinkedInstr], ip: int, call: Handler) -> Optional[Tuple[str, LinkedInstr, int]]:
+    name = quads[ip][1]
+    params = []
+    end = ip + 1
+    while end < len(quads) and quads[end][0] == "PARAM":
+        _, lb, lo, _, _, db, do = program[end]
+        params.append((lb, lo, db - FIRST_LOCAL_BANK, do, end))
+        end += 1
+    if end >= len(quads) or quads[end][0] != "GOSUB" or quads[end][1] != name:
+        return None  # argumentos calculados entre ERA y GOSUB: no se fusiona
+    return "call", (call, name, tuple(params), end, program[end][6]), end - ip + 1
+
+
+# ----------------- Handlers ----------------- #
+#
+# Cada uno cierra sobre los bancos de la VM (la lista no se reemplaza, solo
+# cambian sus elementos) y recibe (ip, instrucción) como los del motor "table".
+
+def _compare_branch_handler(vm: VirtualMachine) -> Handler:
+    banks = vm._banks
+    fail = vm._uninitialized
+
+    def compare_branch(ip: int, ins: LinkedInstr) -> int:
+        _, fn, lb, lo, rb, ro, db, do, target = ins
+        a = banks[lb][lo]
+        b = banks[rb][ro]
+        if a is _UNSET or b is _UNSET:
+            fail(ip)
+        cond = banks[db][do] = fn(a, b)
+        if cond:
+            return ip + 2
+        return target
+
+    return compare_branch
+
+
+def _op_store_handler(vm: VirtualMachine) -> Handler:
+    banks = vm._banks
+    fail = vm._uninitialized
+
+    def op_store(ip: int, ins: LinkedInstr) -> int:
+        _, fn, lb, lo, rb, ro, db, do, vb, vo = ins
+        a = banks[lb][lo]
+        b = banks[rb][ro]
+        if a is _UNSET or b is _UNSET:
+            fail(ip)
+        banks[vb][vo] = banks[db][do] = fn(a, b)
+        return ip + 2
+
+    return op_store
+
+
+def _call_handler(vm: VirtualMachine) -> Handler:
+    banks = vm._banks
+    stack = vm.call_stack
+    acquire = vm._acquire_frame
+    fail = vm._uninitialized
+
+    def call(ip: int, ins: LinkedInstr) -> int:
+        # ERA + PARAM* + GOSUB: los argumentos se leen de los bancos del
+        # llamador y se copian directo al frame nuevo
+        _, name, params, gosub_ip, target = ins
+        frame = acquire(name)
+        slots = frame.locals.slots
+        for lb, lo, t, do, param_ip in params:
+            a = banks[lb][lo]
+            if a is _UNSET:
+                fail(param_ip)
+            slots[t][do] = a
+        frame.return_ip = gosub_ip + 1
+        stack.append(frame)
+        banks[FIRST_LOCAL_BANK:FIRST_TEMP_BANK] = slots
+        banks[FIRST_TEMP_BANK:] = frame.temps.slots
+        return target
+
+    return call
+
@@ -0,0 +1,68 @@
+from entrega5.batch_runner import Job, run_batch
+
+
+DOBLE = """
+program p;
+var x, y: int;
+main {
+  y = x * 2;
+  print("doble", y);
+} end
+"""
+
+DIVIDE = """
+program p;
+var x: int;
+var y: float;
+main {
+  print("antes");
+  y = 1 / x;
+  print(y);
+} end
+"""
+
+
+def jobs():
+    return [
+        Job(DOBLE, {"x": 1}),
+        Job(DIVIDE, {"x": 0}),
+        Job(DOBLE, {"x": 21}),
+        Job("program p; main { print(z); } end"),
+        Job(DIVIDE, {"x": 4}),
+        Job(DOBLE, {"nope": 1}),
+    ]
+
+
+def check(results):
+    assert [r.index for r in results] == list(range(6))
+    assert results[0].output == '"doble"\n2\n' and results[0].ok
+    assert results[1].error.startswith("ZeroDivisionError")
+    assert results[1].output == '"antes"\n'
+    assert results[2].output == '"doble"\n42\n'
+    assert not results[3].ok and results[3].output == ""
+    assert results[4].output == '"antes"\n0.25\n'
+    assert results[5].error.startswith("KeyError")
+    assert all(r.compile_seconds > 0 for r in results)
+    assert results[0].run_seconds > 0
+
+
+def test_en_serie():
+    check(run_batch(jobs(), max_workers=0))
+
+
+def test_en_pool_de_procesos():
+    check(run_batch(jobs(), max_workers=2))
+
+
+def test_errores_de_sintaxis_por_trabajo(capsys):
+    results = run_batch([
+        Job("program x; var a: int; main { a = ; } end"),
+        Job(DOBLE, {"x": 3}),
+        Job("program x; var a: int; main { a = 1 +; } end"),
+    ], max_workers=0)
+
+    assert results[0].error.startswith("SyntaxError: línea 1:34 ")
+    assert results[2].error.startswith("SyntaxError: línea 1:37 ")
+    assert results[1].output == '"doble"\n6\n'
+    # Los mensajes quedan en cada JobResult, no en el stderr compartido
+    assert capsys.readouterr().err == ""
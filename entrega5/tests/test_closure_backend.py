@@ -0,0 +1,65 @@
+import pytest
+
+from entrega3.codegen_visitor import translate
+from entrega5.vm import VirtualMachine
+
+
+def _run_closure(source: str, capsys) -> str:
+    func_dir, quads = translate(source)
+    vm = VirtualMachine(quads, constants=func_dir.constants, engine="closure")
+    vm.run()
+    return capsys.readouterr().out.strip()
+
+
+def test_closure_unary_minus(capsys):
+    source = """
+    program p;
+    var x: int;
+    main {
+      x = -3 + 10;
+      print(x);
+    } end
+    """
+    assert _run_closure(source, capsys) == "7"
+
+
+def test_closure_function_return(capsys):
+    source = """
+    program p;
+    var x: int;
+    int f(a: int) {
+      {
+        return a * 2;
+      }
+    };
+    main {
+      x = f(5);
+      print(x);
+    } end
+    """
+    assert _run_closure(source, capsys) == "10"
+
+
+def test_closure_while_con_constantes(capsys):
+    source = """
+    program p;
+    var i: int;
+    var s: float;
+    main {
+      i = 0;
+      s = 0.5;
+      while (i < 4) do {
+        s = s * 2;
+        i = i + 1;
+      };
+      print(s, 1 / 4);
+    } end
+    """
+    assert _run_closure(source, capsys).split() == ["8.0", "0.25"]
+
+
+def test_closure_lectura_no_inicializada():
+    quads = [("+", 1000, 13000, 1001), ("END", None, None, None)]
+    vm = VirtualMachine(quads, constants={13000: 1}, engine="closure")
+    with pytest.raises(RuntimeError, match="no inicializada"):
+        vm.run()
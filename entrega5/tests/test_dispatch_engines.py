@@ -0,0 +1,56 @@
+import pytest
+
+from entrega3.codegen_visitor import translate
+from entrega5.vm import VirtualMachine
+
+
+SOURCE = """
+program p;
+var i, acc: int;
+var r: float;
+int doble(a: int) {
+  {
+    return a * 2;
+  }
+};
+main {
+  i = 0;
+  acc = 0;
+  while (i < 5) do {
+    acc = acc + doble(i);
+    i = i + 1;
+  };
+  r = acc / 4;
+  if (r >= 5) {
+    print(acc, r);
+  } else {
+    print(-acc);
+  };
+} end
+"""
+
+
+def _run(engine: str, capsys) -> str:
+    func_dir, quads = translate(SOURCE)
+    vm = VirtualMachine(quads, constants=func_dir.constants, engine=engine)
+    vm.run()
+    return capsys.readouterr().out
+
+
+def test_table_engine_is_default():
+    _, quads = translate(SOURCE)
+    assert VirtualMachine(quads).engine == "table"
+
+
+@pytest.mark.parametrize("engine", ["table", "closure"])
+def test_engines_match_chain_reference(engine, capsys):
+    out = _run(engine, capsys)
+    chain_out = _run("chain", capsys)
+
+    assert out == chain_out
+    assert out.split() == ["20", "5.0"]
+
+
+def test_unknown_engine_raises():
+    with pytest.raises(ValueError):
+        VirtualMachine([], engine="jit")
@@ -0,0 +1,117 @@
+import pytest
+
+from entrega3.codegen_visitor import translate
+from entrega5.limits import ExecutionLimitExceeded, ExecutionLimits
+from entrega5.output import CaptureSink
+from entrega5.vm import ENGINES, VirtualMachine
+
+
+INFINITO = """
+program p;
+var i: int;
+main {
+  i = 0;
+  while (i > -1) do {
+    i = i + 1;
+  };
+} end
+"""
+
+RECURSIVO = """
+program p;
+var r: int;
+int baja(k: int) {
+  var a: int;
+  {
+    a = baja(k - 1);
+    return a;
+  }
+};
+main {
+  r = baja(10);
+} end
+"""
+
+FINITO = """
+program p;
+var i, s: int;
+int uno(k: int) {
+  {
+    return k;
+  }
+};
+main {
+  i = 0;
+  s = 0;
+  while (i < 10) do {
+    s = s + uno(i);
+    i = i + 1;
+  };
+  print(s);
+} end
+"""
+
+
+def make_vm(source, engine="table", **limits):
+    func_dir, quads = translate(source)
+    return VirtualMachine(
+        quads, constants=func_dir.constants, frames=func_dir.frame_layouts(),
+        engine=engine, output=CaptureSink(), limits=ExecutionLimits(**limits),
+    )
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_ciclo_infinito_se_detiene_por_instrucciones(engine):
+    vm = make_vm(INFINITO, engine, max_instructions=10_000)
+    with pytest.raises(ExecutionLimitExceeded) as info:
+        vm.run()
+    err = info.value
+    assert err.limit == "instructions"
+    assert err.call_stack == []
+    assert vm.quads[err.ip][0] == "GOTO"
+    assert 10_000 < vm.instructions_charged <= 10_010
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_recursion_sin_fin_se_detiene_por_profundidad(engine):
+    vm = make_vm(RECURSIVO, engine, max_call_depth=50)
+    with pytest.raises(ExecutionLimitExceeded) as info:
+        vm.run()
+    assert info.value.limit == "call_depth"
+    assert info.value.call_stack == ["baja"] * 50
+    assert "baja > baja" in str(info.value)
+
+
+def test_ciclo_infinito_se_detiene_por_tiempo():
+    vm = make_vm(INFINITO, max_seconds=0.05)
+    with pytest.raises(ExecutionLimitExceeded) as info:
+        vm.run()
+    assert info.value.limit == "seconds"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_programa_dentro_del_presupuesto(engine):
+    vm = make_vm(FINITO, engine, max_instructions=10_000, max_call_depth=2, max_seconds=5)
+    vm.run()
+    assert vm.output.lines() == ["45"]
+    # La cuenta es una cota superior de lo que realmente se ejecutó
+    func_dir, quads = translate(FINITO)
+    counter = VirtualMachine(quads, constants=func_dir.constants, output=CaptureSink(), profile=True)
+    counter.run()
+    assert vm.instructions_charged >= counter.profile.total_instructions
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_segundo_run_empieza_con_presupuesto_nuevo(engine):
+    vm = make_vm(FINITO, engine, max_instructions=10_000)
+    vm.run()
+    first = vm.instructions_charged
+
+    # Un presupuesto para poco más de una corrida: la segunda no debe heredar
+    # lo cargado en la primera
+    vm = make_vm(FINITO, engine, max_instructions=first + first // 2)
+    vm.run()
+    vm.ip = 0
+    vm.run()
+    assert vm.instructions_charged == first
+    assert vm.output.lines() == ["45", "45"]
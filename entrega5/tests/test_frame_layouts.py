@@ -0,0 +1,74 @@
+from entrega2.symbols import MAIN_FRAME
+from entrega3.codegen_visitor import translate
+from entrega5.vm import VirtualMachine
+
+
+SOURCE = """
+program p;
+var x: int;
+float f(a: int, b: float) {
+  var c, d: int;
+  {
+    c = a * 2;
+    d = c + 1;
+    return d / b;
+  }
+};
+main {
+  x = 1 + 2;
+  print(f(x, 2.0));
+} end
+"""
+
+
+def test_codegen_registra_layout_por_funcion():
+    func_dir, _ = translate(SOURCE)
+    layout = func_dir.get_function("f").frame
+
+    assert layout.params == {"int": 1, "float": 1}
+    assert layout.locals == {"int": 2}
+    # a*2 y c+1 son int pero reusan el mismo temporal; d/b es float
+    assert layout.temps == {"int": 1, "float": 1}
+    assert layout.temps == layout.temp_slots
+    assert layout.local_slots == {"int": 3, "float": 1}
+
+    # main solo usa un temporal int (1 + 2)
+    assert func_dir.frame_layouts()[MAIN_FRAME].temps == {"int": 1}
+
+
+def test_era_reserva_frames_exactos(capsys):
+    func_dir, quads = translate(SOURCE)
+    vm = VirtualMachine(quads, constants=func_dir.constants, frames=func_dir.frame_layouts())
+
+    frame = vm._new_frame("f")
+    assert [len(s) for s in frame.locals.slots] == [3, 1, 0, 0]
+    # a*2 y c+1 comparten temporal (el primero ya se consumió al asignar)
+    assert sum(len(s) for s in frame.temps.slots) == 2
+
+    vm.run()
+    assert capsys.readouterr().out.strip() == "3.5"
+
+
+def test_temps_cuenta_temporales_distintos_no_reservas():
+    source = """
+    program p;
+    var x: int;
+    int g(a: int) {
+      var c: int;
+      {
+        c = a * 2;
+        c = c + 1;
+        c = c * 3;
+        c = (c - 1) * (c + 1);
+        return c;
+      }
+    };
+    main {
+      x = g(4);
+    } end
+    """
+    func_dir, _ = translate(source)
+    layout = func_dir.get_function("g").frame
+    # 6 reservas; (c - 1) y (c + 1) están vivos a la vez, el resto se reusa
+    assert layout.temps == {"int": 2}
+    assert layout.temps == layout.temp_slots
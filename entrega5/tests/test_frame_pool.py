@@ -0,0 +1,71 @@
+import pytest
+
+from entrega3.codegen_visitor import translate
+from entrega5.vm import ActivationRecord, VirtualMachine
+
+
+FIB = """
+program p;
+var r: int;
+int fib(n: int) {
+  var a, b: int;
+  {
+    if (n < 2) {
+      return n;
+    };
+    a = fib(n - 1);
+    b = fib(n - 2);
+    return a + b;
+  }
+};
+main {
+  r = fib(10);
+  print(r);
+} end
+"""
+
+
+@pytest.mark.parametrize("engine", ["table", "closure", "chain"])
+def test_frames_reciclados_en_recursion(engine, capsys):
+    func_dir, quads = translate(FIB)
+    vm = VirtualMachine(
+        quads,
+        constants=func_dir.constants,
+        frames=func_dir.frame_layouts(),
+        engine=engine,
+    )
+    vm.run()
+
+    assert capsys.readouterr().out.strip() == "55"
+    # fib(10) hace 177 llamadas; solo la profundidad máxima crea frames
+    assert vm.pool_hits + vm.pool_misses == 177
+    assert vm.pool_misses <= 10
+
+
+def test_frame_reciclado_llega_limpio():
+    source = """
+    program p;
+    var x: int;
+    void f(a: int) {
+      var b: int;
+      {
+        b = a;
+      }
+    };
+    main {
+      f(1);
+      f(2);
+    } end
+    """
+    func_dir, quads = translate(source)
+    vm = VirtualMachine(quads, constants=func_dir.constants, frames=func_dir.frame_layouts())
+    vm.run()
+
+    assert (vm.pool_hits, vm.pool_misses) == (1, 1)
+    (frame,) = vm._frame_pool["f"]
+    with pytest.raises(RuntimeError, match="no inicializada"):
+        frame.locals.get(3001)
+
+
+def test_activation_record_usa_slots():
+    assert not hasattr(ActivationRecord(), "__dict__")
@@ -0,0 +1,83 @@
+import pytest
+
+from entrega3.codegen_visitor import translate
+from entrega5.hooks import CallEvent, InstructionEvent, RecordingHook, ReturnEvent, VMHook, WriteEvent
+from entrega5.output import CaptureSink
+from entrega5.vm import ENGINES, VirtualMachine
+
+
+SOURCE = """
+program p;
+var r: int;
+int doble(k: int) {
+  {
+    return k * 2;
+  }
+};
+main {
+  r = doble(21);
+  print(r);
+} end
+"""
+
+
+def make_vm(**kwargs):
+    func_dir, quads = translate(SOURCE)
+    return VirtualMachine(quads, constants=func_dir.constants, frames=func_dir.frame_layouts(), **kwargs), quads
+
+
+def test_eventos_estructurados():
+    for engine in ENGINES:
+        hook = RecordingHook()
+        vm, quads = make_vm(engine=engine, hooks=[hook], output=CaptureSink())
+        vm.run()
+        assert vm.output.lines() == ["42"]
+
+        steps = [e for e in hook.events if isinstance(e, InstructionEvent)]
+        assert steps[0] == InstructionEvent(0, quads[0])
+        assert steps[-1].quad[0] == "END"
+
+        calls = [e for e in hook.events if isinstance(e, CallEvent)]
+        returns = [e for e in hook.events if isinstance(e, ReturnEvent)]
+        assert [(c.function, c.depth) for c in calls] == [("doble", 1)]
+        assert calls[0].target == 1
+        assert [(r.function, r.depth) for r in returns] == [("doble", 0)]
+
+        writes = [e for e in hook.events if isinstance(e, WriteEvent)]
+        assert [w.value for w in writes] == [21, 42, 42, 42]
+        assert writes[-1].address == 1000
+
+
+def test_solo_se_arman_los_eventos_escuchados():
+    class Llamadas(VMHook):
+        def __init__(self):
+            self.nombres = []
+
+        def on_call(self, event):
+            self.nombres.append(event.function)
+
+    hook = Llamadas()
+    vm, _ = make_vm(hooks=[hook], output=CaptureSink())
+    vm.run()
+    assert hook.nombres == ["doble"]
+
+
+def test_debug_es_un_hook_de_traza(capsys):
+    vm, quads = make_vm(debug=True)
+    vm.run()
+    out = capsys.readouterr().out.splitlines()
+    trace = [line for line in out if line.startswith("[IP=")]
+    assert trace[0] == "[IP=000] GOTO, None, None, 5"
+    assert "42" in out
+
+
+def test_sin_hooks_no_se_usa_el_ciclo_instrumentado(monkeypatch):
+    vm, _ = make_vm(output=CaptureSink())
+    monkeypatch.setattr(vm, "_run_hooked", lambda: pytest.fail("no debería instrumentar"))
+    vm.run()
+    assert vm.output.lines() == ["42"]
+
+
+def test_profile_y_hooks_no_se_combinan():
+    with pytest.raises(ValueError):
+        make_vm(profile=True, debug=True)
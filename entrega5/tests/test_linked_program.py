@@ -0,0 +1,49 @@
+import pytest
+
+from entrega3.codegen_visitor import translate
+from entrega5.vm import (
+    FIRST_TEMP_BANK,
+    SEG_CONST,
+    SEG_GLOBAL,
+    VirtualMachine,
+    decode_address,
+)
+
+
+def test_decode_address_por_segmento_y_tipo():
+    # banco = segmento * 4 + tipo (int, float, bool, string)
+    assert decode_address(1000) == (SEG_GLOBAL * 4, 0)
+    assert decode_address(1501) == (SEG_GLOBAL * 4 + 1, 1)
+    assert decode_address(8501) == (FIRST_TEMP_BANK + 1, 1)
+    assert decode_address(13002) == (SEG_CONST * 4, 2)
+
+    with pytest.raises(RuntimeError):
+        decode_address(7000)
+
+
+def test_link_resuelve_operandos():
+    source = """
+    program p;
+    var x: int;
+    main {
+      x = 3 + 4;
+    } end
+    """
+    func_dir, quads = translate(source)
+    vm = VirtualMachine(quads, constants=func_dir.constants)
+
+    add_idx = [q[0] for q in quads].index("+")
+    _, lb, lo, rb, ro, db, do = vm.program[add_idx]
+    assert (lb, lo) == decode_address(quads[add_idx][1])
+    assert (rb, ro) == decode_address(quads[add_idx][2])
+    assert (db, do) == decode_address(quads[add_idx][3])
+
+    vm.run()
+    assert vm.global_mem.get(1000) == 7
+
+
+def test_lectura_no_inicializada_es_error():
+    quads = [("=", 1001, None, 1000), ("END", None, None, None)]
+    vm = VirtualMachine(quads)
+    with pytest.raises(RuntimeError, match="no inicializada"):
+        vm.run()
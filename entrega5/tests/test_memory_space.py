@@ -0,0 +1,56 @@
+import pytest
+
+from entrega3.codegen_visitor import translate
+from entrega5.vm import MemorySpace, VirtualMachine
+
+
+def test_slots_por_tipo_indexados_desde_la_base():
+    space = MemorySpace("global", [2, 0, 1, 0])
+
+    space.set(1001, 5)
+    space.set(1500, 2.5)   # float: crece desde 0 slots
+    space.set(2000, True)
+
+    assert space.slots[0][1] == 5
+    assert space.slots[1] == [2.5]
+    assert space.get(2000) is True
+
+
+def test_celda_sin_escribir_es_error():
+    space = MemorySpace("temp", [4, 0, 0, 0])
+    with pytest.raises(RuntimeError, match="no inicializada"):
+        space.get(8002)
+    with pytest.raises(RuntimeError, match="no inicializada"):
+        space.get(8900)
+
+
+def test_direccion_fuera_del_segmento():
+    space = MemorySpace("local")
+    with pytest.raises(RuntimeError):
+        space.set(1000, 1)
+
+
+def test_frames_dimensionados_al_ligar():
+    source = """
+    program p;
+    var x: int;
+    int f(a: int, b: float) {
+      var c: int;
+      {
+        c = a + 1;
+        return c;
+      }
+    };
+    main {
+      x = f(1, 2.0);
+    } end
+    """
+    func_dir, quads = translate(source)
+    vm = VirtualMachine(quads, constants=func_dir.constants)
+    frame = vm._new_frame("f")
+
+    # a, c (int) y b (float) en locales
+    assert [len(s) for s in frame.locals.slots] == [2, 1, 0, 0]
+
+    vm.run()
+    assert vm.global_mem.get(1000) == 2
@@ -0,0 +1,83 @@
+import pytest
+
+from entrega3.compiled_program import CompiledProgram
+from entrega5.pato_object import map_object, write_object
+from entrega5.vm import VirtualMachine
+
+
+SOURCE = """
+program p;
+var n, r: int;
+int fib(k: int) {
+  var a, b: int;
+  {
+    if (k < 2) { return k; };
+    a = fib(k - 1);
+    b = fib(k - 2);
+    return a + b;
+  }
+};
+main {
+  n = 12;
+  r = fib(n);
+  print("fib", r);
+  if (r > 1000) { print(1 / 0); };
+} end
+"""
+
+
+def test_la_vista_mapeada_coincide_con_el_programa(tmp_path):
+    program = CompiledProgram.from_source(SOURCE)
+    path = tmp_path / "fib.pato"
+    write_object(program, path)
+
+    with map_object(path) as image:
+        assert len(image.quads) == len(program.quads)
+        assert list(image.quads) == program.quads
+        assert image.quads[-1] == program.quads[-1]
+        assert image.constants == program.constants
+        assert image.frames == program.frames
+        assert image.to_program() == program
+
+
+def test_vm_ejecuta_desde_el_mmap_ligando_bajo_demanda(tmp_path, capsys):
+    program = CompiledProgram.from_source(SOURCE)
+    path = tmp_path / "fib.pato"
+    write_object(program, path)
+
+    vm = VirtualMachine.from_object(path)
+    try:
+        vm.run()
+    finally:
+        vm.image.close()
+
+    assert capsys.readouterr().out.split() == ['"fib"', "144"]
+    # La rama con la división entre cero nunca se ejecutó ni se ligó
+    linked = [ins[0] != vm._op_link for ins in vm.program]
+    assert not all(linked)
+    assert linked[0]
+
+
+def test_lazy_link_da_el_mismo_resultado_que_ligar_todo(capsys):
+    program = CompiledProgram.from_source(SOURCE)
+    for lazy in (False, True):
+        vm = VirtualMachine(program.quads, constants=program.constants, frames=program.frames, lazy_link=lazy)
+        vm.run()
+        assert vm.global_mem.get(1001) == 144
+    assert capsys.readouterr().out.split() == ['"fib"', "144"] * 2
+
+
+def test_lazy_link_usa_los_layouts_de_cada_frame():
+    program = CompiledProgram.from_source(SOURCE)
+    vm = VirtualMachine(program.quads, constants=program.constants, frames=program.frames, lazy_link=True)
+    vm.run()
+    frame = vm._frame_pool["fib"][0]
+    layout = program.frames["fib"]
+    assert len(frame.locals.slots[0]) == layout.local_slots.get("int", 0)
+    assert len(frame.temps.slots[0]) == layout.temp_slots.get("int", 0)
+
+
+def test_lazy_link_sin_frames_es_error():
+    program = CompiledProgram.from_source(SOURCE)
+    with pytest.raises(ValueError, match="frames"):
+        VirtualMachine(program.quads, constants=program.constants, lazy_link=True)
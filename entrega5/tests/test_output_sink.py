@@ -0,0 +1,56 @@
+import io
+
+from entrega3.codegen_visitor import PRINT_EOL, translate
+from entrega5.output import BufferedSink, CaptureSink
+from entrega5.vm import ENGINES, VirtualMachine
+
+
+SOURCE = """
+program p;
+var i: int;
+main {
+  i = 0;
+  while (i < 3) do {
+    print("i", i, i * 2);
+    i = i + 1;
+  };
+  print(i);
+} end
+"""
+
+
+def run(engine="table", **kwargs):
+    func_dir, quads = translate(SOURCE)
+    vm = VirtualMachine(quads, constants=func_dir.constants, frames=func_dir.frame_layouts(), engine=engine, **kwargs)
+    vm.run()
+    return vm
+
+
+def test_solo_el_ultimo_argumento_cierra_el_registro():
+    _, quads = translate(SOURCE)
+    prints = [q for q in quads if q[0] == "PRINT"]
+    assert [q[3] for q in prints] == [None, None, PRINT_EOL, PRINT_EOL]
+
+
+def test_cada_print_es_un_registro():
+    for engine in ENGINES:
+        sink = CaptureSink()
+        run(engine, output=sink)
+        assert sink.records == ['"i"\n0\n0\n', '"i"\n1\n2\n', '"i"\n2\n4\n', "3\n"]
+
+
+def test_buffered_sink_escribe_por_bloques():
+    stream = io.StringIO()
+    sink = BufferedSink(stream, flush_size=20)
+    sink.write("a" * 10)
+    assert stream.getvalue() == ""
+    sink.write("b" * 10)
+    assert stream.getvalue() == "a" * 10 + "b" * 10
+    sink.write("c")
+    sink.flush()
+    assert stream.getvalue().endswith("c")
+
+
+def test_salida_por_default_no_cambia(capsys):
+    run()
+    assert capsys.readouterr().out == '"i"\n0\n0\n"i"\n1\n2\n"i"\n2\n4\n3\n'
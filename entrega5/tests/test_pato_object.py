@@ -0,0 +1,105 @@
+import pytest
+
+from entrega3.compiled_program import CompiledProgram
+from entrega5.pato_object import (
+    QUAD,
+    PatoFormatError,
+    dumps,
+    loads,
+    map_object,
+    read_header,
+    read_object,
+    write_object,
+)
+from entrega5.vm import VirtualMachine
+
+
+SOURCE = """
+program p;
+var x: int;
+var f: float;
+float mitad(a: int, b: float) {
+  var c: int;
+  {
+    c = a + 1;
+    return c / b;
+  }
+};
+void saluda() {
+  {
+    print("hola");
+  }
+};
+main {
+  x = 9;
+  f = mitad(x, 2.0);
+  saluda();
+  print(f, x > 3, -x);
+} end
+"""
+
+
+def test_ida_y_vuelta_conserva_el_programa(tmp_path, capsys):
+    program = CompiledProgram.from_source(SOURCE)
+    path = tmp_path / "p.pato"
+    write_object(program, path)
+    loaded = read_object(path)
+
+    assert loaded.quads == program.quads
+    assert loaded.constants == program.constants
+    assert {k: type(v) for k, v in loaded.constants.items()} == {k: type(v) for k, v in program.constants.items()}
+    assert loaded.frames == program.frames
+    assert loaded.functions == program.functions
+
+    VirtualMachine(loaded.quads, constants=loaded.constants, frames=loaded.frames).run()
+    assert capsys.readouterr().out.split() == ['"hola"', "5.0", "True", "-9"]
+
+
+def test_rechaza_archivos_invalidos():
+    data = dumps(CompiledProgram.from_source(SOURCE))
+
+    with pytest.raises(PatoFormatError, match="No es un archivo"):
+        loads(b"NOPE" + data[4:])
+    with pytest.raises(PatoFormatError, match="Versión"):
+        loads(data[:4] + b"\x63\x00" + data[6:])
+    with pytest.raises(PatoFormatError, match="truncado"):
+        loads(data[:-3])
+
+
+def _patch_i32(data: bytes, offset: int, value: int) -> bytes:
+    return data[:offset] + value.to_bytes(4, "little", signed=True) + data[offset + 4:]
+
+
+def test_indices_corruptos_son_error_de_formato(tmp_path):
+    program = CompiledProgram.from_source(SOURCE)
+    data = dumps(program)
+    _, q_off, c_off, _, _, _ = read_header(data)
+
+    # Opcode del primer cuádruplo fuera de OPCODES (y negativo)
+    for code in (99, -5):
+        bad = _patch_i32(data, q_off, code)
+        with pytest.raises(PatoFormatError, match="opcode"):
+            loads(bad)
+        path = tmp_path / "opcode.pato"
+        path.write_bytes(bad)
+        with map_object(path) as image:
+            with pytest.raises(PatoFormatError, match="opcode"):
+                image.quads[0]
+
+    # ERA con índice de función que no existe
+    era = next(i for i, q in enumerate(program.quads) if q[0] == "ERA")
+    bad = _patch_i32(data, q_off + era * QUAD.size + 4, 7)
+    with pytest.raises(PatoFormatError, match="función"):
+        loads(bad)
+
+    # Código de tipo de la primera constante (u32 n, i32 dirección, u8 tipo)
+    type_at = c_off + 8
+    bad = data[:type_at] + b"\x2a" + data[type_at + 1:]
+    with pytest.raises(PatoFormatError, match="tipo de constante"):
+        loads(bad)
+
+
+def test_opcode_desconocido_no_se_puede_codificar():
+    program = CompiledProgram(quads=[("NOP", None, None, None)], constants={})
+    with pytest.raises(PatoFormatError):
+        dumps(program)
@@ -0,0 +1,73 @@
+from entrega2.symbols import MAIN_FRAME
+from entrega3.codegen_visitor import translate
+from entrega5.output import CaptureSink
+from entrega5.profiler import function_of_quads
+from entrega5.vm import ENGINES, VirtualMachine
+
+
+SOURCE = """
+program p;
+var r: int;
+int fib(k: int) {
+  var a, b: int;
+  {
+    if (k < 2) { return k; };
+    a = fib(k - 1);
+    b = fib(k - 2);
+    return a + b;
+  }
+};
+void nunca() {
+  {
+    print(0);
+  }
+};
+main {
+  r = fib(10);
+  print(r);
+} end
+"""
+
+
+def profiled(engine="table"):
+    func_dir, quads = translate(SOURCE)
+    vm = VirtualMachine(
+        quads, constants=func_dir.constants, frames=func_dir.frame_layouts(),
+        engine=engine, output=CaptureSink(), profile=True,
+    )
+    vm.run()
+    return vm, func_dir, quads
+
+
+def test_cuadruplos_asignados_a_su_funcion():
+    func_dir, quads = translate(SOURCE)
+    owners = function_of_quads(quads)
+    fib_start = func_dir.get_function("fib").start_quad
+    assert owners[0] == MAIN_FRAME
+    assert owners[fib_start] == "fib"
+    assert owners[-1] == MAIN_FRAME
+    # nunca() no tiene GOSUB, pero su código no se confunde con main
+    assert owners[func_dir.get_function("nunca").start_quad].startswith("<función")
+
+
+def test_conteos_y_llamadas():
+    for engine in ENGINES:
+        vm, _, quads = profiled(engine)
+        prof = vm.profile
+        assert vm.output.lines() == ["55"]
+        assert prof.func_calls == {MAIN_FRAME: 1, "fib": 177}
+        assert prof.opcode_counts()["GOSUB"] == 177
+        assert prof.opcode_counts()["END"] == 1
+        assert set(prof.func_time_ns) == {MAIN_FRAME, "fib"}
+
+        hot = prof.hot_quads(3)
+        assert all(h.function == "fib" for h in hot)
+        assert hot[0].count >= hot[-1].count
+        assert "fib" in prof.report()
+
+
+def test_sin_profile_no_hay_perfil():
+    func_dir, quads = translate(SOURCE)
+    vm = VirtualMachine(quads, constants=func_dir.constants, output=CaptureSink())
+    vm.run()
+    assert vm.profile is None
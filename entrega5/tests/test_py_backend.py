@@ -0,0 +1,139 @@
+import pytest
+
+from entrega3.codegen_visitor import translate
+from entrega5.py_backend import compile_program
+from entrega5.vm import VirtualMachine
+
+
+def _run_both(source: str, capsys):
+    func_dir, quads = translate(source)
+    VirtualMachine(quads, constants=func_dir.constants).run()
+    expected = capsys.readouterr().out
+
+    program = compile_program(func_dir, quads)
+    program.run()
+    return expected, capsys.readouterr().out, program
+
+
+def test_py_backend_ciclos_y_condiciones(capsys):
+    source = """
+    program p;
+    var i, par: int;
+    var s: float;
+    main {
+      i = 0;
+      par = 0;
+      s = 0.5;
+      while (i < 6) do {
+        if (i > 2) {
+          s = s * 2;
+        } else {
+          par = par + 1;
+        };
+        i = i + 1;
+      };
+      print(s, par, "fin");
+    } end
+    """
+    expected, got, program = _run_both(source, capsys)
+    assert got == expected
+    # El while se reconstruye como ciclo estructurado, no como despacho
+    assert "while" in program.source and "_pc" not in program.source
+
+
+def test_py_backend_recursion(capsys):
+    source = """
+    program p;
+    var r: int;
+    int fib(n: int) {
+      var a, b: int;
+      {
+        if (n < 2) {
+          return n;
+        };
+        a = fib(n - 1);
+        b = fib(n - 2);
+        return a + b;
+      }
+    };
+    main {
+      r = fib(12);
+      print(r);
+    } end
+    """
+    expected, got, program = _run_both(source, capsys)
+    assert got == expected
+    assert got.strip() == "144"
+
+
+def test_py_backend_despacho_por_bloques(capsys):
+    # Un salto hacia atrás que no forma un while: se usa el despacho por bloques
+    quads = [
+        ("GOTO", None, None, 1),
+        ("=", 13000, None, 1000),
+        ("GOTO", None, None, 4),
+        ("PRINT", 1000, None, None),
+        ("+", 1000, 13000, 1000),
+        ("<", 1000, 13001, 8000),
+        ("GOTOF", 8000, None, 8),
+        ("GOTO", None, None, 3),
+        ("END", None, None, None),
+    ]
+
+    class _Dir:
+        constants = {13000: 1, 13001: 3}
+
+        @staticmethod
+        def all_functions():
+            return {}
+
+    VirtualMachine(quads, constants=_Dir.constants).run()
+    expected = capsys.readouterr().out
+
+    program = compile_program(_Dir(), quads)
+    assert "_pc" in program.source
+    program.run()
+    assert capsys.readouterr().out == expected == "2\n"
+
+
+def test_py_backend_lectura_no_inicializada():
+    class _Dir:
+        constants = {13000: 1}
+
+        @staticmethod
+        def all_functions():
+            return {}
+
+    quads = [("+", 1000, 13000, 1001), ("END", None, None, None)]
+    with pytest.raises(RuntimeError, match="no inicializada"):
+        compile_program(_Dir(), quads).run()
+
+
+def test_py_backend_recursion_profunda_es_runtime_error(capsys):
+    source = """
+    program p;
+    var r: int;
+    int cuenta(k: int) {
+      var a: int;
+      {
+        if (k < 1) {
+          return 0;
+        };
+        a = cuenta(k - 1);
+        return a + 1;
+      }
+    };
+    main {
+      r = cuenta(3000);
+      print(r);
+    } end
+    """
+    func_dir, quads = translate(source)
+    # La VM no usa la pila de Python para las llamadas
+    VirtualMachine(quads, constants=func_dir.constants, frames=func_dir.frame_layouts()).run()
+    assert capsys.readouterr().out == "3000\n"
+
+    with pytest.raises(RuntimeError, match="Recursión demasiado profunda") as info:
+        compile_program(func_dir, quads).run()
+    assert not isinstance(info.value, RecursionError)
+    assert info.value.__cause__ is None
@@ -0,0 +1,117 @@
+import pytest
+
+from entrega3.codegen_visitor import translate
+from entrega5.limits import ExecutionLimits
+from entrega5.output import CaptureSink
+from entrega5.superinstructions import KINDS
+from entrega5.vm import VirtualMachine
+
+
+PROGRAMA = """
+program p;
+var i, s: int;
+int suma(a: int, b: int) {
+  {
+    return a + b;
+  }
+};
+main {
+  i = 0;
+  s = 0;
+  while (i < 10) do {
+    s = s + i * 2;
+    if (s > 20) {
+      print(s);
+    };
+    s = suma(s, 1);
+    i = i + 1;
+  };
+  print(s);
+} end
+"""
+
+
+def _run(source, **kwargs):
+    func_dir, quads = translate(source)
+    sink = CaptureSink()
+    vm = VirtualMachine(quads, constants=func_dir.constants, frames=func_dir.frame_layouts(), output=sink, **kwargs)
+    vm.run()
+    return vm, sink.text
+
+
+def test_fusion_misma_salida_que_sin_fusionar():
+    _, plain = _run(PROGRAMA)
+    vm, fused = _run(PROGRAMA, fuse=True)
+    assert fused == plain
+    assert vm.fusion is not None
+
+
+def test_estadisticas_por_patron():
+    vm, _ = _run(PROGRAMA, fuse=True)
+    stats = vm.fusion
+    # i < 10 y s > 20
+    assert stats.fused["compare_branch"] == 2
+    # a + b -> return, s + i*2 -> s, i + 1 -> i (i*2 no: lo consume el +)
+    assert stats.fused["op_store"] == 3
+    assert stats.fused["call"] == 1
+    # 2 por patrón binario + ERA, 2 PARAM, GOSUB
+    assert stats.quads_fused == 2 * 5 + 4
+    assert stats.superinstructions == 6
+    assert stats.dispatches_saved == 8
+    assert stats.total_quads == len(vm.quads)
+    assert all(kind in stats.report() for kind in KINDS)
+
+
+def test_llamada_con_argumentos_calculados_no_se_fusiona():
+    source = PROGRAMA.replace("suma(s, 1)", "suma(s, i + 1)")
+    _, plain = _run(source)
+    vm, fused = _run(source, fuse=True)
+    assert fused == plain
+    assert vm.fusion.fused["call"] == 0
+
+
+def test_salto_a_medio_patron_sigue_funcionando():
+    # El GOTO cae en el "=" de un op-and-store: ese cuádruplo sigue ligado
+    quads = [
+        ("=", 13000, None, 8000),
+        ("GOTO", None, None, 3),
+        ("+", 13000, 13000, 8000),
+        ("=", 8000, None, 1000),
+        ("PRINT", 1000, None, 1),
+        ("END", None, None, None),
+    ]
+    sink = CaptureSink()
+    vm = VirtualMachine(quads, constants={13000: 5}, output=sink, fuse=True)
+    assert vm.fusion.fused["op_store"] == 1
+    assert len(vm.program) == len(quads)
+    assert vm.program[3][0] == vm._op_assign
+    vm.run()
+    assert sink.text == "5\n"
+
+
+def test_con_limites_no_se_fusionan_llamadas():
+    vm, plain = _run(PROGRAMA, fuse=True, limits=ExecutionLimits(max_call_depth=5))
+    assert vm.fusion.fused["call"] == 0
+    assert plain == _run(PROGRAMA)[1]
+
+
+def test_fuse_solo_con_motor_table_ligado():
+    func_dir, quads = translate(PROGRAMA)
+    for kwargs in ({"engine": "closure"}, {"engine": "chain"}, {"lazy_link": True}, {"profile": True}, {"debug": True}):
+        with pytest.raises(ValueError):
+            VirtualMachine(quads, constants=func_dir.constants, fuse=True, **kwargs)
+
+
+def test_no_inicializada_reporta_ip_del_cuadruplo_original():
+    source = """
+    program p;
+    var x, y: int;
+    main {
+      y = x + 1;
+    } end
+    """
+    func_dir, quads = translate(source)
+    vm = VirtualMachine(quads, constants=func_dir.constants, output=CaptureSink(), fuse=True)
+    add = [q[0] for q in quads].index("+")
+    with pytest.raises(RuntimeError, match=f"IP={add}"):
+        vm.run()
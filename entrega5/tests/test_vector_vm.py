@@ -0,0 +1,110 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from entrega3.codegen_visitor import translate  # noqa: E402
+from entrega5.output import CaptureSink  # noqa: E402
+from entrega5.vector_vm import VectorVM  # noqa: E402
+from entrega5.vm import VirtualMachine  # noqa: E402
+
+
+SOURCE = """
+program sweep;
+var x, pasos, f, r: int;
+var mitad: float;
+int fib(k: int) {
+  var a, b: int;
+  {
+    if (k < 2) { return k; };
+    a = fib(k - 1);
+    b = fib(k - 2);
+    return a + b;
+  }
+};
+main {
+  pasos = 0;
+  r = x;
+  while (r > 1) do {
+    if (r > 10) {
+      r = r - 3;
+    } else {
+      r = r - 1;
+    };
+    pasos = pasos + 1;
+  };
+  mitad = x / 2;
+  f = fib(x);
+  print("x", x, pasos, f, mitad > 3.0, mitad);
+} end
+"""
+
+
+def scalar_run(func_dir, quads, x_addr, x):
+    vm = VirtualMachine(quads, constants=func_dir.constants, frames=func_dir.frame_layouts(), output=CaptureSink())
+    vm.global_mem.set(x_addr, x)
+    vm.run()
+    return vm
+
+
+def test_cada_lane_coincide_con_la_vm_normal():
+    func_dir, quads = translate(SOURCE)
+    addr = {name: info.address for name, info in func_dir.all_globals().items()}
+    xs = [1, 2, 3, 6, 7, 9, 12, 15]
+
+    vec = VectorVM(quads, constants=func_dir.constants, inputs={addr["x"]: xs})
+    vec.run()
+
+    for lane, x in enumerate(xs):
+        vm = scalar_run(func_dir, quads, addr["x"], x)
+        assert vec.output(lane) == vm.output.text
+        for name in ("pasos", "f", "r"):
+            assert vec.global_values(addr[name])[lane] == vm.global_mem.get(addr[name])
+
+    # Hubo divergencia y los grupos se volvieron a juntar
+    assert vec.splits > 0 and vec.merges > 0
+
+
+def test_sin_divergencia_un_solo_grupo():
+    func_dir, quads = translate("program p; var x, y: int; main { y = x * x + 1; print(y); } end")
+    x = func_dir.all_globals()["x"].address
+    vec = VectorVM(quads, constants=func_dir.constants, inputs={x: np.arange(1000)})
+    vec.run()
+    assert vec.splits == 0
+    assert vec.global_values(func_dir.all_globals()["y"].address).tolist() == [i * i + 1 for i in range(1000)]
+    assert vec.output(999) == "998002\n"
+
+
+def test_division_entre_cero_solo_detiene_sus_lanes():
+    source = """
+    program p;
+    var x: int;
+    var y: float;
+    main {
+      print("antes");
+      y = 10 / x;
+      print(y);
+    } end
+    """
+    func_dir, quads = translate(source)
+    globals_ = func_dir.all_globals()
+    vec = VectorVM(quads, constants=func_dir.constants, inputs={globals_["x"].address: [1, 0, 4, 0]})
+    vec.run()
+
+    assert sorted(vec.errors) == [1, 3]
+    assert "división entre cero" in vec.errors[1]
+    assert vec.output(0) == '"antes"\n10.0\n'
+    assert vec.output(1) == '"antes"\n'
+    assert vec.output(2) == '"antes"\n2.5\n'
+    y = vec.global_values(globals_["y"].address)
+    assert y[0] == 10.0 and y[2] == 2.5
+
+
+def test_errores():
+    func_dir, quads = translate("program p; var x: int; var y: float; main { y = 10 / x; } end")
+    x = func_dir.all_globals()["x"].address
+    # Todos los lanes fallan: termina sin excepción y cada uno tiene su error
+    vec = VectorVM(quads, constants=func_dir.constants, inputs={x: [0, 0]})
+    vec.run()
+    assert sorted(vec.errors) == [0, 1]
+    with pytest.raises(ValueError):
+        VectorVM(quads, constants=func_dir.constants)
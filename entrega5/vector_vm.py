@@ -0,0 +1,314 @@
+# entrega5/vector_vm.py
+#
+# VM vectorizada: ejecuta el mismo programa para N entradas a la vez.
+#
+# Cada celda de memoria (global, local o temporal) es un arreglo de NumPy de
+# largo N, una posición ("lane") por instancia. Los cuádruplos aritméticos y
+# relacionales se vuelven operaciones sobre arreglos y las constantes se
+# quedan como escalares (NumPy las extiende solo).
+#
+# Los lanes que van juntos forman un grupo: (ip, índices de lanes, pila de
+# frames). Cuando un GOTOF no va igual para todos los lanes del grupo, el
+# grupo se parte en dos (los que siguen y los que saltan). Siempre se ejecuta
+# el grupo más profundo en la pila y, a igual profundidad, el de menor ip;
+# cuando dos grupos quedan en el mismo ip con la misma pila se vuelven a
+# juntar. Así un if/else o un while con lanes divergentes se reagrupa en
+# cuanto todos salen del bloque.
+#
+# Los frames de función también tienen celdas de largo N; dos grupos que se
+# partieron dentro de la misma llamada comparten el frame y cada uno escribe
+# solo sus lanes.
+#
+# Diferencias con VirtualMachine: los int son int64 (sin enteros grandes) y
+# una celda no inicializada solo se detecta si ningún lane la ha escrito.
+#
+# Una división entre cero solo detiene a los lanes que dividen entre cero:
+# se quitan de su grupo, su error queda en ``errors[lane]`` y los demás
+# siguen. La salida y las globales de un lane con error se quedan como
+# estaban al fallar. Cualquier otro error de ejecución detiene a todos.
+#
+# Requiere NumPy (dependencia opcional del proyecto).
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - depende del entorno
+    raise ImportError("entrega5.vector_vm necesita NumPy: pip install numpy") from e
+
+from entrega3.codegen_visitor import Quad
+from entrega4.virtual_memory import locate
+
+# (segmento, tipo, offset) por dirección; se consulta en cada lectura
+_locate = lru_cache(maxsize=None)(locate)
+
+_DTYPES = {"int": np.int64, "float": np.float64, "bool": np.bool_, "string": object}
+
+_BINARY: Dict[str, Callable[[Any, Any], Any]] = {
+    "+": np.add,
+    "-": np.subtract,
+    "*": np.multiply,
+    "/": np.true_divide,
+    ">": np.greater,
+    "<": np.less,
+    ">=": np.greater_equal,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+
+@dataclass(eq=False)
+class _Frame:
+    """Celdas LOCAL/TEMP de una llamada (o de main, al fondo de la pila)."""
+    name: Optional[str]
+    cells: Dict[int, Any] = field(default_factory=dict)
+    return_ip: Optional[int] = None
+
+
+@dataclass(eq=False)
+class _Group:
+    ip: int
+    lanes: Any  # np.ndarray de índices de lane, ordenado
+    stack: List[_Frame]
+    pending: Optional[_Frame] = None
+    done: bool = False
+
+    def same_context(self, other: _Group) -> bool:
+        return (
+            self.ip == other.ip
+            and self.pending is None
+            and other.pending is None
+            and len(self.stack) == len(other.stack)
+            and all(a is b for a, b in zip(self.stack, other.stack))
+        )
+
+
+class VectorVM:
+    """
+    Ejecuta ``quads`` para ``n`` instancias independientes.
+
+    - ``inputs``: {dirección global: valores (uno por lane)} con que arranca
+      cada instancia; cualquier otra global empieza sin inicializar
+    - ``run()``: ejecuta todos los lanes hasta END
+    - ``global_values(addr)``: arreglo con el valor final por lane
+    - ``output(lane)``: lo que imprimió esa instancia (igual que la VM normal)
+    - ``splits`` / ``merges``: cuántas veces se partieron y juntaron grupos
+    - ``errors``: {lane: mensaje} de los lanes que terminaron con error
+    """
+
+    def __init__(
+        self,
+        quads: Sequence[Quad],
+        constants: Optional[Mapping[int, Any]] = None,
+        inputs: Optional[Mapping[int, Sequence[Any]]] = None,
+        n: Optional[int] = None,
+    ) -> None:
+        inputs = dict(inputs or {})
+        if n is None:
+            if not inputs:
+                raise ValueError("Sin inputs hay que indicar n (número de instancias)")
+            n = len(next(iter(inputs.values())))
+        self.n = n
+        self.quads = list(quads)
+        self.constants: Dict[int, Any] = dict(constants or {})
+
+        self.globals: Dict[int, Any] = {}
+        for addr, values in inputs.items():
+            cell = self._new_cell(addr)
+            values = np.asarray(values)
+            if values.shape != (n,):
+                raise ValueError(f"Input de {addr} con forma {values.shape}, se esperaba ({n},)")
+            cell[:] = values
+            self.globals[addr] = cell
+
+        self._outputs: List[List[str]] = [[] for _ in range(n)]
+        self._groups: List[_Group] = [_Group(0, np.arange(n), [_Frame(None)])]
+        self.splits = 0
+        self.merges = 0
+        self.errors: Dict[int, str] = {}
+
+        self._dispatch: Dict[str, Callable[[_Group, Quad], None]] = {
+            "=": self._op_assign,
+            "PRINT": self._op_print,
+            "GOTO": self._op_goto,
+            "GOTOF": self._op_gotof,
+            "ERA": self._op_era,
+            "PARAM": self._op_param,
+            "GOSUB": self._op_gosub,
+            "RETURN": self._op_return,
+            "ENDFUNC": self._op_return,
+            "END": self._op_end,
+        }
+        for op in _BINARY:
+            self._dispatch[op] = self._op_binary
+
+    # ----------------- Memoria ----------------- #
+
+    def _new_cell(self, addr: int) -> Any:
+        _, type_, _ = _locate(addr)
+        return np.zeros(self.n, dtype=_DTYPES[type_])
+
+    def _space(self, g: _Group, addr: int) -> Dict[int, Any]:
+        seg, _, _ = _locate(addr)
+        if seg == "global":
+            return self.globals
+        if seg == "local" and len(g.stack) == 1:
+            raise RuntimeError(f"Acceso a dirección local {addr} sin función activa")
+        return g.stack[-1].cells
+
+    def _read(self, g: _Group, addr: int) -> Any:
+        """Valores de ``addr`` para los lanes del grupo (escalar si es constante)."""
+        if addr in self.constants:
+            return self.constants[addr]
+        cell = self._space(g, addr).get(addr)
+        if cell is None:
+            raise RuntimeError(f"Acceso a dirección no inicializada: {addr}")
+        return cell[g.lanes]
+
+    def _write(self, g: _Group, addr: int, values: Any, frame: Optional[_Frame] = None) -> None:
+        space = frame.cells if frame is not None else self._space(g, addr)
+        cell = space.get(addr)
+        if cell is None:
+            cell = space[addr] = self._new_cell(addr)
+        cell[g.lanes] = values
+
+    def global_values(self, addr: int) -> Any:
+        cell = self.globals.get(addr)
+        if cell is None:
+            raise RuntimeError(f"Global sin inicializar: {addr}")
+        return cell
+
+    def output(self, lane: int) -> str:
+        return "".join(line + "\n" for line in self._outputs[lane])
+
+    # ----------------- Ejecución ----------------- #
+
+    def run(self) -> None:
+        groups = self._groups
+        while True:
+            live = [g for g in groups if not g.done]
+            if not live:
+                break
+            g = min(live, key=lambda x: (-len(x.stack), x.ip))
+            if not 0 <= g.ip < len(self.quads):
+                g.done = True
+                continue
+            quad = self.quads[g.ip]
+            self._dispatch.get(quad[0], self._op_unknown)(g, quad)
+            if quad[0] in ("GOTO", "GOTOF", "RETURN", "ENDFUNC"):
+                self._merge(g)
+
+    def _merge(self, g: _Group) -> None:
+        for other in self._groups:
+            if other is not g and not other.done and other.same_context(g):
+                g.lanes = np.union1d(g.lanes, other.lanes)
+                other.done = True
+                other.lanes = other.lanes[:0]
+                self._groups.remove(other)
+                self.merges += 1
+                return
+
+    # ----------------- Opcodes ----------------- #
+
+    def _op_binary(self, g: _Group, quad: Quad) -> None:
+        op, left, right, res = quad
+        a = self._read(g, left)  # type: ignore[arg-type]
+        if op == "-" and right is None:
+            self._write(g, res, np.negative(a))  # type: ignore[arg-type]
+        else:
+            b = self._read(g, right)  # type: ignore[arg-type]
+            if op == "/":
+                zero = np.broadcast_to(np.asarray(b) == 0, g.lanes.shape)
+                if zero.any():
+                    a, b = self._drop_lanes(g, zero, f"división entre cero en IP={g.ip}", a, b)
+                    if g.done:
+                        return
+            self._write(g, res, _BINARY[op](a, b))  # type: ignore[arg-type]
+        g.ip += 1
+
+    def _drop_lanes(self, g: _Group, failed: Any, message: str, *values: Any) -> List[Any]:
+        """
+        Saca del grupo los lanes marcados en ``failed`` y les registra el
+        error. Regresa ``values`` (operandos ya leídos) solo para los lanes
+        que siguen; si no queda ninguno el grupo termina.
+        """
+        for lane in g.lanes[failed].tolist():
+            self.errors[lane] = message
+        keep = ~failed
+        g.lanes = g.lanes[keep]
+        if not g.lanes.size:
+            g.done = True
+        return [v[keep] if isinstance(v, np.ndarray) else v for v in values]
+
+    def _op_assign(self, g: _Group, quad: Quad) -> None:
+        _, left, _, res = quad
+        self._write(g, res, self._read(g, left))  # type: ignore[arg-type]
+        g.ip += 1
+
+    def _op_print(self, g: _Group, quad: Quad) -> None:
+        values = self._read(g, quad[1])  # type: ignore[arg-type]
+        lanes = g.lanes.tolist()
+        if isinstance(values, np.ndarray):
+            for lane, value in zip(lanes, values.tolist()):
+                self._outputs[lane].append(str(value))
+        else:
+            text = str(values)
+            for lane in lanes:
+                self._outputs[lane].append(text)
+        g.ip += 1
+
+    def _op_goto(self, g: _Group, quad: Quad) -> None:
+        g.ip = int(quad[3])  # type: ignore[arg-type]
+
+    def _op_gotof(self, g: _Group, quad: Quad) -> None:
+        cond = np.broadcast_to(np.asarray(self._read(g, quad[1]), dtype=bool), g.lanes.shape)  # type: ignore[arg-type]
+        target = int(quad[3])  # type: ignore[arg-type]
+        if cond.all():
+            g.ip += 1
+        elif not cond.any():
+            g.ip = target
+        else:
+            # Lanes divergentes: los que saltan forman un grupo nuevo
+            jumping = _Group(target, g.lanes[~cond], list(g.stack), g.pending)
+            g.lanes = g.lanes[cond]
+            g.ip += 1
+            self._groups.append(jumping)
+            self.splits += 1
+
+    def _op_era(self, g: _Group, quad: Quad) -> None:
+        g.pending = _Frame(str(quad[1]))
+        g.ip += 1
+
+    def _op_param(self, g: _Group, quad: Quad) -> None:
+        if g.pending is None:
+            raise RuntimeError("PARAM sin ERA previo")
+        _, left, _, res = quad
+        self._write(g, res, self._read(g, left), frame=g.pending)  # type: ignore[arg-type]
+        g.ip += 1
+
+    def _op_gosub(self, g: _Group, quad: Quad) -> None:
+        frame = g.pending
+        if frame is None:
+            raise RuntimeError("GOSUB sin ERA/PARAM previos")
+        frame.return_ip = g.ip + 1
+        g.stack = g.stack + [frame]
+        g.pending = None
+        g.ip = int(quad[3])  # type: ignore[arg-type]
+
+    def _op_return(self, g: _Group, quad: Quad) -> None:
+        if len(g.stack) == 1:
+            raise RuntimeError("RETURN/ENDFUNC sin frame activo")
+        frame = g.stack[-1]
+        g.stack = g.stack[:-1]
+        g.ip = frame.return_ip  # type: ignore[assignment]
+
+    def _op_end(self, g: _Group, quad: Quad) -> None:
+        g.done = True
+
+    def _op_unknown(self, g: _Group, quad: Quad) -> None:
+        raise RuntimeError(f"Opcode desconocido: {quad[0]}")
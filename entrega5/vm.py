@@ -1,9 +1,27 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from entrega3.codegen_visitor import Quad
+from entrega3.codegen_visitor import PRINT_EOL, Quad
+from entrega2.symbols import MAIN_FRAME, FrameLayout
+from entrega4.virtual_memory import SEGMENT_BOUNDS
+from entrega5.output import DEFAULT_FLUSH_SIZE, BufferedSink, OutputSink
+from entrega5.hooks import (
+    CallEvent,
+    InstructionEvent,
+    ReturnEvent,
+    TraceHook,
+    VMHook,
+    WriteEvent,
+    listeners,
+)
+from entrega5.limits import CLOCK_EVERY, ExecutionLimitExceeded, ExecutionLimits
+from entrega5.profiler import Profile
+
+if TYPE_CHECKING:
+    from entrega5.superinstructions import FusionStats
 
 # Rangos de direcciones virtuales, deben coincidir con virtual_memory.py
 GLOBAL_MIN, GLOBAL_MAX = 1000, 2999
@@ -11,25 +29,130 @@ LOCAL_MIN, LOCAL_MAX = 3000, 4999
 TEMP_MIN, TEMP_MAX = 8000, 9999
 CONST_MIN, CONST_MAX = 13000, 14999
 
+# Motores de ejecución disponibles:
+#   - "table":   despacho por tabla (opcode -> handler), es el default
+#   - "closure": cada cuádruplo compilado a una closure (closure_backend.py)
+#   - "chain":   cadena if/elif original, se conserva como referencia
+ENGINES = ("table", "closure", "chain")
+
+# IP especial que regresa un handler para detener la ejecución
+_HALT = -1
+
+# Opcodes que escriben su RESULT (eventos on_write de los hooks)
+WRITE_OPS = frozenset({"+", "-", "*", "/", ">", "<", ">=", "<=", "==", "!=", "=", "PARAM"})
+
+# Segmentos en el orden en que se numeran los bancos de memoria
+SEGMENTS = ("const", "global", "local", "temp")
+SEG_CONST, SEG_GLOBAL, SEG_LOCAL, SEG_TEMP = range(len(SEGMENTS))
+
+# Tipos con slots propios dentro de cada segmento
+TYPES = ("int", "float", "bool", "string")
+
+# Cada (segmento, tipo) es un banco: banco = segmento * len(TYPES) + tipo
+FIRST_LOCAL_BANK = SEG_LOCAL * len(TYPES)
+FIRST_TEMP_BANK = SEG_TEMP * len(TYPES)
+
+# Marca de celda sin inicializar dentro de los slots
+_UNSET = object()
+
+# Máximo de frames libres que se guardan por función para reciclar
+FRAME_POOL_LIMIT = 256
+
+# Instrucción pre-decodificada del motor "table":
+#   (handler, lb, lo, rb, ro, db, do)
+# donde (lb, lo) / (rb, ro) son banco y offset de los operandos y (db, do)
+# el destino. En saltos `do` es el índice destino; en ERA/GOSUB `lb` es el
+# nombre de la función. Los campos que no aplican van en None.
+LinkedInstr = Tuple[Any, ...]
+
+# Firma de los handlers del motor "table": (ip, instrucción) -> siguiente ip
+Handler = Callable[[int, LinkedInstr], int]
+
+# (base, límite, banco) de cada rango tipado, para decode_address
+_BANK_RANGES: List[Tuple[int, int, int]] = [
+    (base, limit, seg * len(TYPES) + t)
+    for seg, seg_name in enumerate(SEGMENTS)
+    for t, (base, limit) in enumerate(SEGMENT_BOUNDS[seg_name][type_] for type_ in TYPES)
+]
+
+
+def decode_address(addr: int) -> Tuple[int, int]:
+    """
+    Traduce una dirección virtual a (banco, offset dentro del rango del tipo).
+    Se usa una sola vez por operando, al momento de ligar el programa.
+    """
+    for base, limit, bank in _BANK_RANGES:
+        if base <= addr <= limit:
+            return bank, addr - base
+    raise RuntimeError(f"Dirección fuera de rango: {addr}")
+
 
-@dataclass
 class MemorySpace:
     """
-    Representa un espacio de memoria simple:
-    dirección virtual -> valor en tiempo de ejecución.
+    Espacio de memoria de un segmento (global, local, temp o const).
+
+    Guarda una lista contigua de slots por tipo, indexada por
+    ``dirección - base`` del tipo (los rangos salen de SEGMENT_BOUNDS en
+    virtual_memory.py). Las celdas sin escribir contienen ``_UNSET``.
     """
-    values: Dict[int, Any] = field(default_factory=dict)
+
+    __slots__ = ("segment", "_bounds", "slots")
+
+    def __init__(self, segment: str, sizes: Optional[List[int]] = None) -> None:
+        self.segment = segment
+        self._bounds = [SEGMENT_BOUNDS[segment][type_] for type_ in TYPES]
+        self.slots: List[List[Any]] = [[_UNSET] * n for n in (sizes or [0] * len(TYPES))]
+
+    def _locate(self, addr: int) -> Tuple[int, int]:
+        for t, (base, limit) in enumerate(self._bounds):
+            if base <= addr <= limit:
+                return t, addr - base
+        raise RuntimeError(f"Dirección {addr} fuera del segmento {self.segment}")
 
     def get(self, addr: int) -> Any:
-        if addr not in self.values:
+        t, offset = self._locate(addr)
+        slots = self.slots[t]
+        if offset >= len(slots) or slots[offset] is _UNSET:
             raise RuntimeError(f"Acceso a dirección no inicializada: {addr}")
-        return self.values[addr]
+        return slots[offset]
 
     def set(self, addr: int, value: Any) -> None:
-        self.values[addr] = value
+        t, offset = self._locate(addr)
+        slots = self.slots[t]
+        if offset >= len(slots):
+            # Crece dentro de los límites del segmento
+            slots.extend([_UNSET] * (offset + 1 - len(slots)))
+        slots[offset] = value
+
+    def clear(self) -> None:
+        """Marca todas las celdas como no inicializadas (sin soltar las listas)."""
+        for slots in self.slots:
+            if slots:
+                slots[:] = [_UNSET] * len(slots)
+
+
+class _NoFrameSlots(list):
+    """
+    Slots de locales cuando no hay función activa: cualquier acceso
+    es un error explícito (igual que en _space_for_address).
+    """
+
+    def __getitem__(self, offset: int) -> Any:
+        raise RuntimeError("Acceso a dirección local sin función activa")
+
+    def __setitem__(self, offset: int, value: Any) -> None:
+        raise RuntimeError("Acceso a dirección local sin función activa")
+
 
+_NO_FRAME_LOCALS = [_NoFrameSlots() for _ in TYPES]
 
-@dataclass
+
+def _slot_counts(per_type: Dict[str, int]) -> List[int]:
+    """{tipo: slots} de un FrameLayout -> lista en el orden de TYPES."""
+    return [per_type.get(type_, 0) for type_ in TYPES]
+
+
+@dataclass(slots=True)
 class ActivationRecord:
     """
     Activation Record para una llamada a función.
@@ -38,9 +161,12 @@ class ActivationRecord:
     - temps:   direcciones del segmento TEMP  (8000–9999)
     - return_ip: índice de cuádruplo al que se debe regresar
     - func_name: nombre de la función (opcional, útil para debug)
+
+    Los frames se reciclan (ver VirtualMachine._release_frame), por eso
+    usan __slots__ y no se guardan referencias a ellos fuera de la VM.
     """
-    locals: MemorySpace = field(default_factory=MemorySpace)
-    temps: MemorySpace = field(default_factory=MemorySpace)
+    locals: MemorySpace = field(default_factory=lambda: MemorySpace("local"))
+    temps: MemorySpace = field(default_factory=lambda: MemorySpace("temp"))
     return_ip: Optional[int] = None
     func_name: Optional[str] = None
 
@@ -61,6 +187,58 @@ class VirtualMachine:
         - Control de flujo: GOTO, GOTOF
         - Llamadas a función: ERA, PARAM, GOSUB, RETURN, ENDFUNC
         - Final de programa: END
+
+    El parámetro ``engine`` selecciona cómo se decodifica cada cuádruplo:
+    ``"table"`` (default) busca el handler del opcode en un diccionario una
+    sola vez por instrucción; ``"closure"`` compila cada cuádruplo a una
+    closure especializada (ver closure_backend.py); ``"chain"`` usa la
+    cadena if/elif original.
+
+    Para el motor "table" los cuádruplos se ligan al cargar la VM (ver
+    ``_link``): cada operando queda resuelto a (banco, offset), así el
+    ciclo principal no hace comparaciones de rango por operando. El mismo
+    recorrido mide cuántos slots de cada banco usa el programa para
+    dimensionar las listas de memoria desde el inicio.
+
+    Si se pasa ``frames`` (``func_dir.frame_layouts()``), ERA reserva para
+    cada función un frame con exactamente los slots que el compilador
+    registró en su FrameLayout, y los temporales de main se dimensionan con
+    el layout MAIN_FRAME.
+
+    Con ``lazy_link=True`` (motor "table") no se liga nada al cargar: cada
+    cuádruplo se liga la primera vez que se ejecuta (requiere ``frames``,
+    que dan el tamaño de cada frame sin recorrer el programa). Así arranca de
+    inmediato un programa enorme del que solo corre una parte, por ejemplo
+    uno cargado con ``VirtualMachine.from_object`` desde un .pato mapeado.
+
+    PRINT no escribe directo a stdout: cada print(...) se junta en un solo
+    registro (un valor por línea) y se manda a ``output`` (ver output.py);
+    por default un BufferedSink sobre sys.stdout que se vacía al terminar.
+
+    ``hooks`` recibe objetos VMHook (ver hooks.py) que reciben eventos antes
+    de cada instrucción, en GOSUB, en RETURN/ENDFUNC y en cada escritura;
+    ``debug=True`` equivale a agregar un TraceHook. Sin hooks los ciclos
+    de ejecución no hacen ninguna revisión extra por instrucción.
+
+    ``limits`` (ExecutionLimits, ver limits.py) acota instrucciones,
+    profundidad de llamadas y tiempo; se revisa solo en GOTO hacia atrás,
+    GOSUB, RETURN/ENDFUNC y END, y al rebasarse se lanza
+    ExecutionLimitExceeded con el IP y la pila de llamadas.
+
+    Con ``fuse=True`` (motor "table") los patrones más comunes del
+    generador de código (relacional + GOTOF, operación + "=", y
+    ERA/PARAM*/GOSUB) se ejecutan como una sola superinstrucción (ver
+    superinstructions.py); ``vm.fusion`` dice cuántos cuádruplos se
+    fusionaron.
+
+    Con ``profile=True`` la VM llena ``vm.profile`` (ver profiler.py):
+    ejecuciones por cuádruplo y por opcode, y tiempo propio y llamadas por
+    función. ``vm.profile.report()`` lo resume.
+
+    Los frames que regresan con RETURN/ENDFUNC se limpian y se guardan en
+    una lista libre por función; el siguiente ERA de esa función los reusa.
+    ``pool_hits`` / ``pool_misses`` cuentan cuántos ERA reciclaron un frame
+    y cuántos tuvieron que crear uno nuevo.
     """
 
     def __init__(
@@ -68,19 +246,93 @@ class VirtualMachine:
         quads: List[Quad],
         constants: Optional[Dict[int, Any]] = None,
         debug: bool = False,
+        engine: str = "table",
+        frames: Optional[Dict[str, FrameLayout]] = None,
+        lazy_link: bool = False,
+        output: Optional[OutputSink] = None,
+        profile: bool = False,
+        hooks: Sequence[VMHook] = (),
+        limits: Optional[ExecutionLimits] = None,
+        fuse: bool = False,
     ) -> None:
-        self.quads: List[Quad] = quads
+        if engine not in ENGINES:
+            raise ValueError(f"Motor de ejecución desconocido: {engine!r} (opciones: {ENGINES})")
+        if lazy_link and engine == "table" and not frames:
+            # Sin layouts cada ERA tendría que reservar los rangos completos
+            # de cada tipo (y limpiarlos en cada RETURN)
+            raise ValueError("lazy_link necesita frames (func_dir.frame_layouts() o los del .pato)")
+        if fuse and (engine != "table" or lazy_link or profile or hooks or debug):
+            raise ValueError("fuse solo aplica al motor 'table' ya ligado, sin profile, hooks ni debug")
+
+        # debug es un hook más: la traza de siempre, como TraceHook
+        hooks = list(hooks) + ([TraceHook()] if debug else [])
+        if hooks and profile:
+            raise ValueError("profile no se puede combinar con hooks ni con debug")
+
+        self.quads: Sequence[Quad] = quads
         self.ip: int = 0  # instruction pointer
+        self.image: Optional[Any] = None  # MappedProgram si viene de from_object
         self.debug: bool = debug
+        self.engine: str = engine
+
+        # Canal de salida de PRINT (ver output.py). Con debug se escribe cada
+        # print(...) de inmediato para que quede intercalado con la traza.
+        if output is None:
+            output = BufferedSink(flush_size=0 if debug else DEFAULT_FLUSH_SIZE)
+        self.output: OutputSink = output
+        # Valores del print(...) en curso, hasta su PRINT con PRINT_EOL
+        self._print_line: List[str] = []
+
+        # Perfil de ejecución (ver profiler.py); se llena en run()
+        self.profile: Optional[Profile] = Profile(quads, [0] * len(quads)) if profile else None
+        self.hooks: List[VMHook] = hooks
+
+        # Límites de ejecución (ver limits.py). Sin límites se ligan los
+        # handlers normales y no se revisa nada.
+        self.limits: Optional[ExecutionLimits] = limits
+        self.instructions_charged: int = 0
+        self._segment_start: int = 0
+        self._trip: float = 0  # la primera revisión fija el umbral real
+        self._started: float = 0.0
+
+        # Slots usados por banco (los llena _link); sin ligar, las listas crecen
+        self._bank_sizes: List[int] = [0] * (len(SEGMENTS) * len(TYPES))
+        self.program: List[LinkedInstr] = []
+
+        # Tabla de despacho opcode -> handler (motor "table")
+        self._dispatch: Dict[str, Handler] = self._build_dispatch()
+
+        # Programa pre-decodificado (lo usan los motores "table" y "closure").
+        # Con lazy_link el motor "table" liga cada cuádruplo la primera vez
+        # que se ejecuta; como no se recorre el programa para medir bancos,
+        # globales y constantes reservan los rangos completos de cada tipo
+        # (una sola vez) y los frames salen de los layouts de ``frames``.
+        self.lazy_link: bool = lazy_link and engine == "table"
+        if self.lazy_link:
+            self._bank_sizes = [limit - base + 1 for base, limit, _ in _BANK_RANGES]
+            self.program = [(self._op_link,)] * len(quads)
+        elif engine != "chain" or profile or hooks:
+            self.program = self._link(quads)
 
         # Memoria global (segmento 1000–2999)
-        self.global_mem = MemorySpace()
+        self.global_mem = MemorySpace("global", self._sizes_for(SEG_GLOBAL))
 
         # Memoria de constantes (segmento 13000–14999)
-        self.const_mem = MemorySpace(constants.copy() if constants else {})
+        self.const_mem = MemorySpace("const", self._sizes_for(SEG_CONST))
+        for addr, value in (constants or {}).items():
+            self.const_mem.set(addr, value)
+
+        # Tamaños con los que ERA crea cada frame: por función si el
+        # compilador mandó layouts, si no los medidos al ligar
+        self._default_frame_sizes = (self._sizes_for(SEG_LOCAL), self._sizes_for(SEG_TEMP))
+        self._frame_sizes: Dict[str, Tuple[List[int], List[int]]] = {
+            name: (_slot_counts(layout.local_slots), _slot_counts(layout.temp_slots))
+            for name, layout in (frames or {}).items()
+        }
 
         # Memoria temporal cuando NO hay función activa (por ejemplo en main)
-        self._global_temps = MemorySpace()
+        main_sizes = self._frame_sizes.get(MAIN_FRAME, self._default_frame_sizes)
+        self._global_temps = MemorySpace("temp", main_sizes[1])
 
         # Pila de activaciones (llamadas a funciones)
         self.call_stack: List[ActivationRecord] = []
@@ -88,6 +340,87 @@ class VirtualMachine:
         # Frame "pendiente" para la próxima llamada (creado por ERA, llenado por PARAM)
         self._pending_frame: Optional[ActivationRecord] = None
 
+        # Frames libres por función (reciclados en RETURN / ENDFUNC)
+        self._frame_pool: Dict[Optional[str], List[ActivationRecord]] = {}
+        self.pool_hits: int = 0
+        self.pool_misses: int = 0
+
+        # Bancos visibles para el motor "table", indexados por banco.
+        # Los de LOCAL/TEMP cambian con cada GOSUB / RETURN.
+        self._banks: List[List[Any]] = (
+            self.const_mem.slots
+            + self.global_mem.slots
+            + _NO_FRAME_LOCALS
+            + self._global_temps.slots
+        )
+
+        # Motor "closure": se compila al final porque captura los bancos
+        self._code: List[Callable[[], int]] = []
+        if engine == "closure":
+            from entrega5.closure_backend import compile_closures
+            self._code = compile_closures(self)
+
+        # Superinstrucciones (ver superinstructions.py): también capturan
+        # los bancos, y dejan sus estadísticas en fusion
+        self.fusion: Optional[FusionStats] = None
+        if fuse:
+            from entrega5.superinstructions import fuse_program
+            self.fusion = fuse_program(self)
+
+    def _build_dispatch(self) -> Dict[str, Handler]:
+        return {
+            "+": self._op_add,
+            "-": self._op_sub,
+            "*": self._op_mul,
+            "/": self._op_div,
+            ">": self._op_gt,
+            "<": self._op_lt,
+            ">=": self._op_ge,
+            "<=": self._op_le,
+            "==": self._op_eq,
+            "!=": self._op_ne,
+            "=": self._op_assign,
+            "PRINT": self._op_print,
+            "GOTO": self._op_goto,
+            "GOTOF": self._op_gotof,
+            "ERA": self._op_era,
+            "PARAM": self._op_param,
+            "GOSUB": self._op_gosub,
+            "RETURN": self._op_return,
+            "ENDFUNC": self._op_return,
+            "END": self._op_end,
+        }
+
+    def _sizes_for(self, seg: int) -> List[int]:
+        first = seg * len(TYPES)
+        return self._bank_sizes[first:first + len(TYPES)]
+
+    def _new_frame(self, func_name: Optional[str]) -> ActivationRecord:
+        local_sizes, temp_sizes = self._frame_sizes.get(func_name, self._default_frame_sizes)
+        return ActivationRecord(
+            locals=MemorySpace("local", local_sizes),
+            temps=MemorySpace("temp", temp_sizes),
+            func_name=func_name,
+        )
+
+    def _acquire_frame(self, func_name: Optional[str]) -> ActivationRecord:
+        """Frame para ERA: reciclado de la lista libre si hay, si no uno nuevo."""
+        free = self._frame_pool.get(func_name)
+        if free:
+            self.pool_hits += 1
+            return free.pop()
+        self.pool_misses += 1
+        return self._new_frame(func_name)
+
+    def _release_frame(self, frame: ActivationRecord) -> None:
+        """Limpia un frame que ya regresó y lo deja en la lista libre de su función."""
+        free = self._frame_pool.setdefault(frame.func_name, [])
+        if len(free) < FRAME_POOL_LIMIT:
+            frame.locals.clear()
+            frame.temps.clear()
+            frame.return_ip = None
+            free.append(frame)
+
     # ----------------- Helpers de memoria ----------------- #
 
     def _space_for_address(self, addr: int) -> MemorySpace:
@@ -131,6 +464,93 @@ class VirtualMachine:
         space = self._space_for_address(addr)
         space.set(addr, value)
 
+    def _activate_banks(self) -> None:
+        """
+        Apunta los bancos LOCAL/TEMP al frame en la cima de la pila
+        (o a los temporales globales si no hay función activa).
+        """
+        banks = self._banks
+        if self.call_stack:
+            frame = self.call_stack[-1]
+            banks[FIRST_LOCAL_BANK:FIRST_TEMP_BANK] = frame.locals.slots
+            banks[FIRST_TEMP_BANK:] = frame.temps.slots
+        else:
+            banks[FIRST_LOCAL_BANK:FIRST_TEMP_BANK] = _NO_FRAME_LOCALS
+            banks[FIRST_TEMP_BANK:] = self._global_temps.slots
+
+    # ----------------- Ligado (pre-decodificación) ----------------- #
+
+    def _link(self, quads: Sequence[Quad]) -> List[LinkedInstr]:
+        """
+        Convierte la lista de cuádruplos en instrucciones pre-decodificadas:
+        el handler ya resuelto y cada dirección traducida a (banco, offset).
+        También registra en ``_bank_sizes`` el offset más alto usado por banco.
+        """
+        return [self._link_quad(ip, quad) for ip, quad in enumerate(quads)]
+
+    def _decode_operand(self, addr: Optional[int]) -> Tuple[Optional[int], Optional[int]]:
+        if addr is None:
+            return None, None
+        bank, offset = decode_address(addr)
+        sizes = self._bank_sizes
+        if offset >= sizes[bank]:
+            sizes[bank] = offset + 1
+        return bank, offset
+
+    def _link_quad(self, ip: int, quad: Quad) -> LinkedInstr:
+        op, left, right, res = quad
+        decode = self._decode_operand
+        handler = self._dispatch.get(op, self._op_unknown)
+
+        if op in ("GOTO", "GOTOF"):
+            lb, lo = decode(left)
+            if self.limits is not None and op == "GOTO" and int(res) <= ip:
+                handler = self._op_goto_checked
+            return (handler, lb, lo, None, None, None, int(res))
+        if op == "PRINT":
+            lb, lo = decode(left)
+            return (handler, lb, lo, None, None, None, res == PRINT_EOL)
+        if op in ("ERA", "GOSUB"):
+            if self.limits is not None and op == "GOSUB":
+                handler = self._op_gosub_checked
+            return (handler, left, None, None, None, None, None if res is None else int(res))
+        if self.limits is not None and op in ("RETURN", "ENDFUNC", "END"):
+            handler = self._op_end_checked if op == "END" else self._op_return_checked
+            return (handler, op, None, None, None, None, None)
+        if op in ("RETURN", "ENDFUNC", "END") or handler is self._op_unknown:
+            return (handler, op, None, None, None, None, None)
+
+        if op == "-" and right is None:
+            handler = self._op_neg
+        lb, lo = decode(left)
+        rb, ro = decode(right)
+        db, do = decode(res)
+        return (handler, lb, lo, rb, ro, db, do)
+
+    def _op_link(self, ip: int, ins: LinkedInstr) -> int:
+        """
+        Instrucción inicial de cada cuádruplo con lazy_link: lo liga, se
+        reemplaza a sí misma en ``program`` y ejecuta la instrucción ligada.
+        """
+        linked = self._link_quad(ip, self.quads[ip])
+        self.program[ip] = linked
+        return linked[0](ip, linked)
+
+    @classmethod
+    def from_object(cls, path: Any, **kwargs: Any) -> VirtualMachine:
+        """
+        VM que ejecuta directamente un archivo .pato mapeado en memoria
+        (ver pato_object.map_object). Los cuádruplos se leen del mmap y se
+        ligan conforme se ejecutan; el MappedProgram queda en ``vm.image``.
+        """
+        from entrega5.pato_object import map_object
+
+        image = map_object(path)
+        kwargs.setdefault("lazy_link", True)
+        vm = cls(image.quads, constants=image.constants, frames=image.frames, **kwargs)
+        vm.image = image
+        return vm
+
     # ----------------- Loop principal de ejecución ----------------- #
 
     def run(self) -> None:
@@ -138,12 +558,177 @@ class VirtualMachine:
         Ejecuta los cuádruplos hasta encontrar un END o
         hasta que se salga por error.
         """
+        if self.limits is not None:
+            # Cada run() tiene su propio presupuesto
+            self.instructions_charged = 0
+            self._started = time.monotonic()
+            self._segment_start = self.ip
+            self._trip = 0
+        try:
+            if self.profile is not None:
+                self._run_profiled()
+            elif self.hooks:
+                self._run_hooked()
+            elif self.engine == "chain":
+                self._run_chain()
+            elif self.engine == "closure":
+                self._run_closures()
+            else:
+                self._run_table()
+        finally:
+            self._flush_output()
+
+    # ----------------- Salida ----------------- #
+
+    def _print(self, value: Any, end_of_record: bool) -> None:
+        line = self._print_line
+        line.append(str(value))
+        if end_of_record:
+            self.output.write("\n".join(line) + "\n")
+            line.clear()
+
+    def _flush_output(self) -> None:
+        """Manda lo que quede de un print(...) incompleto y vacía el canal."""
+        if self._print_line:
+            self.output.write("\n".join(self._print_line) + "\n")
+            self._print_line.clear()
+        self.output.flush()
+
+    def _run_table(self) -> None:
+        """
+        Motor por tabla de despacho: cada handler ejecuta su cuádruplo y
+        regresa el índice del siguiente (o _HALT para terminar).
+        """
+        program = self.program
+        n = len(program)
+        ip = self.ip
+
+        self._activate_banks()
+        try:
+            while 0 <= ip < n:
+                ins = program[ip]
+                ip = ins[0](ip, ins)
+        finally:
+            self.ip = ip
+
+    def _run_profiled(self) -> None:
+        """
+        Motor "table" con conteo por cuádruplo y tiempo propio por función.
+        Se usa con profile=True sin importar el motor elegido.
+        """
+        program = self.program
+        n = len(program)
+        ip = self.ip
+        prof = self.profile
+        assert prof is not None
+        counts = prof.quad_counts
+        func_time = prof.func_time_ns
+        func_calls = prof.func_calls
+        stack = self.call_stack
+        clock = time.perf_counter_ns
+
+        depth = len(stack)
+        current = stack[-1].func_name if stack else MAIN_FRAME
+        func_calls[current] = func_calls.get(current, 0) + 1
+        start = clock()
+
+        self._activate_banks()
+        try:
+            while 0 <= ip < n:
+                counts[ip] += 1
+                ins = program[ip]
+                ip = ins[0](ip, ins)
+                if len(stack) != depth:
+                    now = clock()
+                    func_time[current] = func_time.get(current, 0) + now - start
+                    start = now
+                    called = len(stack) > depth
+                    depth = len(stack)
+                    current = stack[-1].func_name if stack else MAIN_FRAME
+                    if called:
+                        func_calls[current] = func_calls.get(current, 0) + 1
+        finally:
+            func_time[current] = func_time.get(current, 0) + clock() - start
+            self.ip = ip
+
+    def _run_hooked(self) -> None:
+        """
+        Motor "table" que además emite eventos a los hooks. Solo arma los
+        eventos que algún hook escucha; se usa si hay hooks, sin importar
+        el motor elegido.
+        """
+        before = listeners(self.hooks, "before_instruction")
+        on_call = listeners(self.hooks, "on_call")
+        on_return = listeners(self.hooks, "on_return")
+        on_write = listeners(self.hooks, "on_write")
+
+        program = self.program
+        quads = self.quads
+        n = len(program)
+        ip = self.ip
+        stack = self.call_stack
+
+        self._activate_banks()
+        try:
+            while 0 <= ip < n:
+                if before:
+                    event = InstructionEvent(ip, quads[ip])
+                    for fn in before:
+                        fn(event)
+
+                depth = len(stack)
+                top = stack[-1] if stack else None
+                ins = program[ip]
+                nxt = ins[0](ip, ins)
+
+                if on_write:
+                    op, _, _, res = quads[ip]
+                    if op in WRITE_OPS:
+                        _, _, _, _, _, db, do = program[ip]  # ya ligado (lazy_link)
+                        if op == "PARAM":
+                            value = self._pending_frame.locals.slots[db - FIRST_LOCAL_BANK][do]  # type: ignore[union-attr]
+                        else:
+                            value = self._banks[db][do]
+                        write = WriteEvent(ip, res, value)  # type: ignore[arg-type]
+                        for fn in on_write:
+                            fn(write)
+
+                if len(stack) > depth and on_call:
+                    call = CallEvent(ip, stack[-1].func_name, nxt, len(stack))
+                    for fn in on_call:
+                        fn(call)
+                elif len(stack) < depth and on_return:
+                    ret = ReturnEvent(ip, top.func_name, None if nxt == _HALT else nxt, len(stack))  # type: ignore[union-attr]
+                    for fn in on_return:
+                        fn(ret)
+
+                ip = nxt
+        finally:
+            self.ip = ip
+
+    def _run_closures(self) -> None:
+        """
+        Motor "closure": cada paso ya trae operandos y operación capturados,
+        solo regresa el siguiente ip.
+        """
+        code = self._code
+        ip = self.ip
+
+        self._activate_banks()
+        try:
+            while ip >= 0:
+                ip = code[ip]()
+        finally:
+            self.ip = ip
+
+    def _run_chain(self) -> None:
+        """
+        Motor de referencia: decodifica cada cuádruplo con la cadena
+        if/elif original. Útil para comparar contra el motor por tabla.
+        """
         while self.ip < len(self.quads):
             op, left, right, res = self.quads[self.ip]
 
-            if self.debug:
-                print(f"[IP={self.ip:03}] {op}, {left}, {right}, {res}")
-
             # Aritmética básica (+, -, *, /) incluyendo - unario
             if op in {"+", "-", "*", "/"}:
                 self._exec_arithmetic(op, left, right, res)
@@ -160,11 +745,13 @@ class VirtualMachine:
             # PRINT
             elif op == "PRINT":
                 value = self._read(left)
-                # Para Patito basta con imprimir en stdout
-                print(value)
+                self._print(value, res == PRINT_EOL)
 
             # GOTO incondicional
             elif op == "GOTO":
+                if self.limits is not None and int(res) <= self.ip:
+                    self._charge(self.ip)
+                    self._segment_start = int(res)
                 self.ip = int(res)
                 continue
 
@@ -180,7 +767,7 @@ class VirtualMachine:
             elif op == "ERA":
                 # Prepara un nuevo frame para la próxima llamada a función.
                 func_name = str(left)
-                self._pending_frame = ActivationRecord(func_name=func_name)
+                self._pending_frame = self._acquire_frame(func_name)
 
             elif op == "PARAM":
                 if self._pending_frame is None:
@@ -192,6 +779,9 @@ class VirtualMachine:
             elif op == "GOSUB":
                 if self._pending_frame is None:
                     raise RuntimeError("GOSUB sin ERA/PARAM previos")
+                if self.limits is not None:
+                    self._check_call(self.ip)
+                    self._segment_start = int(res)
                 # Guardar IP de retorno en el frame pendiente y activarlo
                 self._pending_frame.return_ip = self.ip + 1
                 self.call_stack.append(self._pending_frame)
@@ -207,25 +797,35 @@ class VirtualMachine:
                 # Aquí solo hacemos pop del frame y regresamos.
                 if not self.call_stack:
                     raise RuntimeError("RETURN sin frame activo")
+                if self.limits is not None:
+                    self._charge(self.ip)
                 frame = self.call_stack.pop()
                 if frame.return_ip is None:
                     # No hay a dónde regresar: terminamos programa
                     return
                 self.ip = frame.return_ip
+                self._segment_start = self.ip
+                self._release_frame(frame)
                 continue
 
             elif op == "ENDFUNC":
                 # Equivalente a un RETURN implícito
                 if not self.call_stack:
                     raise RuntimeError("ENDFUNC sin frame activo")
+                if self.limits is not None:
+                    self._charge(self.ip)
                 frame = self.call_stack.pop()
                 if frame.return_ip is None:
                     return
                 self.ip = frame.return_ip
+                self._segment_start = self.ip
+                self._release_frame(frame)
                 continue
 
             # END: fin del programa
             elif op == "END":
+                if self.limits is not None:
+                    self._charge(self.ip)
                 break
 
             else:
@@ -234,6 +834,265 @@ class VirtualMachine:
             # Avanzar al siguiente cuádruplo
             self.ip += 1
 
+    # ----------------- Handlers del motor "table" ----------------- #
+
+    def _uninitialized(self, ip: int) -> None:
+        raise RuntimeError(
+            f"Acceso a dirección no inicializada en IP={ip}: {self.quads[ip]}"
+        )
+
+    def _op_add(self, ip: int, ins: LinkedInstr) -> int:
+        _, lb, lo, rb, ro, db, do = ins
+        banks = self._banks
+        a = banks[lb][lo]
+        b = banks[rb][ro]
+        if a is _UNSET or b is _UNSET:
+            self._uninitialized(ip)
+        banks[db][do] = a + b
+        return ip + 1
+
+    def _op_sub(self, ip: int, ins: LinkedInstr) -> int:
+        _, lb, lo, rb, ro, db, do = ins
+        banks = self._banks
+        a = banks[lb][lo]
+        b = banks[rb][ro]
+        if a is _UNSET or b is _UNSET:
+            self._uninitialized(ip)
+        banks[db][do] = a - b
+        return ip + 1
+
+    def _op_neg(self, ip: int, ins: LinkedInstr) -> int:
+        # Menos unario: ("-", operand, None, res)
+        _, lb, lo, _, _, db, do = ins
+        banks = self._banks
+        a = banks[lb][lo]
+        if a is _UNSET:
+            self._uninitialized(ip)
+        banks[db][do] = -a
+        return ip + 1
+
+    def _op_mul(self, ip: int, ins: LinkedInstr) -> int:
+        _, lb, lo, rb, ro, db, do = ins
+        banks = self._banks
+        a = banks[lb][lo]
+        b = banks[rb][ro]
+        if a is _UNSET or b is _UNSET:
+            self._uninitialized(ip)
+        banks[db][do] = a * b
+        return ip + 1
+
+    def _op_div(self, ip: int, ins: LinkedInstr) -> int:
+        _, lb, lo, rb, ro, db, do = ins
+        banks = self._banks
+        a = banks[lb][lo]
+        b = banks[rb][ro]
+        if a is _UNSET or b is _UNSET:
+            self._uninitialized(ip)
+        banks[db][do] = a / b
+        return ip + 1
+
+    def _op_gt(self, ip: int, ins: LinkedInstr) -> int:
+        _, lb, lo, rb, ro, db, do = ins
+        banks = self._banks
+        a = banks[lb][lo]
+        b = banks[rb][ro]
+        if a is _UNSET or b is _UNSET:
+            self._uninitialized(ip)
+        banks[db][do] = a > b
+        return ip + 1
+
+    def _op_lt(self, ip: int, ins: LinkedInstr) -> int:
+        _, lb, lo, rb, ro, db, do = ins
+        banks = self._banks
+        a = banks[lb][lo]
+        b = banks[rb][ro]
+        if a is _UNSET or b is _UNSET:
+            self._uninitialized(ip)
+        banks[db][do] = a < b
+        return ip + 1
+
+    def _op_ge(self, ip: int, ins: LinkedInstr) -> int:
+        _, lb, lo, rb, ro, db, do = ins
+        banks = self._banks
+        a = banks[lb][lo]
+        b = banks[rb][ro]
+        if a is _UNSET or b is _UNSET:
+            self._uninitialized(ip)
+        banks[db][do] = a >= b
+        return ip + 1
+
+    def _op_le(self, ip: int, ins: LinkedInstr) -> int:
+        _, lb, lo, rb, ro, db, do = ins
+        banks = self._banks
+        a = banks[lb][lo]
+        b = banks[rb][ro]
+        if a is _UNSET or b is _UNSET:
+            self._uninitialized(ip)
+        banks[db][do] = a <= b
+        return ip + 1
+
+    def _op_eq(self, ip: int, ins: LinkedInstr) -> int:
+        _, lb, lo, rb, ro, db, do = ins
+        banks = self._banks
+        a = banks[lb][lo]
+        b = banks[rb][ro]
+        if a is _UNSET or b is _UNSET:
+            self._uninitialized(ip)
+        banks[db][do] = a == b
+        return ip + 1
+
+    def _op_ne(self, ip: int, ins: LinkedInstr) -> int:
+        _, lb, lo, rb, ro, db, do = ins
+        banks = self._banks
+        a = banks[lb][lo]
+        b = banks[rb][ro]
+        if a is _UNSET or b is _UNSET:
+            self._uninitialized(ip)
+        banks[db][do] = a != b
+        return ip + 1
+
+    def _op_assign(self, ip: int, ins: LinkedInstr) -> int:
+        _, lb, lo, _, _, db, do = ins
+        banks = self._banks
+        a = banks[lb][lo]
+        if a is _UNSET:
+            self._uninitialized(ip)
+        banks[db][do] = a
+        return ip + 1
+
+    def _op_print(self, ip: int, ins: LinkedInstr) -> int:
+        a = self._banks[ins[1]][ins[2]]
+        if a is _UNSET:
+            self._uninitialized(ip)
+        if ins[6]:
+            line = self._print_line
+            if line:
+                line.append(str(a))
+                self.output.write("\n".join(line) + "\n")
+                line.clear()
+            else:
+                self.output.write(f"{a}\n")
+        else:
+            self._print_line.append(str(a))
+        return ip + 1
+
+    def _op_goto(self, ip: int, ins: LinkedInstr) -> int:
+        return ins[6]
+
+    def _op_gotof(self, ip: int, ins: LinkedInstr) -> int:
+        a = self._banks[ins[1]][ins[2]]
+        if a is _UNSET:
+            self._uninitialized(ip)
+        if not a:
+            return ins[6]
+        return ip + 1
+
+    def _op_era(self, ip: int, ins: LinkedInstr) -> int:
+        self._pending_frame = self._acquire_frame(ins[1])
+        return ip + 1
+
+    def _op_param(self, ip: int, ins: LinkedInstr) -> int:
+        # El destino es un banco LOCAL del frame pendiente, no del actual
+        _, lb, lo, _, _, db, do = ins
+        frame = self._pending_frame
+        if frame is None:
+            raise RuntimeError("PARAM sin ERA previo")
+        a = self._banks[lb][lo]
+        if a is _UNSET:
+            self._uninitialized(ip)
+        frame.locals.slots[db - FIRST_LOCAL_BANK][do] = a
+        return ip + 1
+
+    def _op_gosub(self, ip: int, ins: LinkedInstr) -> int:
+        frame = self._pending_frame
+        if frame is None:
+            raise RuntimeError("GOSUB sin ERA/PARAM previos")
+        frame.return_ip = ip + 1
+        self.call_stack.append(frame)
+        self._pending_frame = None
+        banks = self._banks
+        banks[FIRST_LOCAL_BANK:FIRST_TEMP_BANK] = frame.locals.slots
+        banks[FIRST_TEMP_BANK:] = frame.temps.slots
+        return ins[6]
+
+    def _op_return(self, ip: int, ins: LinkedInstr) -> int:
+        # RETURN y ENDFUNC se comportan igual: pop del frame y regresar
+        if not self.call_stack:
+            raise RuntimeError("RETURN/ENDFUNC sin frame activo")
+        frame = self.call_stack.pop()
+        self._activate_banks()
+        return_ip = frame.return_ip
+        if return_ip is None:
+            return _HALT
+        self._release_frame(frame)
+        return return_ip
+
+    def _op_end(self, ip: int, ins: LinkedInstr) -> int:
+        return _HALT
+
+    # ----------------- Límites de ejecución ----------------- #
+
+    def _limit_exceeded(self, limit: str, maximum: float, ip: int) -> ExecutionLimitExceeded:
+        return ExecutionLimitExceeded(limit, maximum, ip, [f.func_name for f in self.call_stack])
+
+    def _charge(self, ip: int) -> None:
+        """Carga el tramo recorrido desde el último punto de revisión."""
+        self.instructions_charged += ip - self._segment_start + 1
+        if self.instructions_charged > self._trip:
+            self._check_budget(ip)
+
+    def _check_budget(self, ip: int) -> None:
+        """
+        Se llama al cruzar ``_trip``: revisa el presupuesto de instrucciones
+        y el reloj, y fija el siguiente umbral.
+        """
+        limits = self.limits
+        assert limits is not None
+        charged = self.instructions_charged
+        if limits.max_instructions is not None and charged > limits.max_instructions:
+            raise self._limit_exceeded("instructions", limits.max_instructions, ip)
+        if limits.max_seconds is not None and time.monotonic() - self._started > limits.max_seconds:
+            raise self._limit_exceeded("seconds", limits.max_seconds, ip)
+        trip = float("inf") if limits.max_instructions is None else limits.max_instructions
+        if limits.max_seconds is not None:
+            trip = min(trip, charged + CLOCK_EVERY)
+        self._trip = trip
+
+    def _check_call(self, ip: int) -> None:
+        self._charge(ip)
+        limits = self.limits
+        assert limits is not None
+        if limits.max_call_depth is not None and len(self.call_stack) >= limits.max_call_depth:
+            raise self._limit_exceeded("call_depth", limits.max_call_depth, ip)
+
+    def _op_goto_checked(self, ip: int, ins: LinkedInstr) -> int:
+        # GOTO hacia atrás: una vuelta de ciclo (es _charge, en línea)
+        target = ins[6]
+        self.instructions_charged += ip - self._segment_start + 1
+        self._segment_start = target
+        if self.instructions_charged > self._trip:
+            self._check_budget(ip)
+        return target
+
+    def _op_gosub_checked(self, ip: int, ins: LinkedInstr) -> int:
+        self._check_call(ip)
+        target = self._op_gosub(ip, ins)
+        self._segment_start = target
+        return target
+
+    def _op_return_checked(self, ip: int, ins: LinkedInstr) -> int:
+        self._charge(ip)
+        return_ip = self._op_return(ip, ins)
+        self._segment_start = return_ip
+        return return_ip
+
+    def _op_end_checked(self, ip: int, ins: LinkedInstr) -> int:
+        self._charge(ip)
+        return _HALT
+
+    def _op_unknown(self, ip: int, ins: LinkedInstr) -> int:
+        raise RuntimeError(f"Opcode desconocido: {self.quads[ip][0]}")
+
     # ----------------- Implementación de operadores ----------------- #
 
     def _exec_arithmetic(